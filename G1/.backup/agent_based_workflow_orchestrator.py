@@ -24,8 +24,10 @@ Each agent:
 """
 
 import asyncio
+import itertools
 import json
 import logging
+from collections import deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
@@ -145,13 +147,14 @@ class IntelligentAgent:
             "payload_size": len(str(message.payload))
         }
         
-        if "interactions" not in self.learning_data:
-            self.learning_data["interactions"] = []
+        if "interactions" not in self.state.learning_data:
+            self.state.learning_data["interactions"] = []
         
-        self.learning_data["interactions"].append(interaction)
+        self.state.learning_data["interactions"].append(interaction)
         
         # Update performance metrics
-        success_rate = sum(1 for i in self.learning_data["interactions"] if i["success"]) / len(self.learning_data["interactions"])
+        interactions = self.state.learning_data["interactions"]
+        success_rate = sum(1 for i in interactions if i["success"]) / len(interactions)
         self.state.performance_metrics["success_rate"] = success_rate
         self.state.last_update = datetime.now()
     
@@ -177,7 +180,7 @@ class IntelligentAgent:
             "current_task": self.state.current_task,
             "performance_metrics": self.state.performance_metrics,
             "knowledge_base_size": len(self.knowledge_base),
-            "interactions_count": len(self.learning_data.get("interactions", [])),
+            "interactions_count": len(self.state.learning_data.get("interactions", [])),
             "last_update": self.state.last_update.isoformat()
         }
 
@@ -828,61 +831,126 @@ class ExecutionAgent(IntelligentAgent):
 
 
 class MessageBus:
-    """Intelligent message bus for agent communication"""
+    """Intelligent message bus for agent communication
     
-    def __init__(self):
+    Every agent gets a bounded priority mailbox drained by its own worker
+    tasks, so agents process messages concurrently. Senders wait when a
+    mailbox is full (backpressure); higher AgentMessage.priority values are
+    delivered first, FIFO within a priority. History is a ring buffer.
+    """
+    
+    def __init__(self, mailbox_size: int = 100, workers_per_agent: int = 1, history_size: int = 1000):
         self.agents: Dict[AgentType, IntelligentAgent] = {}
-        self.message_queue: List[AgentMessage] = []
-        self.message_history: List[AgentMessage] = []
+        self.mailbox_size = mailbox_size
+        self.workers_per_agent = workers_per_agent
+        self.mailboxes: Dict[AgentType, asyncio.PriorityQueue] = {}
+        self.message_history: deque = deque(maxlen=history_size)
+        self.stats = {"sent": 0, "delivered": 0, "responses": 0, "failed": 0}
+        
+        self._workers: Dict[AgentType, List[asyncio.Task]] = {}
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
         
     def register_agent(self, agent: IntelligentAgent):
         """Register an agent with the message bus"""
         self.agents[agent.agent_type] = agent
         logger.info(f"📡 Registered {agent.agent_type.value} agent")
     
+    def _mailbox(self, agent_type: AgentType) -> asyncio.PriorityQueue:
+        """Mailbox of an agent, starting its workers on first use"""
+        if agent_type not in self.mailboxes:
+            self.mailboxes[agent_type] = asyncio.PriorityQueue(self.mailbox_size)
+            self._workers[agent_type] = [
+                asyncio.ensure_future(self._agent_worker(agent_type))
+                for _ in range(self.workers_per_agent)
+            ]
+        return self.mailboxes[agent_type]
+    
+    async def _agent_worker(self, agent_type: AgentType):
+        mailbox = self.mailboxes[agent_type]
+        agent = self.agents[agent_type]
+        while True:
+            _, _, message = await mailbox.get()
+            try:
+                response = await agent.process_message(message)
+                self.stats["delivered"] += 1
+                if response:
+                    self.message_history.append(response)
+                    self.stats["responses"] += 1
+            except Exception as e:
+                logger.error(f"Delivery of {message.message_type.value} to {agent_type.value} failed: {e}")
+                self.stats["failed"] += 1
+            finally:
+                mailbox.task_done()
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.set()
+    
     async def send_message(self, message: AgentMessage) -> str:
-        """Send message to target agent"""
-        self.message_history.append(message)
-        
-        if message.recipient in self.agents:
-            agent = self.agents[message.recipient]
-            response = await agent.process_message(message)
-            
-            if response:
-                self.message_history.append(response)
-            
-            return message.id
-        else:
+        """Queue message for the target agent (waits while its mailbox is full)"""
+        if message.recipient not in self.agents:
             logger.error(f"Agent {message.recipient.value} not found")
             return ""
+        
+        self.message_history.append(message)
+        self.stats["sent"] += 1
+        
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            await self._mailbox(message.recipient).put((-message.priority, next(self._sequence), message))
+        except BaseException:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+            raise
+        return message.id
     
     async def broadcast_message(self, message: AgentMessage) -> List[str]:
         """Broadcast message to all agents except sender"""
-        message_ids = []
-        
-        for agent_type, agent in self.agents.items():
-            if agent_type != message.sender:
-                individual_message = AgentMessage(
-                    id=str(uuid.uuid4()),
-                    sender=message.sender,
-                    recipient=agent_type,
-                    message_type=message.message_type,
-                    payload=message.payload,
-                    timestamp=message.timestamp,
-                    priority=message.priority
-                )
-                
-                message_id = await self.send_message(individual_message)
-                message_ids.append(message_id)
+        individual_messages = [
+            AgentMessage(
+                id=str(uuid.uuid4()),
+                sender=message.sender,
+                recipient=agent_type,
+                message_type=message.message_type,
+                payload=message.payload,
+                timestamp=message.timestamp,
+                priority=message.priority
+            )
+            for agent_type in self.agents
+            if agent_type != message.sender
+        ]
         
-        return message_ids
+        return list(await asyncio.gather(*(self.send_message(m) for m in individual_messages)))
+    
+    async def join(self):
+        """Wait until every queued message (and everything it triggered) is processed"""
+        if self._in_flight and self._idle is not None:
+            await self._idle.wait()
+    
+    async def close(self):
+        """Stop agent workers; undelivered messages are discarded"""
+        workers = [w for tasks in self._workers.values() for w in tasks]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self.mailboxes.clear()
+        self._in_flight = 0
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
         return {
             "registered_agents": len(self.agents),
-            "message_queue_size": len(self.message_queue),
-            "total_messages": len(self.message_history),
+            "message_queue_size": sum(mailbox.qsize() for mailbox in self.mailboxes.values()),
+            "messages_in_flight": self._in_flight,
+            "total_messages": self.stats["sent"] + self.stats["responses"],
+            "history_size": len(self.message_history),
+            "delivery_stats": dict(self.stats),
             "agent_statuses": {
                 agent_type.value: agent.get_agent_status() 
                 for agent_type, agent in self.agents.items()
@@ -942,8 +1010,8 @@ class AgentBasedWorkflowOrchestrator:
         # Send initial message to start the workflow
         await self.message_bus.send_message(initial_message)
         
-        # Wait for workflow completion (in real system, this would be event-driven)
-        await asyncio.sleep(2)  # Simulate processing time
+        # Wait until the agent chain triggered by the requirement has drained
+        await self.message_bus.join()
         
         end_time = datetime.now()
         execution_time = (end_time - start_time).total_seconds()
@@ -1022,6 +1090,8 @@ async def demo_agent_based_workflow():
     print(f"      - Code generation and execution")
     print(f"   🔄 All communication through established message bus")
     print(f"   📊 Performance metrics and learning captured")
+    
+    await orchestrator.message_bus.close()
 
 
 if __name__ == "__main__":
@@ -10,6 +10,8 @@ import json
 import time
 from datetime import datetime
 
+from persona_catalog import get_persona_catalog
+
 class DirectPersonaValidator:
     def __init__(self):
         self.base_url = "http://localhost:8013"
@@ -90,17 +92,9 @@ class DirectPersonaValidator:
         if any(indicator in response.lower() for indicator in mock_indicators):
             return False
             
-        # Check for persona-appropriate content
-        persona_indicators = {
-            "requirement-concierge": ["requirements", "analysis", "scope", "feasibility"],
-            "developer": ["code", "implementation", "function", "class", "variable"],
-            "tester": ["test", "testing", "validation", "verify", "scenario"],
-            "ui-ux-designer": ["user", "interface", "design", "experience", "usability"],
-            "security-specialist": ["security", "vulnerability", "authentication", "encryption"],
-            "workflow-designer": ["workflow", "phase", "process", "methodology"],
-        }
-        
-        expected_terms = persona_indicators.get(persona_name, [])
+        # Check for persona-appropriate content (indicator terms from the persona catalog)
+        persona = get_persona_catalog().find(persona_name)
+        expected_terms = persona.indicators if persona else ()
         if expected_terms and not any(term in response.lower() for term in expected_terms):
             return False
             
@@ -6,11 +6,14 @@ NO MOCKS OR DUMMIES - Real persona interactions only
 """
 
 import requests
+import asyncio
 import json
 import time
 import sys
 from datetime import datetime
 
+from health_probes import HealthProbeEngine
+
 class G1E2EValidator:
     def __init__(self):
         self.base_url = "http://localhost:8013"  # Personas Gateway
@@ -34,21 +37,25 @@ class G1E2EValidator:
     
     def validate_persona_exists(self, persona_name):
         """Validate that persona exists in the actual system"""
-        try:
-            response = requests.get(f"{self.base_url}/personas/{persona_name}")
-            if response.status_code == 200:
-                persona_data = response.json()
-                self.log_step(f"Persona Validation: {persona_name}", "PASS", 
-                            {"role": persona_data.get("role", "Unknown")})
-                return True
+        return self.validate_personas_exist([persona_name])[persona_name]
+    
+    def validate_personas_exist(self, persona_names):
+        """Validate that personas exist in the actual system, probed concurrently"""
+        # One probe timeout at worst for the whole list instead of one blocking request per persona
+        engine = HealthProbeEngine(gateway_url=self.base_url)
+        probes = asyncio.run(engine.probe_many(personas=persona_names, use_cache=False))
+        
+        exists = {}
+        for persona_name in persona_names:
+            result = probes[f"persona:{persona_name}"]
+            exists[persona_name] = result.healthy
+            if result.healthy:
+                self.log_step(f"Persona Validation: {persona_name}", "PASS",
+                            {"latency_ms": round(result.latency_ms, 1)})
             else:
-                self.log_step(f"Persona Validation: {persona_name}", "FAIL", 
-                            {"error": f"HTTP {response.status_code}"})
-                return False
-        except Exception as e:
-            self.log_step(f"Persona Validation: {persona_name}", "ERROR", 
-                         {"exception": str(e)})
-            return False
+                self.log_step(f"Persona Validation: {persona_name}", "FAIL",
+                            {"error": result.detail})
+        return exists
     
     def execute_persona_interaction(self, persona_name, prompt, context=None):
         """Execute real interaction with persona - NO MOCKS"""
@@ -279,11 +286,8 @@ class G1E2EValidator:
             "simulator"
         ]
         
-        failed_personas = []
-        
-        for persona in expected_personas:
-            if not self.validate_persona_exists(persona):
-                failed_personas.append(persona)
+        exists = self.validate_personas_exist(expected_personas)
+        failed_personas = [persona for persona in expected_personas if not exists[persona]]
         
         if failed_personas:
             self.log_step("Persona Coverage Test", "FAIL",
@@ -20,8 +20,8 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+from service_registry import resolve_service_url
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -63,8 +63,8 @@ class MetricsFramework:
 class AIMetricsOrchestrator:
     """Orchestrates AI personas to design and optimize metrics systems"""
     
-    def __init__(self, personas_gateway_url: str = "http://localhost:8013"):
-        self.gateway_url = personas_gateway_url
+    def __init__(self, personas_gateway_url: Optional[str] = None):
+        self.gateway_url = personas_gateway_url or resolve_service_url("personas-gateway", "http://localhost:8013")
         self.metrics_frameworks = {}
         self.active_measurements = {}
         self.optimization_history = []
@@ -451,4 +451,5 @@ async def main():
     await demo.demo_ai_metrics_design()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
\ No newline at end of file
@@ -21,19 +21,42 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 
-from workflow_orchestrator import PersonaAPIClient, WorkflowContextManager
+from workflow_orchestrator import WorkflowContextManager, get_persona_client
+from workflow_tracing import get_tracer, traced, SPAN_KIND_WORKFLOW, SPAN_KIND_PHASE, SPAN_KIND_HOP
+from requirement_classifier import get_classifier
+from verification_policy import VerificationPolicy, VerificationDecision, DECISION_SKIP
+from workflow_budget import WorkflowBudget, WorkflowUsage, current_usage, usage_scope
+from fidelity_scorer import LocalFidelityScorer, FidelityScore, BAND_AMBIGUOUS, BAND_PASS, BAND_FAIL
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CommunicationAwareOrchestrator:
     """Enhanced orchestrator with communication intelligence"""
     
-    def __init__(self):
-        self.persona_client = PersonaAPIClient()
+    def __init__(self, pipelined: bool = False, merge_readback: bool = False, max_reruns: int = 1,
+                 verification_policy: Optional[VerificationPolicy] = None,
+                 fidelity_scorer: Optional[LocalFidelityScorer] = None,
+                 budget: Optional[WorkflowBudget] = None):
+        self.persona_client = get_persona_client()
         self.context_manager = WorkflowContextManager()
         
+        # Pipelined mode: audit logs in the background and verification of handoff N
+        # concurrent with persona N+1 (re-run on failed verification, up to max_reruns)
+        self.pipelined = pipelined
+        # Merged read-back: one verification call instead of paraphrase + verify
+        self.merge_readback = merge_readback
+        self.max_reruns = max_reruns
+        
+        # Adaptive verification: skip/sample low-risk handoffs (None verifies every handoff)
+        self.verification_policy = verification_policy
+        self.requirement_labels = None
+        
+        # Local fidelity pre-check: the LLM verifier is only asked about ambiguous scores
+        self.fidelity_scorer = fidelity_scorer
+        
+        # Per-workflow token/cost budget; verification is dropped first when it runs low
+        self.budget = budget if budget is not None else WorkflowBudget.from_env()
+        
         # Communication personas
         self.knowledge_hub = "central-knowledge-hub"
         self.verification_service = "verification-service"
@@ -47,6 +70,7 @@ class CommunicationAwareOrchestrator:
             "tester"
         ]
     
+    @traced("hub.store_requirement", kind=SPAN_KIND_HOP)
     async def store_original_requirement(self, requirement_text: str, context: Dict[str, Any]) -> str:
         """Store original requirement in knowledge hub"""
         req_id = str(uuid.uuid4())
@@ -73,6 +97,7 @@ class CommunicationAwareOrchestrator:
         logger.info(f"Stored requirement {req_id} in knowledge hub")
         return req_id
     
+    @traced("hub.get_context", kind=SPAN_KIND_HOP)
     async def get_context_from_hub(self, req_id: str, persona_name: str, context_scope: str = "standard") -> Dict[str, Any]:
         """Pull context from knowledge hub for specific persona"""
         
@@ -107,6 +132,7 @@ class CommunicationAwareOrchestrator:
         logger.info(f"Pulled {context_scope} context for {persona_name} from knowledge hub")
         return context
     
+    @traced("hub.log_interpretation", kind=SPAN_KIND_HOP)
     async def log_persona_interpretation(self, req_id: str, persona_name: str, interpretation: str):
         """Log persona interpretation back to knowledge hub"""
         
@@ -133,10 +159,15 @@ class CommunicationAwareOrchestrator:
         
         logger.info(f"Logged interpretation from {persona_name} for requirement {req_id}")
     
+    @traced("verification.verify_understanding", kind=SPAN_KIND_HOP)
     async def verify_understanding(self, req_id: str, upstream_persona: str, downstream_persona: str, 
                                  upstream_output: str, downstream_understanding: str) -> Dict[str, Any]:
         """Verify downstream persona understands upstream output"""
         
+        fidelity = self.fidelity_scorer.score(upstream_output, downstream_understanding) if self.fidelity_scorer else None
+        if fidelity and fidelity.band != BAND_AMBIGUOUS:
+            return self._local_verification(upstream_persona, downstream_persona, fidelity)
+        
         verification_request = f"""
         Please verify understanding between personas:
         
@@ -172,10 +203,81 @@ class CommunicationAwareOrchestrator:
             "verification_response": result.get("response", ""),
             "timestamp": datetime.now().isoformat()
         }
+        if fidelity:
+            verification_result["fidelity"] = fidelity.to_dict()
         
         logger.info(f"Verification between {upstream_persona} → {downstream_persona}: {'PASSED' if verification_result['verified'] else 'NEEDS_CLARIFICATION'}")
         return verification_result
     
+    @traced("verification.verify_readback", kind=SPAN_KIND_HOP)
+    async def verify_readback(self, req_id: str, upstream_persona: str, downstream_persona: str,
+                              upstream_output: str, downstream_output: str) -> Dict[str, Any]:
+        """Read-back and verification in one call, using the downstream persona's own output"""
+        
+        fidelity = self.fidelity_scorer.score(upstream_output, downstream_output) if self.fidelity_scorer else None
+        if fidelity and fidelity.band != BAND_AMBIGUOUS:
+            return self._local_verification(upstream_persona, downstream_persona, fidelity)
+        
+        verification_request = f"""
+        Please perform a read-back verification between personas:
+        
+        REQUIREMENT ID: {req_id}
+        UPSTREAM PERSONA: {upstream_persona}
+        DOWNSTREAM PERSONA: {downstream_persona}
+        
+        UPSTREAM OUTPUT:
+        {upstream_output}
+        
+        DOWNSTREAM OUTPUT:
+        {downstream_output}
+        
+        First restate how the downstream persona understood the upstream output, as shown by its work.
+        Then verify accuracy and identify any gaps, assumptions, or misunderstandings.
+        Provide understanding accuracy score and clarification recommendations.
+        """
+        
+        result = await self.persona_client.call_persona(
+            self.verification_service,
+            verification_request,
+            {
+                "action": "verify_readback",
+                "requirement_id": req_id,
+                "upstream_persona": upstream_persona,
+                "downstream_persona": downstream_persona
+            }
+        )
+        
+        verification_result = {
+            "verified": "VERIFIED" in result.get("response", "").upper(),
+            "accuracy_mentioned": any(score in result.get("response", "") for score in ["0.", "1."]),
+            "clarification_needed": "CLARIFICATION" in result.get("response", "").upper(),
+            "verification_response": result.get("response", ""),
+            "merged_readback": True,
+            "timestamp": datetime.now().isoformat()
+        }
+        if fidelity:
+            verification_result["fidelity"] = fidelity.to_dict()
+        
+        logger.info(f"Read-back verification {upstream_persona} → {downstream_persona}: {'PASSED' if verification_result['verified'] else 'NEEDS_CLARIFICATION'}")
+        return verification_result
+    
+    def _local_verification(self, upstream_persona: str, downstream_persona: str,
+                            fidelity: FidelityScore) -> Dict[str, Any]:
+        """Verification result decided by the local fidelity score alone"""
+        verification_result = {
+            "verified": fidelity.band == BAND_PASS,
+            "accuracy_mentioned": True,
+            "clarification_needed": fidelity.band == BAND_FAIL,
+            "verification_response": f"LOCAL FIDELITY {fidelity.score:.2f} ({fidelity.band.upper()})",
+            "fidelity": fidelity.to_dict(),
+            "local_decision": True,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        logger.info(f"Local fidelity {upstream_persona} → {downstream_persona}: {fidelity.score:.2f} ({fidelity.band})")
+        return verification_result
+    
+    @traced("handoff.collaborative", kind=SPAN_KIND_HOP)
     async def facilitate_collaborative_handoff(self, req_id: str, upstream_persona: str, downstream_persona: str,
                                              upstream_output: str) -> Dict[str, Any]:
         """Facilitate collaborative handoff between personas"""
@@ -220,80 +322,37 @@ class CommunicationAwareOrchestrator:
         logger.info(f"Collaborative handoff {upstream_persona} → {downstream_persona}: {'READY' if handoff_result['handoff_complete'] else 'IN_PROGRESS'}")
         return handoff_result
     
+    @traced("workflow.communication_aware", kind=SPAN_KIND_WORKFLOW)
     async def execute_communication_aware_workflow(self, requirement_text: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow with communication intelligence"""
         
+        with usage_scope(WorkflowUsage(str(uuid.uuid4()), self.budget)) as usage:
+            workflow_result = await self._execute_communication_aware_workflow(requirement_text, context)
+            usage.workflow_id = workflow_result["requirement_id"]
+            workflow_result["usage"] = usage.summary()
+        logger.info(f"💸 Usage: {workflow_result['usage']['total_tokens']} tokens, "
+                    f"${workflow_result['usage']['cost_usd']:.4f}")
+        return workflow_result
+    
+    async def _execute_communication_aware_workflow(self, requirement_text: str,
+                                                    context: Dict[str, Any]) -> Dict[str, Any]:
         logger.info("🎯 Starting Communication-Aware Workflow Execution")
         logger.info("="*70)
         
         # Step 1: Store original requirement in knowledge hub
         req_id = await self.store_original_requirement(requirement_text, context)
+        workflow_span = get_tracer().current_span()
+        workflow_span.set_attribute("g1.requirement_id", req_id)
         logger.info(f"✅ Requirement stored in knowledge hub: {req_id}")
         
-        # Step 2: Process with each persona using pull-based context
-        persona_results = {}
-        previous_persona = None
-        previous_output = None
+        # Risk/complexity drive the verification policy for this requirement
+        self.requirement_labels = get_classifier().classify(requirement_text)
         
-        for i, persona in enumerate(self.workflow_personas):
-            logger.info(f"\n{i+1}️⃣ Processing with {persona.upper()}")
-            
-            # Pull appropriate context from knowledge hub
-            persona_context = await self.get_context_from_hub(req_id, persona, "standard")
-            
-            # Add context from context manager for workflow continuity
-            if persona in self.context_manager.persona_outputs:
-                workflow_context = self.context_manager.get_enriched_context(persona, persona_context)
-            else:
-                workflow_context = persona_context
-            
-            # Process with persona
-            result = await self.persona_client.call_persona(
-                persona,
-                requirement_text,
-                workflow_context,
-                self.context_manager
-            )
-            
-            persona_results[persona] = result
-            persona_output = result.get("response", "")
-            
-            # Log interpretation back to knowledge hub
-            await self.log_persona_interpretation(req_id, persona, persona_output)
-            
-            # Verification step (if not first persona)
-            if previous_persona and previous_output:
-                logger.info(f"🔍 Verifying understanding: {previous_persona} → {persona}")
-                
-                # Ask current persona to paraphrase their understanding
-                understanding_check = await self.persona_client.call_persona(
-                    persona,
-                    f"Please paraphrase your understanding of the previous output from {previous_persona}: {previous_output[:300]}...",
-                    {"verification_check": True}
-                )
-                
-                # Verify understanding
-                verification = await self.verify_understanding(
-                    req_id, previous_persona, persona, 
-                    previous_output, understanding_check.get("response", "")
-                )
-                
-                persona_results[persona]["verification"] = verification
-                
-                # Collaborative handoff if verification passes
-                if verification.get("verified", False):
-                    logger.info(f"🤝 Facilitating collaborative handoff: {previous_persona} → {persona}")
-                    handoff = await self.facilitate_collaborative_handoff(
-                        req_id, previous_persona, persona, previous_output
-                    )
-                    persona_results[persona]["handoff"] = handoff
-                else:
-                    logger.warning(f"⚠️ Verification failed, clarification may be needed")
-            
-            previous_persona = persona
-            previous_output = persona_output
-            
-            logger.info(f"✅ {persona} completed successfully")
+        # Step 2: Process with each persona using pull-based context
+        if self.pipelined:
+            persona_results = await self._execute_pipelined_handoffs(req_id, requirement_text)
+        else:
+            persona_results = await self._execute_sequential_handoffs(req_id, requirement_text)
         
         # Step 3: Final analysis and communication quality assessment
         logger.info(f"\n📊 Analyzing Communication Quality")
@@ -311,9 +370,17 @@ class CommunicationAwareOrchestrator:
             "verifications_passed": sum(1 for r in persona_results.values() 
                                      if r.get("verification", {}).get("verified", False)),
             "handoffs_completed": sum(1 for r in persona_results.values()
-                                   if r.get("handoff", {}).get("handoff_complete", False))
+                                   if r.get("handoff", {}).get("handoff_complete", False)),
+            "reruns": sum(1 for r in persona_results.values() if r.get("rerun")),
+            "verifications_skipped": sum(1 for r in persona_results.values()
+                                      if r.get("verification_policy", {}).get("action") == "skip"),
+            "communication_mode": "pipelined" if self.pipelined else "sequential",
+            "trace_id": workflow_span.trace_id
         }
         
+        if self.verification_policy:
+            self.verification_policy.save()
+        
         logger.info("🎉 Communication-Aware Workflow Completed")
         logger.info(f"   Personas: {len(persona_results)}")
         logger.info(f"   Verifications: {workflow_result['verifications_passed']}")
@@ -321,6 +388,196 @@ class CommunicationAwareOrchestrator:
         
         return workflow_result
     
+    async def _run_persona(self, req_id: str, persona: str, requirement_text: str,
+                           clarification: Optional[str] = None) -> Dict[str, Any]:
+        """Pull hub context and execute one workflow persona"""
+        # Pull appropriate context from knowledge hub
+        persona_context = await self.get_context_from_hub(req_id, persona, "standard")
+        
+        # Add context from context manager for workflow continuity
+        if persona in self.context_manager.persona_outputs:
+            workflow_context = self.context_manager.get_enriched_context(persona, persona_context)
+        else:
+            workflow_context = persona_context
+        
+        if clarification:
+            workflow_context = dict(workflow_context, verification_feedback=clarification)
+        
+        # Process with persona
+        return await self.persona_client.call_persona(
+            persona,
+            requirement_text,
+            workflow_context,
+            self.context_manager
+        )
+    
+    async def _read_back(self, req_id: str, upstream_persona: str, downstream_persona: str,
+                         upstream_output: str, downstream_output: str, force: bool = False) -> Dict[str, Any]:
+        """Verify a handoff and, if verified, facilitate the collaborative transition"""
+        outcome = {}
+        if self.verification_policy and not force:
+            labels = self.requirement_labels
+            decision = self.verification_policy.decide(
+                req_id, upstream_persona, downstream_persona, upstream_output, downstream_output,
+                risk_score=labels.risk_score if labels else 0.0,
+                complexity_score=labels.complexity_score if labels else 0.0
+            )
+            outcome["verification_policy"] = decision.to_dict()
+            if not decision.verify:
+                logger.info(f"⏭️ Skipping verification {upstream_persona} → {downstream_persona}: {decision.reason}")
+                return outcome
+        
+        # Near the workflow budget the read-back (paraphrase + verification) is skipped
+        usage = current_usage()
+        budget_plan = usage.plan_call(self.verification_service) if usage else None
+        if budget_plan and budget_plan.skip:
+            outcome["verification_policy"] = VerificationDecision(DECISION_SKIP, budget_plan.reason).to_dict()
+            logger.info(f"⏭️ Skipping verification {upstream_persona} → {downstream_persona}: {budget_plan.reason}")
+            return outcome
+        
+        logger.info(f"🔍 Verifying understanding: {upstream_persona} → {downstream_persona}")
+        
+        if self.merge_readback:
+            verification = await self.verify_readback(
+                req_id, upstream_persona, downstream_persona, upstream_output, downstream_output
+            )
+        else:
+            # Ask current persona to paraphrase their understanding
+            understanding_check = await self.persona_client.call_persona(
+                downstream_persona,
+                f"Please paraphrase your understanding of the previous output from {upstream_persona}: {upstream_output[:300]}...",
+                {"verification_check": True}
+            )
+            
+            # Verify understanding
+            verification = await self.verify_understanding(
+                req_id, upstream_persona, downstream_persona,
+                upstream_output, understanding_check.get("response", "")
+            )
+        
+        outcome["verification"] = verification
+        if self.verification_policy:
+            self.verification_policy.record(upstream_persona, downstream_persona, verification.get("verified", False))
+        
+        # Collaborative handoff if verification passes
+        if verification.get("verified", False):
+            logger.info(f"🤝 Facilitating collaborative handoff: {upstream_persona} → {downstream_persona}")
+            outcome["handoff"] = await self.facilitate_collaborative_handoff(
+                req_id, upstream_persona, downstream_persona, upstream_output
+            )
+        else:
+            logger.warning(f"⚠️ Verification failed, clarification may be needed")
+        
+        return outcome
+    
+    async def _execute_sequential_handoffs(self, req_id: str, requirement_text: str) -> Dict[str, Dict[str, Any]]:
+        """Run personas one at a time, verifying each handoff before the next persona"""
+        persona_results = {}
+        previous_persona = None
+        previous_output = None
+        
+        for i, persona in enumerate(self.workflow_personas):
+            logger.info(f"\n{i+1}️⃣ Processing with {persona.upper()}")
+            
+            result = await self._run_persona(req_id, persona, requirement_text)
+            persona_results[persona] = result
+            persona_output = result.get("response", "")
+            
+            # Log interpretation back to knowledge hub
+            await self.log_persona_interpretation(req_id, persona, persona_output)
+            
+            # Verification step (if not first persona)
+            if previous_persona and previous_output:
+                persona_results[persona].update(await self._read_back(
+                    req_id, previous_persona, persona, previous_output, persona_output
+                ))
+            
+            previous_persona = persona
+            previous_output = persona_output
+            
+            logger.info(f"✅ {persona} completed successfully")
+        
+        return persona_results
+    
+    async def _execute_pipelined_handoffs(self, req_id: str, requirement_text: str) -> Dict[str, Dict[str, Any]]:
+        """Run personas with audit logging in the background and verification of
+        handoff N overlapping persona N+1; a failed verification re-runs both"""
+        persona_results = {}
+        audit_tasks = []
+        reruns_left = self.max_reruns
+        pending = None  # (upstream, downstream, read-back task) of the handoff in flight
+        
+        async def run(persona: str, clarification: Optional[str] = None) -> Dict[str, Any]:
+            result = await self._run_persona(req_id, persona, requirement_text, clarification)
+            persona_results[persona] = result
+            audit_tasks.append(asyncio.ensure_future(
+                self.log_persona_interpretation(req_id, persona, result.get("response", ""))
+            ))
+            logger.info(f"✅ {persona} completed successfully")
+            return result
+        
+        def read_back(upstream: str, downstream: str) -> asyncio.Future:
+            return asyncio.ensure_future(self._read_back(
+                req_id, upstream, downstream,
+                persona_results[upstream].get("response", ""),
+                persona_results[downstream].get("response", "")
+            ))
+        
+        async def settle(upstream: str, downstream: str, task: asyncio.Future, speculative: Optional[str]):
+            """Attach the read-back outcome, rolling back and re-running on failure"""
+            nonlocal reruns_left
+            outcome = await task
+            failed = "verification" in outcome and not outcome["verification"].get("verified", False)
+            if failed and reruns_left > 0:
+                reruns_left -= 1
+                logger.warning(f"↩️ Re-running {downstream} after failed verification from {upstream}")
+                
+                # Discard everything built on the unverified output
+                if speculative:
+                    self.context_manager.rollback_persona_output(speculative)
+                self.context_manager.rollback_persona_output(downstream)
+                
+                await run(downstream, outcome["verification"].get("verification_response", ""))
+                persona_results[downstream]["rerun"] = True
+                outcome = await self._read_back(
+                    req_id, upstream, downstream,
+                    persona_results[upstream].get("response", ""),
+                    persona_results[downstream].get("response", ""),
+                    force=True
+                )
+                if speculative:
+                    await run(speculative)
+                    persona_results[speculative]["rerun"] = True
+            persona_results[downstream].update(outcome)
+        
+        try:
+            for i, persona in enumerate(self.workflow_personas):
+                logger.info(f"\n{i+1}️⃣ Processing with {persona.upper()}")
+                
+                # Runs while the previous handoff is still being verified
+                await run(persona)
+                
+                if pending:
+                    await settle(*pending, speculative=persona)
+                if i > 0:
+                    upstream = self.workflow_personas[i - 1]
+                    pending = (upstream, persona, read_back(upstream, persona))
+            
+            if pending:
+                await settle(*pending, speculative=None)
+                pending = None
+        finally:
+            if pending and not pending[2].done():
+                pending[2].cancel()
+            
+            # The audit trail must be complete before the quality analysis reads it
+            for outcome in await asyncio.gather(*audit_tasks, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Interpretation logging failed: {outcome}")
+        
+        return persona_results
+    
+    @traced("phase.communication_analysis", kind=SPAN_KIND_PHASE)
     async def analyze_communication_quality(self, req_id: str, persona_results: Dict) -> Dict[str, Any]:
         """Analyze overall communication quality using knowledge hub"""
         
@@ -392,4 +649,5 @@ async def test_communication_aware_workflow():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_communication_aware_workflow())
\ No newline at end of file
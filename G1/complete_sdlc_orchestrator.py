@@ -28,17 +28,30 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 
-from workflow_orchestrator import PersonaAPIClient, WorkflowContextManager
+from workflow_orchestrator import WorkflowContextManager, get_persona_client
+from workflow_tracing import get_tracer, traced, SPAN_KIND_WORKFLOW, SPAN_KIND_PHASE, SPAN_KIND_HOP, SPAN_KIND_PERSONA
+from dependency_scheduler import DependencyScheduler
+from workflow_checkpoints import WorkflowCheckpointStore, STATUS_COMPLETED, STATUS_FAILED
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CompleteSDLCOrchestrator:
     """Complete SDLC orchestrator with all critical entities"""
     
-    def __init__(self):
-        self.persona_client = PersonaAPIClient()
+    def __init__(self, max_concurrency: Optional[int] = None, max_parallel_teams: int = 4,
+                 team_timeout: Optional[float] = None, fail_fast: bool = False,
+                 checkpoint_store: Optional[WorkflowCheckpointStore] = None):
+        self.persona_client = get_persona_client()
+        self.max_concurrency = max_concurrency
+        
+        # Multi-team development: bounded team fan-out, optional per-team timeout,
+        # and whether one failed team cancels the teams still in flight
+        self.max_parallel_teams = max_parallel_teams
+        self.team_timeout = team_timeout
+        self.fail_fast = fail_fast
+        
+        # Per-step checkpoints keyed by requirement id (G1_CHECKPOINT_DB=path)
+        self.checkpoint_store = checkpoint_store if checkpoint_store is not None else WorkflowCheckpointStore.from_env()
         self.context_manager = WorkflowContextManager()
         
         # Communication personas
@@ -83,19 +96,85 @@ class CompleteSDLCOrchestrator:
                 "release-manager"      # To be added
             ]
         }
+        
+        # Persona steps of the planning phases and the steps each one builds on.
+        # Independent steps (e.g. API and database design) run concurrently.
+        self.sdlc_steps = {
+            "requirement_concierge": {
+                "phase": "requirements_analysis", "persona": "requirement-concierge", "scope": "complete",
+                "label": "1️⃣ Requirement Concierge Analysis",
+                "instruction": "Perform comprehensive requirements analysis for: {requirement}",
+                "depends_on": []
+            },
+            "program_manager": {
+                "phase": "solution_architecture", "persona": "program-manager", "scope": "standard",
+                "label": "2️⃣ Program Manager Planning",
+                "instruction": "Create comprehensive project plan based on requirements analysis.",
+                "depends_on": ["requirement_concierge"]
+            },
+            "solution_architect": {
+                "phase": "solution_architecture", "persona": "solution-architect", "scope": "complete",
+                "label": "3️⃣ Solution Architect Technology Selection",
+                "instruction": "Define solution architecture, technology stack, and platform decisions.",
+                "depends_on": ["requirement_concierge"]
+            },
+            "technical_architect": {
+                "phase": "solution_architecture", "persona": "technical-architect", "scope": "complete",
+                "label": "4️⃣ Technical Architect System Design",
+                "instruction": "Create detailed technical architecture and system component design.",
+                "depends_on": ["solution_architect"]
+            },
+            "api_designer": {
+                "phase": "design_specification", "persona": "api-designer", "scope": "complete",
+                "label": "5️⃣ API Designer Interface Contracts",
+                "instruction": "Design comprehensive API contracts and interface specifications.",
+                "depends_on": ["technical_architect"]
+            },
+            "database_architect": {
+                "phase": "design_specification", "persona": "database-architect", "scope": "complete",
+                "label": "6️⃣ Database Architect Data Architecture",
+                "instruction": "Design database architecture, data models, and performance optimization.",
+                "depends_on": ["technical_architect"]
+            },
+            "team_lead_coordinator": {
+                "phase": "multi_team_coordination", "persona": "team-lead-coordinator", "scope": "complete",
+                "label": "7️⃣ Team Lead Coordinator Multi-Team Planning",
+                "instruction": "Coordinate multi-team development with configuration: {team_configuration}",
+                "team_context": True,
+                "depends_on": ["program_manager", "api_designer", "database_architect"]
+            },
+            "integration_team_leader": {
+                "phase": "multi_team_coordination", "persona": "integration-team-leader", "scope": "complete",
+                "label": "8️⃣ Integration Team Leader Interface Validation",
+                "instruction": "Plan cross-team integration and validate interface contracts.",
+                "team_context": True,
+                "depends_on": ["api_designer", "database_architect"]
+            }
+        }
     
+    @traced("workflow.complete_sdlc", kind=SPAN_KIND_WORKFLOW)
     async def execute_complete_sdlc_workflow(self, requirement_text: str, context: Dict[str, Any], 
-                                           team_configuration: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute complete SDLC workflow with all phases"""
+                                           team_configuration: Dict[str, Any],
+                                           requirement_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute complete SDLC workflow with all phases (requirement_id resumes a checkpointed run)"""
         
         logger.info("🚀 Starting Complete SDLC Workflow Execution")
         logger.info("="*80)
         
-        # Store original requirement in knowledge hub
-        req_id = await self.store_requirement_in_hub(requirement_text, context)
+        # Store original requirement in knowledge hub (already stored when resuming)
+        req_id = requirement_id or await self.store_requirement_in_hub(requirement_text, context)
+        if self.checkpoint_store:
+            self.checkpoint_store.save_workflow(req_id, "complete_sdlc", {
+                "requirement_text": requirement_text,
+                "context": context,
+                "team_configuration": team_configuration
+            })
+        workflow_span = get_tracer().current_span()
+        workflow_span.set_attribute("g1.requirement_id", req_id)
         
         workflow_results = {
             "requirement_id": req_id,
+            "trace_id": workflow_span.trace_id,
             "original_requirement": requirement_text,
             "team_configuration": team_configuration,
             "phase_results": {},
@@ -103,55 +182,56 @@ class CompleteSDLCOrchestrator:
             "quality_metrics": {}
         }
         
-        # Phase 1: Requirements & Analysis
-        logger.info("\n📋 PHASE 1: Requirements & Analysis")
-        phase1_results = await self.execute_requirements_analysis_phase(req_id, requirement_text, context)
-        workflow_results["phase_results"]["requirements_analysis"] = phase1_results
-        
-        # Phase 2: Solution Architecture & Design  
-        logger.info("\n🏗️ PHASE 2: Solution Architecture & Design")
-        phase2_results = await self.execute_solution_architecture_phase(req_id, phase1_results)
-        workflow_results["phase_results"]["solution_architecture"] = phase2_results
-        
-        # Phase 3: Design Specification
-        logger.info("\n📐 PHASE 3: Design Specification") 
-        phase3_results = await self.execute_design_specification_phase(req_id, phase2_results)
-        workflow_results["phase_results"]["design_specification"] = phase3_results
-        
-        # Phase 4: Multi-Team Coordination
-        logger.info("\n👥 PHASE 4: Multi-Team Coordination")
-        phase4_results = await self.execute_multi_team_coordination_phase(req_id, team_configuration, phase3_results)
-        workflow_results["phase_results"]["multi_team_coordination"] = phase4_results
-        
-        # Phase 5: Multi-Team Development (Parallel)
-        logger.info("\n💻 PHASE 5: Multi-Team Development") 
-        phase5_results = await self.execute_multi_team_development_phase(req_id, team_configuration, phase4_results)
-        workflow_results["phase_results"]["development"] = phase5_results
-        
-        # Phase 6: Integration & Validation
-        logger.info("\n🔗 PHASE 6: Integration & Validation")
-        phase6_results = await self.execute_integration_phase(req_id, phase5_results)
-        workflow_results["phase_results"]["integration"] = phase6_results
-        
-        # Phase 7: Quality Assurance & Review
-        logger.info("\n✅ PHASE 7: Quality Assurance & Review")
-        phase7_results = await self.execute_quality_assurance_phase(req_id, phase6_results)
-        workflow_results["phase_results"]["quality_assurance"] = phase7_results
-        
-        # Phase 8: Deployment & Release
-        logger.info("\n🚀 PHASE 8: Deployment & Release")
-        phase8_results = await self.execute_deployment_phase(req_id, phase7_results)
-        workflow_results["phase_results"]["deployment"] = phase8_results
+        # Phases 1-8 as one dependency graph: persona steps of the planning phases,
+        # then development → integration → quality assurance → deployment
+        scheduler = self.build_sdlc_schedule(req_id, requirement_text, team_configuration)
+        try:
+            step_results = await scheduler.run()
+        except BaseException:
+            if self.checkpoint_store:
+                self.checkpoint_store.set_status(req_id, STATUS_FAILED)
+            raise
+        
+        phase_results = workflow_results["phase_results"]
+        for step_name, step in self.sdlc_steps.items():
+            phase_results.setdefault(step["phase"], {})[step_name] = step_results[step_name]
+        for phase in ("development", "integration", "quality_assurance", "deployment"):
+            phase_results[phase] = step_results[phase]
+        
+        workflow_results["schedule"] = {
+            "timings": scheduler.timings,
+            "critical_path": scheduler.critical_path()
+        }
+        logger.info(f"⏱️ SDLC critical path: {' → '.join(workflow_results['schedule']['critical_path'])}")
         
         # Final SDLC Analysis
         logger.info("\n📊 FINAL SDLC ANALYSIS")
         final_analysis = await self.analyze_complete_sdlc_execution(req_id, workflow_results)
         workflow_results["final_analysis"] = final_analysis
+        if self.checkpoint_store:
+            self.checkpoint_store.set_status(req_id, STATUS_COMPLETED)
         
         logger.info("🎉 Complete SDLC Workflow Execution Completed")
         
         return workflow_results
     
+    async def resume_complete_sdlc_workflow(self, req_id: str) -> Dict[str, Any]:
+        """Resume a checkpointed SDLC run; completed persona steps and teams are not re-executed"""
+        if not self.checkpoint_store:
+            raise ValueError("Checkpointing is not enabled (pass checkpoint_store or set G1_CHECKPOINT_DB)")
+        
+        record = self.checkpoint_store.get_workflow(req_id)
+        if record is None or record["kind"] != "complete_sdlc":
+            raise ValueError(f"No checkpointed SDLC workflow {req_id}")
+        
+        logger.info(f"♻️ Resuming SDLC workflow {req_id} ({record['status']})")
+        payload = record["payload"]
+        return await self.execute_complete_sdlc_workflow(
+            payload["requirement_text"], payload["context"], payload["team_configuration"],
+            requirement_id=req_id
+        )
+    
+    @traced("hub.store_requirement", kind=SPAN_KIND_HOP)
     async def store_requirement_in_hub(self, requirement_text: str, context: Dict[str, Any]) -> str:
         """Store original requirement with complete SDLC context"""
         req_id = str(uuid.uuid4())
@@ -187,153 +267,202 @@ class CompleteSDLCOrchestrator:
         logger.info(f"✅ Stored SDLC requirement {req_id} in knowledge hub")
         return req_id
     
+    def build_sdlc_schedule(self, req_id: str, requirement_text: str,
+                            team_configuration: Dict[str, Any]) -> DependencyScheduler:
+        """Dependency graph of the complete SDLC, ready to run"""
+        scheduler = DependencyScheduler(self.max_concurrency)
+        restored = self.checkpoint_store.load_steps(req_id) if self.checkpoint_store else {}
+        if restored:
+            logger.info(f"♻️ Restored {len(restored)} completed steps from checkpoint")
+        
+        for step_name, step in self.sdlc_steps.items():
+            scheduler.add(
+                step_name,
+                self._checkpointed(req_id, step_name, restored,
+                                   self._step_runner(req_id, step, requirement_text, team_configuration)),
+                step["depends_on"]
+            )
+        
+        coordination_steps = [n for n, s in self.sdlc_steps.items() if s["phase"] == "multi_team_coordination"]
+        
+        async def development(inputs):
+            logger.info("\n💻 PHASE 5: Multi-Team Development")
+            return await self.execute_multi_team_development_phase(req_id, team_configuration, inputs)
+        
+        async def integration(inputs):
+            logger.info("\n🔗 PHASE 6: Integration & Validation")
+            return await self.execute_integration_phase(req_id, inputs["development"])
+        
+        async def quality_assurance(inputs):
+            logger.info("\n✅ PHASE 7: Quality Assurance & Review")
+            return await self.execute_quality_assurance_phase(req_id, inputs["integration"])
+        
+        async def deployment(inputs):
+            logger.info("\n🚀 PHASE 8: Deployment & Release")
+            return await self.execute_deployment_phase(req_id, inputs["quality_assurance"])
+        
+        # Development only checkpoints as a whole once every team completed;
+        # finished teams are checkpointed individually by the development phase
+        def all_teams_completed(result):
+            return all(team.get("status") == "completed" for team in result.values())
+        
+        scheduler.add("development", self._checkpointed(req_id, "development", restored, development,
+                                                        all_teams_completed), coordination_steps)
+        scheduler.add("integration", self._checkpointed(req_id, "integration", restored, integration),
+                      ["development"])
+        scheduler.add("quality_assurance", self._checkpointed(req_id, "quality_assurance", restored, quality_assurance),
+                      ["integration"])
+        scheduler.add("deployment", self._checkpointed(req_id, "deployment", restored, deployment),
+                      ["quality_assurance"])
+        return scheduler
+    
+    def _checkpointed(self, req_id: str, step_name: str, restored: Dict[str, Any], run,
+                      completed=lambda result: True):
+        """Wrap a step runner so a checkpointed result is reused and a new one is saved"""
+        async def checkpointed_run(inputs: Dict[str, Any]) -> Any:
+            if step_name in restored:
+                logger.info(f"   ♻️ {step_name} restored from checkpoint")
+                return restored[step_name]
+            result = await run(inputs)
+            if self.checkpoint_store and completed(result):
+                self.checkpoint_store.save_step(req_id, step_name, result)
+            return result
+        return checkpointed_run
+    
+    def _step_runner(self, req_id: str, step: Dict[str, Any], requirement_text: str,
+                     team_config: Dict[str, Any]):
+        async def run(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.execute_sdlc_step(req_id, step, requirement_text, team_config)
+        return run
+    
+    async def execute_sdlc_step(self, req_id: str, step: Dict[str, Any], requirement_text: str,
+                                team_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Pull hub context, call the step's persona and log its interpretation"""
+        persona = step["persona"]
+        with get_tracer().span(f"persona.{persona}", kind=SPAN_KIND_PERSONA,
+                               attributes={"g1.persona": persona, "g1.phase": step["phase"]}):
+            logger.info(f"   {step['label']}")
+            persona_context = await self.get_context_from_hub(req_id, persona, step["scope"])
+            if step.get("team_context"):
+                persona_context.update({"team_configuration": team_config})
+            
+            result = await self.persona_client.call_persona(
+                persona,
+                step["instruction"].format(
+                    requirement=requirement_text,
+                    team_configuration=json.dumps(team_config, indent=2)
+                ),
+                persona_context
+            )
+            await self.log_persona_interpretation(req_id, persona, result.get("response", ""))
+            return result
+    
+    async def _execute_phase_steps(self, phase: str, req_id: str, requirement_text: str = "",
+                                   team_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one planning phase on its own; steps of earlier phases count as done"""
+        scheduler = DependencyScheduler(self.max_concurrency)
+        for step_name, step in self.sdlc_steps.items():
+            if step["phase"] == phase:
+                scheduler.add(
+                    step_name,
+                    self._step_runner(req_id, step, requirement_text, team_config or {}),
+                    [d for d in step["depends_on"] if self.sdlc_steps[d]["phase"] == phase]
+                )
+        return await scheduler.run()
+    
+    @traced("phase.requirements_analysis", kind=SPAN_KIND_PHASE)
     async def execute_requirements_analysis_phase(self, req_id: str, requirement_text: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute requirements analysis phase"""
-        
-        phase_results = {}
-        
-        # Requirement Concierge Analysis
-        logger.info("   1️⃣ Requirement Concierge Analysis")
-        concierge_context = await self.get_context_from_hub(req_id, "requirement-concierge", "complete")
-        concierge_result = await self.persona_client.call_persona(
-            "requirement-concierge",
-            f"Perform comprehensive requirements analysis for: {requirement_text}",
-            concierge_context
-        )
-        phase_results["requirement_concierge"] = concierge_result
-        
-        # Log interpretation
-        await self.log_persona_interpretation(req_id, "requirement-concierge", concierge_result.get("response", ""))
-        
-        return phase_results
+        return await self._execute_phase_steps("requirements_analysis", req_id, requirement_text)
     
+    @traced("phase.solution_architecture", kind=SPAN_KIND_PHASE)
     async def execute_solution_architecture_phase(self, req_id: str, requirements_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute solution architecture and high-level design phase"""
-        
-        phase_results = {}
-        
-        # Program Manager Planning
-        logger.info("   2️⃣ Program Manager Planning")
-        pm_context = await self.get_context_from_hub(req_id, "program-manager", "standard")
-        pm_result = await self.persona_client.call_persona(
-            "program-manager",
-            "Create comprehensive project plan based on requirements analysis.",
-            pm_context
-        )
-        phase_results["program_manager"] = pm_result
-        await self.log_persona_interpretation(req_id, "program-manager", pm_result.get("response", ""))
-        
-        # Solution Architect Technology Decisions
-        logger.info("   3️⃣ Solution Architect Technology Selection")
-        sol_arch_context = await self.get_context_from_hub(req_id, "solution-architect", "complete")
-        sol_arch_result = await self.persona_client.call_persona(
-            "solution-architect",
-            "Define solution architecture, technology stack, and platform decisions.",
-            sol_arch_context
-        )
-        phase_results["solution_architect"] = sol_arch_result
-        await self.log_persona_interpretation(req_id, "solution-architect", sol_arch_result.get("response", ""))
-        
-        # Technical Architect Detailed Design
-        logger.info("   4️⃣ Technical Architect System Design")
-        tech_arch_context = await self.get_context_from_hub(req_id, "technical-architect", "complete")
-        tech_arch_result = await self.persona_client.call_persona(
-            "technical-architect", 
-            "Create detailed technical architecture and system component design.",
-            tech_arch_context
-        )
-        phase_results["technical_architect"] = tech_arch_result
-        await self.log_persona_interpretation(req_id, "technical-architect", tech_arch_result.get("response", ""))
-        
-        return phase_results
+        return await self._execute_phase_steps("solution_architecture", req_id)
     
+    @traced("phase.design_specification", kind=SPAN_KIND_PHASE)
     async def execute_design_specification_phase(self, req_id: str, architecture_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute detailed design specification phase"""
-        
-        phase_results = {}
-        
-        # API Designer Interface Specifications
-        logger.info("   5️⃣ API Designer Interface Contracts")
-        api_context = await self.get_context_from_hub(req_id, "api-designer", "complete")
-        api_result = await self.persona_client.call_persona(
-            "api-designer",
-            "Design comprehensive API contracts and interface specifications.",
-            api_context
-        )
-        phase_results["api_designer"] = api_result
-        await self.log_persona_interpretation(req_id, "api-designer", api_result.get("response", ""))
-        
-        # Database Architect Data Design
-        logger.info("   6️⃣ Database Architect Data Architecture")
-        db_context = await self.get_context_from_hub(req_id, "database-architect", "complete")
-        db_result = await self.persona_client.call_persona(
-            "database-architect",
-            "Design database architecture, data models, and performance optimization.",
-            db_context
-        )
-        phase_results["database_architect"] = db_result
-        await self.log_persona_interpretation(req_id, "database-architect", db_result.get("response", ""))
-        
-        return phase_results
+        return await self._execute_phase_steps("design_specification", req_id)
     
+    @traced("phase.multi_team_coordination", kind=SPAN_KIND_PHASE)
     async def execute_multi_team_coordination_phase(self, req_id: str, team_config: Dict[str, Any], 
                                                   design_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute multi-team coordination and dependency management phase"""
-        
-        phase_results = {}
-        
-        # Team Lead Coordinator Multi-Team Planning
-        logger.info("   7️⃣ Team Lead Coordinator Multi-Team Planning") 
-        coord_context = await self.get_context_from_hub(req_id, "team-lead-coordinator", "complete")
-        coord_context.update({"team_configuration": team_config})
-        coord_result = await self.persona_client.call_persona(
-            "team-lead-coordinator",
-            f"Coordinate multi-team development with configuration: {json.dumps(team_config, indent=2)}",
-            coord_context
-        )
-        phase_results["team_lead_coordinator"] = coord_result
-        await self.log_persona_interpretation(req_id, "team-lead-coordinator", coord_result.get("response", ""))
-        
-        # Integration Team Leader Interface Planning
-        logger.info("   8️⃣ Integration Team Leader Interface Validation")
-        integ_context = await self.get_context_from_hub(req_id, "integration-team-leader", "complete")
-        integ_context.update({"team_configuration": team_config})
-        integ_result = await self.persona_client.call_persona(
-            "integration-team-leader",
-            "Plan cross-team integration and validate interface contracts.",
-            integ_context
-        )
-        phase_results["integration_team_leader"] = integ_result
-        await self.log_persona_interpretation(req_id, "integration-team-leader", integ_result.get("response", ""))
-        
-        return phase_results
+        return await self._execute_phase_steps("multi_team_coordination", req_id, team_config=team_config)
     
+    @traced("phase.development", kind=SPAN_KIND_PHASE)
     async def execute_multi_team_development_phase(self, req_id: str, team_config: Dict[str, Any],
                                                  coordination_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute multi-team parallel development phase"""
         
         phase_results = {}
-        teams = team_config.get("teams", ["frontend", "backend", "platform"])
+        teams = list(team_config.get("teams", ["frontend", "backend", "platform"]))
+        restored = self.checkpoint_store.load_steps(req_id) if self.checkpoint_store else {}
         
-        # Execute development for each team in parallel
-        development_tasks = []
+        # A bounded pool of workers drains the team queue so large programs
+        # don't flood the gateway with every team at once
+        queue = asyncio.Queue()
         for team in teams:
-            task = self.execute_team_development(req_id, team, team_config)
-            development_tasks.append(task)
-        
-        # Wait for all teams to complete
-        team_results = await asyncio.gather(*development_tasks, return_exceptions=True)
-        
-        for i, team in enumerate(teams):
-            if not isinstance(team_results[i], Exception):
-                phase_results[f"{team}_team"] = team_results[i]
-                logger.info(f"   ✅ {team.title()} team development completed")
-            else:
-                logger.error(f"   ❌ {team.title()} team development failed: {team_results[i]}")
-                phase_results[f"{team}_team"] = {"error": str(team_results[i])}
-        
-        return phase_results
+            queue.put_nowait(team)
+        in_flight: Dict[str, asyncio.Task] = {}
+        aborted = asyncio.Event()
+        
+        async def worker():
+            while not queue.empty():
+                team = queue.get_nowait()
+                if f"development:{team}" in restored:
+                    phase_results[f"{team}_team"] = restored[f"development:{team}"]
+                    logger.info(f"   ♻️ {team.title()} team development restored from checkpoint")
+                    continue
+                if aborted.is_set():
+                    phase_results[f"{team}_team"] = {"team_name": team, "status": "cancelled",
+                                                     "error": "Cancelled after another team failed"}
+                    continue
+                
+                task = asyncio.ensure_future(self.execute_team_development(req_id, team, team_config))
+                in_flight[team] = task
+                try:
+                    done, _ = await asyncio.wait([task], timeout=self.team_timeout)
+                except asyncio.CancelledError:
+                    task.cancel()
+                    raise
+                finally:
+                    in_flight.pop(team, None)
+                
+                if not done:
+                    task.cancel()
+                    status, error = "timed_out", f"No result within {self.team_timeout}s"
+                elif task.cancelled():
+                    status, error = "cancelled", "Cancelled after another team failed"
+                elif task.exception() is not None:
+                    status, error = "failed", str(task.exception())
+                else:
+                    phase_results[f"{team}_team"] = dict(task.result(), status="completed")
+                    if self.checkpoint_store:
+                        self.checkpoint_store.save_step(req_id, f"development:{team}", phase_results[f"{team}_team"])
+                    logger.info(f"   ✅ {team.title()} team development completed")
+                    continue
+                
+                logger.error(f"   ❌ {team.title()} team development {status}: {error}")
+                phase_results[f"{team}_team"] = {"team_name": team, "status": status, "error": error}
+                if self.fail_fast and status != "cancelled":
+                    aborted.set()
+                    for other in list(in_flight.values()):
+                        other.cancel()
+        
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.max_parallel_teams, len(teams)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for w in workers:
+                w.cancel()
+            raise
+        
+        # Report teams in configuration order; partial results keep their status
+        return {f"{team}_team": phase_results[f"{team}_team"] for team in teams}
     
+    @traced("phase.team_development", kind=SPAN_KIND_PHASE)
     async def execute_team_development(self, req_id: str, team_name: str, team_config: Dict[str, Any]) -> Dict[str, Any]:
         """Execute development for a specific team"""
         
@@ -347,30 +476,44 @@ class CompleteSDLCOrchestrator:
             "team_interfaces": team_config.get("interfaces", {}).get(team_name, {})
         })
         
-        # Developer Implementation
-        dev_result = await self.persona_client.call_persona(
-            "developer",
-            f"Implement {team_name} team components according to specifications and interface contracts.",
-            dev_context
-        )
-        
-        await self.log_persona_interpretation(req_id, f"developer-{team_name}", dev_result.get("response", ""))
-        
-        # Team Testing
-        test_context = await self.get_context_from_hub(req_id, "tester", "standard")
-        test_context.update({
-            "team_name": team_name,
-            "implementation": dev_result.get("response", ""),
-            "team_interfaces": team_config.get("interfaces", {}).get(team_name, {})
-        })
-        
-        test_result = await self.persona_client.call_persona(
-            "tester",
-            f"Test {team_name} team implementation and validate interface contracts.",
-            test_context
-        )
-        
-        await self.log_persona_interpretation(req_id, f"tester-{team_name}", test_result.get("response", ""))
+        # The tester's hub context doesn't depend on the implementation: pull it
+        # while the developer works, and log interpretations in the background
+        test_context_task = asyncio.ensure_future(self.get_context_from_hub(req_id, "tester", "standard"))
+        background_logs = []
+        try:
+            # Developer Implementation
+            dev_result = await self.persona_client.call_persona(
+                "developer",
+                f"Implement {team_name} team components according to specifications and interface contracts.",
+                dev_context
+            )
+            
+            background_logs.append(asyncio.ensure_future(
+                self.log_persona_interpretation(req_id, f"developer-{team_name}", dev_result.get("response", ""))
+            ))
+            
+            # Team Testing
+            test_context = await test_context_task
+            test_context.update({
+                "team_name": team_name,
+                "implementation": dev_result.get("response", ""),
+                "team_interfaces": team_config.get("interfaces", {}).get(team_name, {})
+            })
+            
+            test_result = await self.persona_client.call_persona(
+                "tester",
+                f"Test {team_name} team implementation and validate interface contracts.",
+                test_context
+            )
+            
+            background_logs.append(asyncio.ensure_future(
+                self.log_persona_interpretation(req_id, f"tester-{team_name}", test_result.get("response", ""))
+            ))
+            await asyncio.gather(*background_logs)
+        finally:
+            for task in [test_context_task, *background_logs]:
+                if not task.done():
+                    task.cancel()
         
         return {
             "development": dev_result,
@@ -378,6 +521,7 @@ class CompleteSDLCOrchestrator:
             "team_name": team_name
         }
     
+    @traced("phase.integration", kind=SPAN_KIND_PHASE)
     async def execute_integration_phase(self, req_id: str, development_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute cross-team integration phase"""
         
@@ -398,6 +542,7 @@ class CompleteSDLCOrchestrator:
         
         return phase_results
     
+    @traced("phase.quality_assurance", kind=SPAN_KIND_PHASE)
     async def execute_quality_assurance_phase(self, req_id: str, integration_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute comprehensive quality assurance phase"""
         
@@ -418,6 +563,7 @@ class CompleteSDLCOrchestrator:
         
         return phase_results
     
+    @traced("phase.deployment", kind=SPAN_KIND_PHASE)
     async def execute_deployment_phase(self, req_id: str, qa_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute deployment and release phase"""
         
@@ -438,6 +584,7 @@ class CompleteSDLCOrchestrator:
         
         return phase_results
     
+    @traced("hub.get_context", kind=SPAN_KIND_HOP)
     async def get_context_from_hub(self, req_id: str, persona_name: str, context_scope: str = "standard") -> Dict[str, Any]:
         """Pull context from knowledge hub for specific persona"""
         
@@ -464,6 +611,7 @@ class CompleteSDLCOrchestrator:
             "context_scope": context_scope
         }
     
+    @traced("hub.log_interpretation", kind=SPAN_KIND_HOP)
     async def log_persona_interpretation(self, req_id: str, persona_name: str, interpretation: str):
         """Log persona interpretation to knowledge hub"""
         
@@ -487,6 +635,7 @@ class CompleteSDLCOrchestrator:
             }
         )
     
+    @traced("phase.sdlc_analysis", kind=SPAN_KIND_PHASE)
     async def analyze_complete_sdlc_execution(self, req_id: str, workflow_results: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze complete SDLC execution quality"""
         
@@ -581,4 +730,5 @@ async def test_complete_sdlc_workflow():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_complete_sdlc_workflow())
\ No newline at end of file
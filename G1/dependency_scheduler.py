@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Dependency Scheduler
+====================
+
+Runs async steps as soon as everything they depend on has finished, so a
+workflow takes as long as its longest dependency chain instead of the sum of
+its steps.
+
+Each step is a coroutine function receiving the results of its dependencies
+(keyed by step name). Concurrency can be bounded, a failing step cancels the
+steps still running and re-raises, and per-step timings are kept for reports
+and critical-path analysis.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledStep:
+    """A named unit of work and the steps it waits for"""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+
+
+class DependencyScheduler:
+    """Concurrent executor for a DAG of async steps"""
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self.steps: Dict[str, ScheduledStep] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, run: Callable[[Dict[str, Any]], Awaitable[Any]],
+            depends_on: Iterable[str] = ()) -> "DependencyScheduler":
+        """Register a step; dependencies may be added later but must exist before run()"""
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        self.steps[name] = ScheduledStep(name, run, list(depends_on))
+        return self
+
+    def topological_order(self) -> List[str]:
+        """Steps in dependency order (registration order among ready steps)"""
+        for step in self.steps.values():
+            missing = [d for d in step.depends_on if d not in self.steps]
+            if missing:
+                raise ValueError(f"Step {step.name} depends on unknown steps: {missing}")
+
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between steps: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def run(self) -> Dict[str, Any]:
+        """Execute every step, starting each one as soon as its dependencies are done"""
+        order = self.topological_order()
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        origin = time.time()
+        pending = list(order)
+        running: Dict[asyncio.Future, str] = {}
+
+        async def execute(step: ScheduledStep) -> Any:
+            inputs = {d: self.results[d] for d in step.depends_on}
+            if semaphore:
+                async with semaphore:
+                    return await self._timed(step, inputs, origin)
+            return await self._timed(step, inputs, origin)
+
+        try:
+            while pending or running:
+                for name in [n for n in pending if all(d in self.results for d in self.steps[n].depends_on)]:
+                    pending.remove(name)
+                    running[asyncio.ensure_future(execute(self.steps[name]))] = name
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    # Re-raises the step's exception; the finally block cancels the rest
+                    self.results[name] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return {name: self.results[name] for name in self.steps}
+
+    async def _timed(self, step: ScheduledStep, inputs: Dict[str, Any], origin: float) -> Any:
+        start = time.time()
+        try:
+            return await step.run(inputs)
+        finally:
+            self.timings[step.name] = {"start": start - origin, "end": time.time() - origin}
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent steps by measured duration (after run())"""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self.topological_order():
+            timing = self.timings.get(name, {"start": 0.0, "end": 0.0})
+            deps = self.steps[name].depends_on
+            before = max(deps, key=lambda d: finish[d]) if deps else None
+            previous[name] = before
+            finish[name] = (finish[before] if before else 0.0) + timing["end"] - timing["start"]
+
+        if not finish:
+            return []
+        path, current = [], max(finish, key=finish.get)
+        while current:
+            path.append(current)
+            current = previous[current]
+        return list(reversed(path))
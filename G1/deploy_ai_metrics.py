@@ -12,20 +12,21 @@ import requests
 import time
 from datetime import datetime
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from service_registry import resolve_service_url
+from health_probes import HealthProbeEngine
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class G1MetricsDeployment:
     """Deploy AI-driven metrics system into G1 platform"""
     
-    def __init__(self, gateway_url: str = "http://localhost:8013"):
-        self.gateway_url = gateway_url
+    def __init__(self, gateway_url: Optional[str] = None):
+        self.gateway_url = gateway_url or resolve_service_url("personas-gateway", "http://localhost:8013")
         self.deployment_status = {}
         
-    def check_personas_availability(self) -> Dict[str, bool]:
+    async def check_personas_availability(self) -> Dict[str, bool]:
         """Check if new metrics personas are loaded and available"""
         required_personas = [
             "metrics-architect",
@@ -34,19 +35,17 @@ class G1MetricsDeployment:
             "metrics-optimizer"
         ]
         
-        availability = {}
+        # Probed concurrently, so the check costs one timeout at worst instead of one per persona
+        probes = await HealthProbeEngine(gateway_url=self.gateway_url).probe_many(personas=required_personas)
         
+        availability = {}
         for persona in required_personas:
-            try:
-                response = requests.get(f"{self.gateway_url}/personas/{persona}", timeout=10)
-                availability[persona] = response.status_code == 200
-                if availability[persona]:
-                    logger.info(f"✅ {persona} is available")
-                else:
-                    logger.warning(f"❌ {persona} not available (HTTP {response.status_code})")
-            except Exception as e:
-                availability[persona] = False
-                logger.error(f"❌ {persona} connection failed: {e}")
+            result = probes[f"persona:{persona}"]
+            availability[persona] = result.healthy
+            if result.healthy:
+                logger.info(f"✅ {persona} is available")
+            else:
+                logger.warning(f"❌ {persona} not available ({result.detail})")
         
         return availability
     
@@ -271,7 +270,7 @@ class G1MetricsDeployment:
         
         # Step 1: Check persona availability
         logger.info("\n📋 Step 1: Checking AI metrics personas availability...")
-        availability = self.check_personas_availability()
+        availability = await self.check_personas_availability()
         
         if not all(availability.values()):
             logger.error("❌ Not all required personas are available. Please ensure G1 system is running with updated personas.")
@@ -399,4 +398,5 @@ async def main():
     print(f"\n⏰ Total deployment time: {results.get('deployment_end', 'N/A')}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local Fidelity Scorer
+=====================
+
+Cheap, local estimate of how faithfully a downstream text (paraphrase or work
+product) carries the content of an upstream persona output.
+
+Texts are turned into hashed TF-IDF vectors with NumPy (feature hashing, so no
+vocabulary has to be fitted; document frequencies are learned online from the
+texts seen). The fidelity score combines:
+- cosine similarity of the two vectors
+- coverage: share of the upstream's IDF-weighted terms present downstream
+
+Scores above the pass threshold or below the fail threshold are decided
+locally; only the ambiguous band in between needs the LLM verification-service.
+"""
+
+import logging
+import math
+import re
+import zlib
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Dict, Any, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BAND_PASS = "pass"
+BAND_FAIL = "fail"
+BAND_AMBIGUOUS = "ambiguous"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_\-]+")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+your you we our their they them these those should would could can may must not no all any each into
+""".split())
+
+
+@lru_cache(maxsize=65536)
+def _feature_index(token: str, n_features: int) -> int:
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+@dataclass
+class FidelityScore:
+    """Local fidelity estimate for one upstream/downstream pair"""
+    score: float
+    cosine: float
+    coverage: float
+    band: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LocalFidelityScorer:
+    """Hashed TF-IDF overlap scoring with pass/fail/ambiguous bands"""
+
+    def __init__(self, n_features: int = 4096, pass_threshold: float = 0.55,
+                 fail_threshold: float = 0.2, coverage_weight: float = 0.5):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("LocalFidelityScorer requires numpy (see shared/requirements.txt)")
+        if fail_threshold > pass_threshold:
+            raise ValueError("fail_threshold must not exceed pass_threshold")
+
+        self.n_features = n_features
+        self.pass_threshold = pass_threshold
+        self.fail_threshold = fail_threshold
+        self.coverage_weight = coverage_weight
+
+        # Online document frequencies for IDF weighting
+        self._document_frequency = np.zeros(n_features, dtype=np.float64)
+        self._documents = 0
+        self.stats = {BAND_PASS: 0, BAND_FAIL: 0, BAND_AMBIGUOUS: 0}
+
+    def _term_counts(self, text: str) -> "np.ndarray":
+        tokens = [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in _STOPWORDS]
+        indices = np.fromiter((_feature_index(t, self.n_features) for t in tokens), dtype=np.int64, count=len(tokens))
+        return np.bincount(indices, minlength=self.n_features).astype(np.float64)
+
+    def _observe(self, *counts: "np.ndarray"):
+        for c in counts:
+            self._document_frequency += c > 0
+            self._documents += 1
+
+    def _idf(self) -> "np.ndarray":
+        return np.log((1.0 + self._documents) / (1.0 + self._document_frequency)) + 1.0
+
+    def vectorize(self, texts: List[str]) -> "np.ndarray":
+        """Sublinear TF-IDF matrix (one L2-normalized row per text)"""
+        counts = np.vstack([self._term_counts(t) for t in texts]) if texts else np.zeros((0, self.n_features))
+        tf = np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1.0)), 0.0)
+        weights = tf * self._idf()
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        return weights / np.where(norms > 0, norms, 1.0)
+
+    def score(self, upstream_text: str, downstream_text: str) -> FidelityScore:
+        """Score how much of the upstream text is carried downstream"""
+        upstream_counts = self._term_counts(upstream_text)
+        downstream_counts = self._term_counts(downstream_text)
+        self._observe(upstream_counts, downstream_counts)
+
+        if not upstream_counts.any() or not downstream_counts.any():
+            return self._banded(0.0, 0.0, 0.0)
+
+        idf = self._idf()
+        upstream_weights = np.where(upstream_counts > 0, 1.0 + np.log(np.maximum(upstream_counts, 1.0)), 0.0) * idf
+        downstream_weights = np.where(downstream_counts > 0, 1.0 + np.log(np.maximum(downstream_counts, 1.0)), 0.0) * idf
+
+        cosine = float(upstream_weights @ downstream_weights /
+                       (np.linalg.norm(upstream_weights) * np.linalg.norm(downstream_weights)))
+        coverage = float(upstream_weights[downstream_counts > 0].sum() / upstream_weights.sum())
+        combined = (1.0 - self.coverage_weight) * cosine + self.coverage_weight * coverage
+        return self._banded(combined, cosine, coverage)
+
+    def _banded(self, combined: float, cosine: float, coverage: float) -> FidelityScore:
+        if combined >= self.pass_threshold:
+            band = BAND_PASS
+        elif combined < self.fail_threshold:
+            band = BAND_FAIL
+        else:
+            band = BAND_AMBIGUOUS
+        self.stats[band] += 1
+        return FidelityScore(
+            score=round(combined, 4) if not math.isnan(combined) else 0.0,
+            cosine=round(cosine, 4),
+            coverage=round(coverage, 4),
+            band=band
+        )
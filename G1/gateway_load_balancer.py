@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Gateway Load Balancer
+=====================
+
+Client-side load balancing across Personas Gateway replicas.
+
+Replica selection:
+- "least_outstanding": the healthy replica with the fewest in-flight requests
+- "p2c": power of two choices - the less loaded of two random healthy replicas
+- Persona affinity (bounded): each persona prefers one replica (rendezvous
+  hashing) so gateway-side caches stay warm, unless that replica has more than
+  `affinity_slack` requests above the least loaded one
+
+Health:
+- Passive: connection errors and 5xx responses count as failures
+- Active: periodic GET {replica}/health
+- A replica is ejected after `unhealthy_threshold` consecutive failures and
+  readmitted after `healthy_threshold` consecutive successes (defaults from
+  load_balancing.health_check_based_routing in config/service-discovery.yml)
+- If every replica is ejected, all of them are tried again (fail open)
+
+Replicas come from a static list or from the service registry
+(G1_SERVICE_REPLICAS_PERSONAS_GATEWAY=http://gw-1:8013,http://gw-2:8013).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import random
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, Union, TYPE_CHECKING
+
+from service_registry import ServiceEndpoint, get_service_registry
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+STRATEGY_P2C = "p2c"
+
+
+@dataclass
+class GatewayReplica:
+    """Load and health state of one gateway replica"""
+    url: str
+    outstanding: int = 0
+    healthy: bool = True
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    requests: int = 0
+    failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures
+        }
+
+
+class GatewayPool:
+    """Balances gateway requests over a set of replicas"""
+
+    def __init__(self, endpoints: Iterable[Union[str, ServiceEndpoint]],
+                 strategy: str = STRATEGY_LEAST_OUTSTANDING, unhealthy_threshold: int = 3,
+                 healthy_threshold: int = 2, health_interval: float = 30.0, health_timeout: float = 10.0,
+                 health_path: str = "/health", affinity: bool = True, affinity_slack: int = 2,
+                 seed: Optional[int] = None):
+        urls = [e.url if isinstance(e, ServiceEndpoint) else e.rstrip("/") for e in endpoints]
+        if not urls:
+            raise ValueError("GatewayPool needs at least one endpoint")
+        if strategy not in (STRATEGY_LEAST_OUTSTANDING, STRATEGY_P2C):
+            raise ValueError(f"Unknown strategy {strategy!r}")
+
+        self.replicas = [GatewayReplica(url) for url in dict.fromkeys(urls)]
+        self.strategy = strategy
+        self.unhealthy_threshold = unhealthy_threshold
+        self.healthy_threshold = healthy_threshold
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.health_path = health_path
+        self.affinity = affinity
+        self.affinity_slack = affinity_slack
+        self._random = random.Random(seed)
+        self._health_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_registry(cls, service: str = "personas-gateway", **kwargs) -> "GatewayPool":
+        """Pool over a service's registry replicas, with its health-routing thresholds"""
+        registry = get_service_registry()
+        routing = registry.settings.get("load_balancing", {}).get("health_check_based_routing", {})
+        checks = registry.settings.get("communication_patterns", {}).get("health_checks", {})
+        options = {
+            "unhealthy_threshold": routing.get("unhealthy_threshold", 3),
+            "healthy_threshold": routing.get("healthy_threshold", 2),
+            "health_interval": checks.get("interval", 30.0),
+            "health_timeout": checks.get("timeout", 10.0)
+        }
+        options.update(kwargs)
+        return cls(registry.replicas(service), **options)
+
+    # ------------------------------------------------------------------ selection
+
+    @staticmethod
+    def _affinity_score(persona: str, replica: GatewayReplica) -> bytes:
+        return hashlib.blake2b(f"{persona}|{replica.url}".encode("utf-8"), digest_size=8).digest()
+
+    def choose(self, persona: Optional[str] = None, exclude: Iterable[GatewayReplica] = ()) -> GatewayReplica:
+        """Pick the replica for the next request"""
+        excluded = set(id(r) for r in exclude)
+        candidates = [r for r in self.replicas if r.healthy and id(r) not in excluded]
+        if not candidates:
+            # Everything is ejected (or excluded): fail open rather than refuse work
+            candidates = [r for r in self.replicas if id(r) not in excluded] or list(self.replicas)
+
+        least = min(r.outstanding for r in candidates)
+        if self.affinity and persona:
+            preferred = max(candidates, key=lambda r: self._affinity_score(persona, r))
+            if preferred.outstanding <= least + self.affinity_slack:
+                return preferred
+
+        if self.strategy == STRATEGY_P2C and len(candidates) > 1:
+            first, second = self._random.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+        return self._random.choice([r for r in candidates if r.outstanding == least])
+
+    @contextlib.contextmanager
+    def track(self, replica: GatewayReplica):
+        """Count a request as outstanding on the replica while it runs"""
+        replica.outstanding += 1
+        replica.requests += 1
+        try:
+            yield replica
+        finally:
+            replica.outstanding -= 1
+
+    # ------------------------------------------------------------------ health
+
+    def record_success(self, replica: GatewayReplica):
+        replica.consecutive_failures = 0
+        replica.consecutive_successes += 1
+        if not replica.healthy and replica.consecutive_successes >= self.healthy_threshold:
+            replica.healthy = True
+            logger.info(f"💚 Gateway replica {replica.url} readmitted")
+
+    def record_failure(self, replica: GatewayReplica):
+        replica.failures += 1
+        replica.consecutive_successes = 0
+        replica.consecutive_failures += 1
+        if replica.healthy and replica.consecutive_failures >= self.unhealthy_threshold:
+            replica.healthy = False
+            logger.warning(f"💔 Gateway replica {replica.url} ejected after "
+                           f"{replica.consecutive_failures} consecutive failures")
+
+    async def check_health(self, session: "aiohttp.ClientSession"):
+        """Probe every replica once"""
+        import aiohttp
+
+        async def probe(replica: GatewayReplica):
+            try:
+                async with session.get(replica.url + self.health_path,
+                                       timeout=aiohttp.ClientTimeout(total=self.health_timeout)) as response:
+                    ok = response.status == 200
+            except Exception:
+                ok = False
+            (self.record_success if ok else self.record_failure)(replica)
+
+        await asyncio.gather(*(probe(r) for r in self.replicas))
+
+    def ensure_health_checks(self):
+        """Start periodic active health checks on the running loop (once)"""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.ensure_future(self._health_loop())
+
+    async def _health_loop(self):
+        import aiohttp
+
+        async with aiohttp.ClientSession() as session:
+            while True:
+                await asyncio.sleep(self.health_interval)
+                await self.check_health(session)
+
+    async def close(self):
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [r.to_dict() for r in self.replicas]
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Health Probes
+=============
+
+Concurrent health-check and readiness engine for G1 services and personas.
+
+Targets:
+- Services from config/service-discovery.yml (via the service registry):
+  HTTP health_check URLs are probed with GET (2xx = healthy); command-style
+  checks (pg_isready, redis-cli, ...) become a TCP connect to the service port
+- Personas: GET {personas gateway}/personas/{agent id}, any catalog spelling or
+  alias of a persona resolved to the agent id the gateway serves
+
+Every probe has its own timeout, all probes run concurrently (bounded by
+`concurrency`), and results are cached for `ttl` seconds; concurrent requests
+for the same target share one in-flight probe.
+
+ReadinessGate lets orchestrators wait for the services/personas a workflow
+needs before starting it:
+
+    gate = ReadinessGate(personas=["requirement-concierge", "developer"])
+    orchestrator = DynamicWorkflowOrchestrator(readiness_gate=gate)
+
+Configuration (environment):
+- G1_READINESS_SERVICES: comma-separated services the default gate waits for
+- G1_READINESS_PERSONAS: comma-separated personas the default gate waits for
+- G1_READINESS_TIMEOUT: seconds to wait before giving up (default 30)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterable, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from persona_catalog import get_persona_catalog
+from service_registry import ServiceRecord, get_service_registry, resolve_service_url
+
+if TYPE_CHECKING:
+    import aiohttp
+
+logger = logging.getLogger(__name__)
+
+KIND_HTTP = "http"
+KIND_TCP = "tcp"
+KIND_PERSONA = "persona"
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of one probe"""
+    target: str
+    kind: str
+    healthy: bool
+    latency_ms: float
+    detail: str = ""
+    checked_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "target": self.target,
+            "kind": self.kind,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency_ms, 1),
+            "detail": self.detail
+        }
+
+
+class ReadinessError(RuntimeError):
+    """Required services or personas did not become healthy in time"""
+
+    def __init__(self, unhealthy: List[ProbeResult]):
+        self.unhealthy = unhealthy
+        super().__init__("Not ready: " + ", ".join(f"{r.target} ({r.detail})" for r in unhealthy))
+
+
+def _service_probe(record: ServiceRecord) -> Optional[Tuple[str, str]]:
+    """(kind, address) to probe for a service, or None when it has no reachable endpoint"""
+    if not record.replicas:
+        return None
+    endpoint = record.replicas[0]
+    check = record.health_check or ""
+    if check.startswith(("http://", "https://")):
+        parts = urlsplit(check)
+        if parts.hostname == endpoint.host:
+            return KIND_HTTP, check
+        # Local network: same health path on the reachable replica
+        return KIND_HTTP, endpoint.url + (parts.path or "/health")
+    return KIND_TCP, f"{endpoint.host}:{endpoint.port}"
+
+
+class HealthProbeEngine:
+    """Runs service and persona probes concurrently with per-probe timeouts and a TTL cache"""
+
+    def __init__(self, timeout: Optional[float] = None, ttl: float = 15.0, concurrency: int = 64,
+                 gateway_url: Optional[str] = None, session: Optional["aiohttp.ClientSession"] = None):
+        registry = get_service_registry()
+        checks = registry.settings.get("communication_patterns", {}).get("health_checks", {})
+        self.registry = registry
+        self.timeout = timeout if timeout is not None else float(checks.get("timeout", 10))
+        self.ttl = ttl
+        self.gateway_url = gateway_url or resolve_service_url("personas-gateway", "http://localhost:8013")
+
+        # Shared session owned by the caller; None opens one per probe_many() call
+        self.session = session
+        self._concurrency = concurrency
+        self._cache: Dict[str, ProbeResult] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def discovered_services(self) -> List[str]:
+        """Services that declare a health check in service-discovery.yml"""
+        return [record.name for record in self.registry.services if record.health_check]
+
+    def _cached(self, key: str) -> Optional[ProbeResult]:
+        result = self._cache.get(key)
+        if result is not None and time.time() - result.checked_at < self.ttl:
+            return result
+        return None
+
+    def invalidate(self, target: Optional[str] = None):
+        if target is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(target, None)
+
+    async def _http(self, session: "aiohttp.ClientSession", target: str, kind: str, url: str) -> ProbeResult:
+        import aiohttp
+
+        started = time.perf_counter()
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                healthy = 200 <= response.status < 300
+                detail = f"HTTP {response.status}"
+        except asyncio.TimeoutError:
+            healthy, detail = False, f"timeout after {self.timeout}s"
+        except Exception as e:
+            healthy, detail = False, str(e) or type(e).__name__
+        return ProbeResult(target, kind, healthy, (time.perf_counter() - started) * 1000, detail)
+
+    async def _tcp(self, target: str, address: str) -> ProbeResult:
+        host, _, port = address.rpartition(":")
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), self.timeout)
+            writer.close()
+            healthy, detail = True, "port open"
+        except asyncio.TimeoutError:
+            healthy, detail = False, f"timeout after {self.timeout}s"
+        except Exception as e:
+            healthy, detail = False, str(e) or type(e).__name__
+        return ProbeResult(target, KIND_TCP, healthy, (time.perf_counter() - started) * 1000, detail)
+
+    async def _run_probe(self, session: "aiohttp.ClientSession", key: str) -> ProbeResult:
+        kind, _, name = key.partition(":")
+        if kind == KIND_PERSONA:
+            # Results stay keyed by the caller's name; the gateway only serves agent ids
+            agent_id = get_persona_catalog().agent_id(name)
+            return await self._http(session, key, KIND_PERSONA, f"{self.gateway_url}/personas/{agent_id}")
+
+        record = self.registry.find(name)
+        probe = _service_probe(record) if record else None
+        if probe is None:
+            return ProbeResult(key, KIND_HTTP, False, 0.0, "unknown service" if record is None else "no endpoint")
+        probe_kind, address = probe
+        if probe_kind == KIND_TCP:
+            return await self._tcp(key, address)
+        return await self._http(session, key, KIND_HTTP, address)
+
+    async def _probe(self, session: "aiohttp.ClientSession", semaphore: asyncio.Semaphore,
+                     key: str, use_cache: bool) -> ProbeResult:
+        if use_cache:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            async with semaphore:
+                result = await self._run_probe(session, key)
+            self._cache[key] = result
+            future.set_result(result)
+            return result
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    async def probe_many(self, services: Iterable[str] = (), personas: Iterable[str] = (),
+                         use_cache: bool = True) -> Dict[str, ProbeResult]:
+        """Probe services and personas concurrently; keys are "service:<name>" / "persona:<name>" """
+        keys = [f"service:{s}" for s in services] + [f"{KIND_PERSONA}:{p}" for p in personas]
+        keys = list(dict.fromkeys(keys))
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def run(session: "aiohttp.ClientSession") -> List[ProbeResult]:
+            return await asyncio.gather(*(self._probe(session, semaphore, k, use_cache) for k in keys))
+
+        if self.session is not None:
+            results = await run(self.session)
+        else:
+            import aiohttp
+
+            async with aiohttp.ClientSession() as session:
+                results = await run(session)
+        return dict(zip(keys, results))
+
+    async def probe_all(self, personas: Iterable[str] = (), use_cache: bool = True) -> Dict[str, ProbeResult]:
+        """Every discovered service plus the given personas"""
+        return await self.probe_many(self.discovered_services(), personas, use_cache)
+
+
+class ReadinessGate:
+    """Waits until required services and personas are healthy"""
+
+    def __init__(self, services: Iterable[str] = (), personas: Iterable[str] = (),
+                 engine: Optional[HealthProbeEngine] = None, timeout: float = 30.0,
+                 poll_interval: float = 1.0):
+        self.services = list(services)
+        self.personas = list(personas)
+        self.engine = engine
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    @classmethod
+    def from_env(cls) -> Optional["ReadinessGate"]:
+        """Gate configured from G1_READINESS_SERVICES / G1_READINESS_PERSONAS, if set"""
+        services = [s.strip() for s in os.getenv("G1_READINESS_SERVICES", "").split(",") if s.strip()]
+        personas = [p.strip() for p in os.getenv("G1_READINESS_PERSONAS", "").split(",") if p.strip()]
+        if not services and not personas:
+            return None
+        return cls(services, personas, timeout=float(os.getenv("G1_READINESS_TIMEOUT", "30")))
+
+    async def wait(self, gateway_url: Optional[str] = None) -> Dict[str, ProbeResult]:
+        """Return the probe results once everything is healthy; raise ReadinessError on timeout"""
+        if self.engine is None:
+            self.engine = HealthProbeEngine(gateway_url=gateway_url)
+
+        deadline = time.monotonic() + self.timeout
+        use_cache = True
+        while True:
+            results = await self.engine.probe_many(self.services, self.personas, use_cache=use_cache)
+            unhealthy = [r for r in results.values() if not r.healthy]
+            if not unhealthy:
+                return results
+            if time.monotonic() + self.poll_interval > deadline:
+                raise ReadinessError(unhealthy)
+            logger.info(f"⏳ Waiting for {', '.join(r.target for r in unhealthy)}")
+            await asyncio.sleep(self.poll_interval)
+            use_cache = False
+
+
+async def main():
+    """Probe every discovered service (and any personas given on the command line)"""
+    import sys
+
+    engine = HealthProbeEngine(timeout=3.0)
+    started = time.perf_counter()
+    results = await engine.probe_all(personas=sys.argv[1:])
+    elapsed = time.perf_counter() - started
+
+    for key, result in sorted(results.items()):
+        icon = "✅" if result.healthy else "❌"
+        print(f"{icon} {key:<40} {result.kind:<8} {result.latency_ms:8.1f} ms  {result.detail}")
+    healthy = sum(1 for r in results.values() if r.healthy)
+    print(f"\n📊 {healthy}/{len(results)} healthy, probed in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Incremental Execution
+=====================
+
+Memoized workflow graph for iterating on a requirement: every persona step's
+output is stored under a hash of its inputs, so re-running a slightly edited
+requirement only calls the personas whose inputs actually changed.
+
+A step's key covers:
+- the step name and persona
+- the requirement slice the persona cares about (clauses matching its focus
+  terms, the headline clause and any clause no persona claims)
+- digests of the upstream steps it depends on
+- any other structured inputs (classification, project context, ...)
+
+Optional early cutoff: when a recomputed step produces an output that the
+local fidelity scorer rates equivalent to the step's previous output in the
+same lineage (step, persona and requirement slice), the previous digest is
+kept so downstream steps still hit the memo.
+
+Steps are memoized through memoized_step(); the active workflow graph is a
+context variable set by StepMemo.workflow(), so orchestrator methods don't
+need extra parameters. Without an active graph steps simply run.
+
+Configuration (environment):
+- G1_STEP_MEMO: path of the SQLite memo database (enables memoization)
+- G1_STEP_MEMO_CUTOFF: "1" to enable early cutoff
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable, Tuple
+
+from persona_catalog import get_persona_catalog
+
+logger = logging.getLogger(__name__)
+
+# Persona → terms (word prefixes) of the requirement clauses it depends on.
+# Personas without an entry (concierge, architects, developers) see the whole requirement.
+DEFAULT_FOCUS = {
+    "risk_assessor": ("risk", "secur", "complian", "privacy", "gdpr", "hipaa", "pci", "audit", "fraud"),
+    "team_manager": ("team", "deadline", "timeline", "budget", "resourc", "capacity", "staff", "week", "month"),
+    "tester": ("test", "qa", "quality", "coverage", "accessib", "usabil", "performance", "load", "browser"),
+    "operations": ("deploy", "operat", "monitor", "uptime", "availab", "scal", "backup", "incident", "support"),
+    "infrastructure_engineer": ("infrastructure", "cloud", "aws", "azure", "gcp", "kubernetes", "docker",
+                                "server", "network", "scal", "region"),
+    "release_engineer": ("release", "ci/cd", "pipeline", "deploy", "version", "rollback", "continuous"),
+    "devops_specialist": ("monitor", "alert", "logging", "metric", "observab", "uptime", "sla", "dashboard"),
+    "database_architect": ("data", "storage", "schema", "sql", "cache", "migrat", "backup"),
+    "api_designer": ("api", "endpoint", "rest", "graphql", "integrat", "webhook", "interface"),
+}
+
+_CLAUSE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+_current_workflow: contextvars.ContextVar[Optional["WorkflowMemo"]] = contextvars.ContextVar(
+    "g1_step_memo_workflow", default=None
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS step_memo (
+    key TEXT PRIMARY KEY,
+    step TEXT NOT NULL,
+    output TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS step_memo_step ON step_memo (step, created_at);
+CREATE TABLE IF NOT EXISTS step_lineage (
+    lineage TEXT PRIMARY KEY,
+    key TEXT NOT NULL
+);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form used for hashing"""
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(_canonical(value).encode("utf-8")).hexdigest()
+
+
+def _output_text(output: Any) -> str:
+    if isinstance(output, dict) and isinstance(output.get("response"), str):
+        return output["response"]
+    return _canonical(output)
+
+
+class RequirementSlicer:
+    """Splits a requirement into clauses and picks the ones relevant to a persona"""
+
+    def __init__(self, focus: Optional[Dict[str, Iterable[str]]] = None):
+        focus = DEFAULT_FOCUS if focus is None else focus
+        self._patterns = {
+            self._persona_id(persona): re.compile(r"\b(?:%s)" % "|".join(re.escape(t) for t in terms))
+            for persona, terms in focus.items() if terms
+        }
+
+    @staticmethod
+    def _persona_id(persona: str) -> str:
+        return get_persona_catalog().canonical(persona) if persona else ""
+
+    @staticmethod
+    def clauses(requirement: str) -> List[str]:
+        clauses = (normalize_text(_BULLET.sub("", c)).rstrip(".;!") for c in _CLAUSE_SPLIT.split(requirement))
+        return [c for c in clauses if c]
+
+    def slice(self, requirement: str, persona: Optional[str]) -> str:
+        """Clauses the persona depends on; the whole (normalized) requirement without a focus entry"""
+        clauses = self.clauses(requirement)
+        pattern = self._patterns.get(self._persona_id(persona or ""))
+        if pattern is None:
+            return "\n".join(clauses)
+
+        selected = []
+        for i, clause in enumerate(clauses):
+            # The headline and clauses no persona claims may matter to anyone
+            if i == 0 or pattern.search(clause) or not any(p.search(clause) for p in self._patterns.values()):
+                selected.append(clause)
+        return "\n".join(selected)
+
+
+class StepMemo:
+    """SQLite-backed store of step outputs keyed by a hash of their inputs"""
+
+    def __init__(self, path: str = "checkpoints/step_memo.db", early_cutoff: bool = False,
+                 slicer: Optional[RequirementSlicer] = None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.slicer = slicer or RequirementSlicer()
+        self.early_cutoff = False
+        self.scorer = None
+        if early_cutoff:
+            # Imported only when needed: the scorer pulls in numpy
+            from fidelity_scorer import LocalFidelityScorer, NUMPY_AVAILABLE
+            if NUMPY_AVAILABLE:
+                self.early_cutoff = True
+                self.scorer = LocalFidelityScorer()
+            else:
+                logger.warning("⚠️ Early cutoff needs numpy; memoizing without it")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["StepMemo"]:
+        """Memo configured from G1_STEP_MEMO / G1_STEP_MEMO_CUTOFF, if set"""
+        path = os.getenv("G1_STEP_MEMO")
+        if not path:
+            return None
+        return cls(path, early_cutoff=os.getenv("G1_STEP_MEMO_CUTOFF", "").lower() in ("1", "true", "yes"))
+
+    def get(self, key: str) -> Optional[Tuple[Any, str]]:
+        with self._lock:
+            row = self._conn.execute("SELECT output, digest FROM step_memo WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def previous(self, lineage: str) -> Optional[Tuple[Any, str]]:
+        """Output last memoized or reused in a lineage (same step, persona and requirement slice)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT m.output, m.digest FROM step_lineage l JOIN step_memo m ON m.key = l.key "
+                "WHERE l.lineage = ?", (lineage,)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, key: str, step: str, output: Any, digest: str, lineage: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO step_memo (key, step, output, digest, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, step, _canonical(output), digest, datetime.now().isoformat())
+            )
+        if lineage is not None:
+            self.advance(lineage, key)
+
+    def advance(self, lineage: str, key: str):
+        """Make a reused entry the lineage's previous output"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO step_lineage (lineage, key) VALUES (?, ?)", (lineage, key))
+
+    @contextlib.contextmanager
+    def workflow(self):
+        """Activate a fresh memo graph for the workflow running in this context"""
+        graph = WorkflowMemo(self)
+        token = _current_workflow.set(graph)
+        try:
+            yield graph
+        finally:
+            _current_workflow.reset(token)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WorkflowMemo:
+    """Step digests and hit statistics for one workflow execution"""
+
+    def __init__(self, memo: StepMemo):
+        self.memo = memo
+        self.digests: Dict[str, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "cutoffs": 0}
+        self.recomputed: List[str] = []
+
+    def upstream(self, depends_on: Iterable[str]) -> Dict[str, str]:
+        """Digests of the named steps; a name also matches its "name:persona" sub-steps"""
+        digests = {}
+        for dependency in depends_on:
+            for step, digest in self.digests.items():
+                if step == dependency or step.startswith(dependency + ":"):
+                    digests[step] = digest
+        return digests
+
+    def _slice(self, requirement: str, persona: Optional[str]) -> str:
+        return self.memo.slicer.slice(requirement, persona) if requirement else ""
+
+    def key(self, step: str, persona: Optional[str], requirement: str,
+            depends_on: Iterable[str], inputs: Any) -> str:
+        return _digest({
+            "step": step,
+            "persona": persona,
+            "requirement": self._slice(requirement, persona),
+            "upstream": self.upstream(depends_on),
+            "inputs": inputs
+        })
+
+    def lineage(self, step: str, persona: Optional[str], requirement: str) -> str:
+        """Successive runs of a step for the same requirement slice, whatever their upstream"""
+        return _digest({"step": step, "persona": persona, "requirement": self._slice(requirement, persona)})
+
+    async def step(self, step: str, compute: Callable[[], Awaitable[Any]], persona: Optional[str] = None,
+                   requirement: str = "", depends_on: Iterable[str] = (), inputs: Any = None,
+                   cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        key = self.key(step, persona, requirement, depends_on, inputs)
+        lineage = self.lineage(step, persona, requirement)
+        cached = self.memo.get(key)
+        if cached is not None:
+            output, self.digests[step] = cached
+            if self.memo.early_cutoff:
+                self.memo.advance(lineage, key)
+            self.stats["hits"] += 1
+            logger.info(f"💾 {step} reused from step memo")
+            return output
+
+        output = await compute()
+        self.stats["misses"] += 1
+        self.recomputed.append(step)
+        if cache_if is not None and not cache_if(output):
+            # Not memoized (e.g. failed call): downstream keys can't match either
+            self.digests[step] = _digest(output)
+            return output
+
+        digest = _digest(output)
+        if self.memo.early_cutoff:
+            from fidelity_scorer import BAND_PASS
+            previous = self.memo.previous(lineage)
+            if previous is not None and self.memo.scorer.score(
+                    _output_text(previous[0]), _output_text(output)).band == BAND_PASS:
+                digest = previous[1]
+                self.stats["cutoffs"] += 1
+        self.digests[step] = digest
+        self.memo.put(key, step, output, digest, lineage)
+        return output
+
+
+def current_workflow_memo() -> Optional[WorkflowMemo]:
+    return _current_workflow.get()
+
+
+async def memoized_step(step: str, compute: Callable[[], Awaitable[Any]], persona: Optional[str] = None,
+                        requirement: str = "", depends_on: Iterable[str] = (), inputs: Any = None,
+                        cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+    """Run compute() through the active workflow memo (or directly when none is active)"""
+    graph = _current_workflow.get()
+    if graph is None:
+        return await compute()
+    return await graph.step(step, compute, persona, requirement, depends_on, inputs, cache_if)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Information Gap Matrix
+======================
+
+Vectorized information-gap analysis between personas.
+
+Every persona's input_needs and output_provides are encoded as rows of two
+boolean incidence matrices over the shared vocabulary of information items
+(NEEDS, PROVIDES: N personas x V items). One matrix product then gives
+the full N x N overlap matrix:
+
+    overlap[i, j] = |PROVIDES[i] & NEEDS[j]|
+    missing[i, j] = |NEEDS[j]| - overlap[i, j]
+    excess[i, j]  = |PROVIDES[i]| - overlap[i, j]
+
+For a workflow graph (edges source -> target), transitive coverage scores how
+much of each persona's needs is produced anywhere upstream, hop by hop:
+available_k = items produced by personas within k hops upstream (plus external
+inputs such as the raw requirement), computed with boolean matrix powers of the
+adjacency matrix until the reachable set stops growing.
+
+Workflows with hundreds of personas are analyzed in a handful of matrix
+operations instead of per-pair Python set arithmetic.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Mapping
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_LEVELS = ("none", "low", "medium", "high", "critical")
+
+
+class InformationGapMatrix:
+    """Needs/provides bit matrices of a persona set and the gap metrics derived from them"""
+
+    def __init__(self, persona_requirements: Mapping[str, Mapping[str, Iterable[str]]]):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("InformationGapMatrix requires numpy")
+
+        self.personas: List[str] = list(persona_requirements)
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.personas)}
+
+        vocabulary: Dict[str, int] = {}
+        for spec in persona_requirements.values():
+            for item in list(spec.get("input_needs", ())) + list(spec.get("output_provides", ())):
+                vocabulary.setdefault(item, len(vocabulary))
+        self.vocabulary: List[str] = list(vocabulary)
+        self._item_index = vocabulary
+
+        n, v = len(self.personas), len(self.vocabulary)
+        self.needs = np.zeros((n, v), dtype=bool)
+        self.provides = np.zeros((n, v), dtype=bool)
+        for i, spec in enumerate(persona_requirements.values()):
+            self.needs[i, [vocabulary[item] for item in spec.get("input_needs", ())]] = True
+            self.provides[i, [vocabulary[item] for item in spec.get("output_provides", ())]] = True
+
+        self.need_counts = self.needs.sum(axis=1)
+        self.provide_counts = self.provides.sum(axis=1)
+        self._vocabulary_array = np.array(self.vocabulary, dtype=object)
+        self._overlap: Optional["np.ndarray"] = None
+
+    @classmethod
+    def from_catalog(cls, personas: Optional[Iterable[str]] = None) -> "InformationGapMatrix":
+        """Matrix over persona catalog I/O contracts (every catalog persona by default)"""
+        from persona_catalog import get_persona_catalog
+
+        catalog = get_persona_catalog()
+        specs = [catalog.get(p) for p in personas] if personas is not None else list(catalog.personas)
+        return cls({s.id: {"input_needs": s.inputs, "output_provides": s.outputs} for s in specs})
+
+    # ------------------------------------------------------------------ direct coverage
+
+    @property
+    def overlap(self) -> "np.ndarray":
+        """overlap[i, j]: items persona i provides that persona j needs"""
+        if self._overlap is None:
+            # float32 products go through BLAS; counts stay exact far beyond any vocabulary size
+            product = self.provides.astype(np.float32) @ self.needs.T.astype(np.float32)
+            self._overlap = product.astype(np.int64)
+        return self._overlap
+
+    def coverage_matrix(self) -> Dict[str, "np.ndarray"]:
+        """N x N overlap, missing, excess and coverage ratio (share of j's needs that i provides)"""
+        overlap = self.overlap
+        missing = self.need_counts[None, :] - overlap
+        excess = self.provide_counts[:, None] - overlap
+        ratio = np.divide(overlap, self.need_counts[None, :],
+                          out=np.ones(overlap.shape, dtype=np.float64), where=self.need_counts[None, :] > 0)
+        return {"overlap": overlap, "missing": missing, "excess": excess, "coverage": ratio}
+
+    @staticmethod
+    def severity(missing: "np.ndarray", needed: "np.ndarray") -> "np.ndarray":
+        """Gap severity labels (same thresholds as calculate_gap_severity), vectorized"""
+        share = np.divide(missing, needed, out=np.zeros(np.shape(missing), dtype=np.float64),
+                          where=np.asarray(needed) > 0)
+        levels = np.select([share > 0.5, share > 0.3, share > 0.1, missing > 0], [4, 3, 2, 1], default=0)
+        return np.array(SEVERITY_LEVELS, dtype=object)[levels]
+
+    def _items(self, mask: "np.ndarray") -> List[str]:
+        return self._vocabulary_array[mask].tolist()
+
+    def gaps(self, edges: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Missing/excess information for each workflow transition that has any"""
+        pairs = [(self.index[s], self.index[t]) for s, t in edges]
+        if not pairs:
+            return []
+        sources, targets = np.array(pairs).T
+        coverage = self.coverage_matrix()
+        missing = coverage["missing"][sources, targets]
+        excess = coverage["excess"][sources, targets]
+        severities = self.severity(missing, self.need_counts[targets])
+
+        gaps = []
+        for k in np.flatnonzero((missing > 0) | (excess > 0)):
+            i, j = sources[k], targets[k]
+            gaps.append({
+                "source_persona": self.personas[i],
+                "target_persona": self.personas[j],
+                "missing_information": self._items(self.needs[j] & ~self.provides[i]),
+                "excess_information": self._items(self.provides[i] & ~self.needs[j]),
+                "gap_severity": severities[k]
+            })
+        return gaps
+
+    # ------------------------------------------------------------------ transitive coverage
+
+    def adjacency(self, edges: Iterable[Tuple[str, str]]) -> "np.ndarray":
+        """adjacency[i, j]: persona i hands off directly to persona j"""
+        matrix = np.zeros((len(self.personas), len(self.personas)), dtype=bool)
+        for source, target in edges:
+            matrix[self.index[source], self.index[target]] = True
+        return matrix
+
+    def transitive_coverage(self, edges: Iterable[Tuple[str, str]], external: Iterable[str] = (),
+                            max_hops: Optional[int] = None) -> Dict[str, Any]:
+        """Share of each persona's needs available within 1..k hops upstream"""
+        adjacency = self.adjacency(edges)
+        n = len(self.personas)
+        max_hops = n if max_hops is None else max_hops
+        step = adjacency.astype(np.float32)
+        provides = self.provides.astype(np.float32)
+
+        available = np.zeros_like(self.needs)
+        known = [self._item_index[item] for item in external if item in self._item_index]
+        available[:, known] = True
+
+        # reach[i, j]: i is upstream of j within the current number of hops
+        reach = adjacency.copy()
+        frontier = adjacency.copy()
+        by_hop = []
+        for _ in range(max_hops):
+            available |= (frontier.T.astype(np.float32) @ provides) > 0
+            by_hop.append(self._covered_share(available))
+            frontier = ((frontier.astype(np.float32) @ step) > 0) & ~reach
+            if not frontier.any():
+                break
+            reach |= frontier
+
+        coverage = by_hop[-1] if by_hop else self._covered_share(available)
+        direct = by_hop[0] if by_hop else coverage
+        unmet = self.needs & ~available
+        return {
+            "personas": self.personas,
+            "hops": len(by_hop),
+            "direct": direct,
+            "transitive": coverage,
+            "by_hop": np.array(by_hop).T if by_hop else np.zeros((n, 0)),
+            "reachability": reach,
+            "unmet": {self.personas[j]: self._items(unmet[j]) for j in np.flatnonzero(unmet.any(axis=1))}
+        }
+
+    def _covered_share(self, available: "np.ndarray") -> "np.ndarray":
+        covered = (self.needs & available).sum(axis=1)
+        return np.divide(covered, self.need_counts, out=np.ones(len(self.personas)),
+                         where=self.need_counts > 0)
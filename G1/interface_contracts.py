@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Interface Contracts
+===================
+
+Local validation of persona request payloads against the information bus data
+contracts (workflow_information_analysis.DATA_CONTRACTS), replacing the
+interface_validator persona round trip for well-formed requests.
+
+Contracts are compiled once into nested validator closures. Two forms are
+accepted:
+- {"required_fields": [...], "optional_fields": [...]} - an object with those keys
+- {"schema": {...}} - a JSON-Schema subset: type, required, properties,
+  additionalProperties, items, enum, minLength, maxLength, minimum, maximum,
+  minItems, plus "known_persona" (the string must resolve in the persona catalog)
+
+A persona request is checked against persona_request_contract; context entries
+that carry a contracted artifact (requirement, technical_specification,
+test_artifacts) are checked against that artifact's contract. Only requests
+with violations need the LLM interface_validator.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Callable, Mapping
+
+from persona_catalog import get_persona_catalog
+from workflow_information_analysis import DATA_CONTRACTS
+
+logger = logging.getLogger(__name__)
+
+REQUEST_CONTRACT = "persona_request_contract"
+
+# Context key → contract its value must satisfy
+CONTEXT_CONTRACTS = {
+    "requirement": "requirement_contract",
+    "technical_specification": "technical_specification_contract",
+    "test_artifacts": "test_artifact_contract",
+}
+
+_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, (list, tuple)),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+Check = Callable[[Any, str, List[str]], None]
+
+
+@dataclass
+class ContractReport:
+    """Outcome of validating one payload"""
+    contract: str
+    violations: List[str] = field(default_factory=list)
+    elapsed_us: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return not self.violations
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "contract": self.contract,
+            "valid": self.valid,
+            "violations": self.violations,
+            "elapsed_us": round(self.elapsed_us, 1)
+        }
+
+
+def contract_schema(contract: Mapping[str, Any]) -> Dict[str, Any]:
+    """JSON-Schema form of a data contract"""
+    if "schema" in contract:
+        return contract["schema"]
+    return {
+        "type": "object",
+        "required": list(contract.get("required_fields", [])),
+        "properties": {name: {} for name in
+                       list(contract.get("required_fields", [])) + list(contract.get("optional_fields", []))}
+    }
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Check:
+    """Compile a schema into a check(value, path, violations) function"""
+    checks: List[Check] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        names = [expected] if isinstance(expected, str) else list(expected)
+        predicates = [_TYPES[name] for name in names]
+        label = "|".join(names)
+
+        def check_type(value, path, violations):
+            if not any(p(value) for p in predicates):
+                violations.append(f"{path}: expected {label}, got {type(value).__name__}")
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value, path, violations):
+            if value not in allowed:
+                violations.append(f"{path}: {value!r} not in {allowed}")
+        checks.append(check_enum)
+
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+        def check_length(value, path, violations):
+            if isinstance(value, str):
+                size = len(value.strip())
+                if min_length is not None and size < min_length:
+                    violations.append(f"{path}: shorter than {min_length}")
+                if max_length is not None and size > max_length:
+                    violations.append(f"{path}: longer than {max_length}")
+        checks.append(check_length)
+
+    minimum, maximum = schema.get("minimum"), schema.get("maximum")
+    if minimum is not None or maximum is not None:
+        def check_range(value, path, violations):
+            if _TYPES["number"](value):
+                if minimum is not None and value < minimum:
+                    violations.append(f"{path}: below {minimum}")
+                if maximum is not None and value > maximum:
+                    violations.append(f"{path}: above {maximum}")
+        checks.append(check_range)
+
+    if schema.get("known_persona"):
+        catalog = get_persona_catalog()
+
+        def check_persona(value, path, violations):
+            if isinstance(value, str) and value not in catalog:
+                violations.append(f"{path}: unknown persona {value!r}")
+        checks.append(check_persona)
+
+    required = list(schema.get("required", []))
+    properties = {name: compile_schema(sub) for name, sub in (schema.get("properties") or {}).items()}
+    closed = schema.get("additionalProperties") is False
+    if required or properties or closed:
+        def check_object(value, path, violations):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value or value[name] is None:
+                    violations.append(f"{path}.{name}: required")
+            for name, check in properties.items():
+                if name in value and value[name] is not None:
+                    check(value[name], f"{path}.{name}", violations)
+            if closed:
+                for name in value:
+                    if name not in properties:
+                        violations.append(f"{path}.{name}: not allowed")
+        checks.append(check_object)
+
+    min_items = schema.get("minItems")
+    item_check = compile_schema(schema["items"]) if "items" in schema else None
+    if item_check is not None or min_items is not None:
+        def check_array(value, path, violations):
+            if not isinstance(value, (list, tuple)):
+                return
+            if min_items is not None and len(value) < min_items:
+                violations.append(f"{path}: fewer than {min_items} items")
+            if item_check is not None:
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", violations)
+        checks.append(check_array)
+
+    def check_all(value, path, violations):
+        for check in checks:
+            check(value, path, violations)
+    return check_all
+
+
+class ContractValidator:
+    """Compiled data contracts, validated in-process"""
+
+    def __init__(self, contracts: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        contracts = DATA_CONTRACTS if contracts is None else contracts
+        self.contracts = {name: compile_schema(contract_schema(c)) for name, c in contracts.items()}
+
+    def validate(self, contract: str, payload: Any) -> ContractReport:
+        started = time.perf_counter()
+        violations: List[str] = []
+        self.contracts[contract](payload, "$", violations)
+        return ContractReport(contract, violations, (time.perf_counter() - started) * 1e6)
+
+    def validate_request(self, persona_name: str, message: str, context: Dict[str, Any]) -> ContractReport:
+        """Check a persona request envelope and any contracted artifacts in its context"""
+        started = time.perf_counter()
+        violations: List[str] = []
+        self.contracts[REQUEST_CONTRACT](
+            {"target_persona": persona_name, "message": message, "context": context}, "$", violations
+        )
+        if isinstance(context, dict):
+            for key, contract in CONTEXT_CONTRACTS.items():
+                if key in context and contract in self.contracts:
+                    self.contracts[contract](context[key], f"$.context.{key}", violations)
+        return ContractReport(REQUEST_CONTRACT, violations, (time.perf_counter() - started) * 1e6)
+
+
+_validator: Optional[ContractValidator] = None
+_validator_lock = threading.Lock()
+
+
+def get_contract_validator() -> ContractValidator:
+    """Process-wide validator, compiled on first use"""
+    global _validator
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                _validator = ContractValidator()
+    return _validator
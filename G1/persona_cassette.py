@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Persona Cassette
+================
+
+Record-and-replay of Personas Gateway traffic for reproducible benchmarks.
+
+In record mode every gateway request/response pair is appended to a compact
+cassette file (JSON lines, gzip when the path ends in ``.gz``) together with
+the wall-clock time the call took. In replay mode the same requests are served
+from the cassette instead of the live LLM, either with the recorded latency
+(faithful) or immediately (zero), so orchestration overhead can be measured
+separately from LLM time.
+
+Requests are matched on persona + payload with volatile values (UUIDs, ISO
+timestamps and measured durations) normalized away. Identical requests are
+replayed in recorded order.
+
+Configuration (environment):
+- G1_CASSETTE: cassette file path (enables the cassette)
+- G1_CASSETTE_MODE: "record" or "replay" (default: replay)
+- G1_CASSETTE_LATENCY: "faithful" or "zero" (default: faithful)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Optional, Deque
+
+logger = logging.getLogger(__name__)
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+LATENCY_FAITHFUL = "faithful"
+LATENCY_ZERO = "zero"
+
+_UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?([+-]\d{2}:\d{2}|Z)?")
+# Measured durations are embedded in some prompts (e.g. the metrics results summary)
+VOLATILE_FIELDS = ("processing_time", "execution_time")
+_VOLATILE_PATTERN = re.compile(r'("(?:%s)":\s*)-?[\d.eE+-]+' % "|".join(VOLATILE_FIELDS))
+
+
+def _normalize(value: Any) -> Any:
+    """Strip run-specific values so identical workflows produce identical keys"""
+    if isinstance(value, str):
+        value = _VOLATILE_PATTERN.sub(r"\1<t>", value)
+        return _TIMESTAMP_PATTERN.sub("<ts>", _UUID_PATTERN.sub("<uuid>", value))
+    if isinstance(value, dict):
+        return {str(k): "<t>" if k in VOLATILE_FIELDS else _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def request_key(persona_name: str, payload: Dict[str, Any]) -> str:
+    """Stable matching key for a gateway request"""
+    canonical = json.dumps([persona_name, _normalize(payload)], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PersonaCassette:
+    """Records gateway interactions to a cassette file and replays them"""
+
+    def __init__(self, path: str, mode: str = MODE_REPLAY, latency: str = LATENCY_FAITHFUL):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in (LATENCY_FAITHFUL, LATENCY_ZERO):
+            raise ValueError(f"Unknown cassette latency: {latency}")
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0, "replayed_latency": 0.0}
+
+        if mode == MODE_RECORD:
+            # Each recording session starts a fresh cassette
+            with self._open("w"):
+                pass
+        else:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["PersonaCassette"]:
+        """Cassette configured from G1_CASSETTE* environment variables, if any"""
+        path = os.getenv("G1_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            mode=os.getenv("G1_CASSETTE_MODE", MODE_REPLAY),
+            latency=os.getenv("G1_CASSETTE_LATENCY", LATENCY_FAITHFUL)
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self):
+        try:
+            with self._open("r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    self._recordings.setdefault(entry["key"], deque()).append(entry)
+        except FileNotFoundError:
+            logger.warning(f"Cassette {self.path} not found - every replayed request will miss")
+
+        total = sum(len(entries) for entries in self._recordings.values())
+        logger.info(f"📼 Loaded {total} recorded persona calls from {self.path}")
+
+    def record(self, persona_name: str, payload: Dict[str, Any], result: Dict[str, Any], elapsed: float):
+        """Append one request/response pair with its measured latency"""
+        entry = {
+            "key": request_key(persona_name, payload),
+            "persona": persona_name,
+            "query": str(payload.get("query", ""))[:120],
+            "elapsed": round(elapsed, 4),
+            "recorded_at": datetime.now().isoformat(),
+            "result": result
+        }
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            with self._open("a") as f:
+                f.write(line)
+            self.stats["recorded"] += 1
+
+    async def replay(self, persona_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve a recorded response for this request"""
+        key = request_key(persona_name, payload)
+        with self._lock:
+            queue = self._recordings.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            else:
+                # Repeated beyond what was recorded - reuse the latest recording
+                entry = self._last.get(key)
+
+            if entry is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["replayed"] += 1
+                self.stats["replayed_latency"] += entry["elapsed"]
+
+        if entry is None:
+            return {
+                "success": False,
+                "error": f"No cassette recording for {persona_name} request {key[:12]}",
+                "persona": persona_name
+            }
+
+        if self.latency == LATENCY_FAITHFUL and entry["elapsed"] > 0:
+            await asyncio.sleep(entry["elapsed"])
+
+        return json.loads(json.dumps(entry["result"]))
+
+    def summary(self) -> Dict[str, Any]:
+        """Recording/replay counters for benchmark reports"""
+        return {"path": self.path, "mode": self.mode, "latency": self.latency, **self.stats}
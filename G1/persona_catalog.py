@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Persona Catalog
+===============
+
+Single catalog of G1 personas, compiled into constant-time lookup indexes.
+
+Each persona has:
+- a canonical id (snake_case) and the agent id the Personas Gateway serves it as
+- aliases; hyphen/underscore/space/case variants always resolve
+  ("requirement-concierge", "Requirement Concierge", "requirement_concierge")
+- capabilities, an expected latency class and an I/O contract (information it
+  consumes and produces)
+- response indicators: terms an authentic response from the persona contains
+
+Indexes (built once, immutable): name/alias → persona, agent id → persona,
+capability → personas, and one compiled pattern that finds every persona
+mentioned in free text in a single pass.
+
+Extra personas, or agent-id overrides for known ones, come from the extended
+persona mapping file (G1_PERSONA_MAPPING_PATH, default
+config/extended_persona_mapping.json): {"persona": "agent_id"} or
+{"persona": {"agent_id": ..., "aliases": [...], "capabilities": [...]}}.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Mapping
+
+logger = logging.getLogger(__name__)
+
+LATENCY_FAST = "fast"          # routing, validation, hub lookups
+LATENCY_STANDARD = "standard"  # analysis and review
+LATENCY_SLOW = "slow"          # design and implementation
+
+DEFAULT_PERSONA_MAPPING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config",
+                                            "extended_persona_mapping.json")
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_persona_name(name: str) -> str:
+    """Lookup key shared by every spelling of a persona name"""
+    return _SEPARATORS.sub("_", name.strip().lower()).strip("_")
+
+
+@dataclass(frozen=True)
+class PersonaSpec:
+    """Catalog entry for one persona"""
+    id: str
+    agent_id: str
+    aliases: Tuple[str, ...] = ()
+    capabilities: Tuple[str, ...] = ()
+    latency_class: str = LATENCY_STANDARD
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    indicators: Tuple[str, ...] = ()
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return (self.id, self.agent_id, *self.aliases)
+
+
+def _persona(id: str, agent_id: Optional[str] = None, aliases: Iterable[str] = (),
+             capabilities: Iterable[str] = (), latency: str = LATENCY_STANDARD,
+             inputs: Iterable[str] = (), outputs: Iterable[str] = (),
+             indicators: Iterable[str] = ()) -> PersonaSpec:
+    # The Personas Gateway serves every persona under its hyphenated name
+    return PersonaSpec(id, agent_id or id.replace("_", "-"), tuple(aliases), tuple(capabilities), latency,
+                       tuple(inputs), tuple(outputs), tuple(indicators))
+
+
+BUILTIN_PERSONAS: Tuple[PersonaSpec, ...] = (
+    # Core workflow personas
+    _persona("requirement_concierge", "requirement-concierge", ("concierge",),
+             ("requirement_analysis", "intake"), LATENCY_STANDARD,
+             ("raw_business_requirement", "business_context"),
+             ("clarified_requirements", "acceptance_criteria", "business_objectives"),
+             ("requirements", "analysis", "scope", "feasibility")),
+    _persona("risk_assessor", "risk-assessor", (), ("risk_assessment", "compliance"), LATENCY_STANDARD,
+             ("clarified_requirements",), ("risk_assessment", "risk_mitigation_strategies"),
+             ("risk", "mitigation", "impact")),
+    _persona("complexity_estimator", "complexity-estimator", (), ("estimation",), LATENCY_FAST,
+             ("clarified_requirements",), ("complexity_estimate",), ("complexity", "effort", "estimate")),
+    _persona("mind_engine_coordinator", "mind-engine-coordinator", (), ("coordination",), LATENCY_FAST),
+    _persona("workflow_router", "workflow-router", (), ("routing",), LATENCY_FAST),
+    _persona("gatekeeper", "gatekeeper", (), ("quality_gate",), LATENCY_FAST),
+
+    # Management personas
+    _persona("team_manager", "team-manager", (), ("team_management", "planning"), LATENCY_STANDARD,
+             ("clarified_requirements",), ("resource_allocation_plan",), ("team", "resource", "timeline")),
+    _persona("program_manager", "program-manager", (), ("program_management", "planning"), LATENCY_STANDARD,
+             ("validated_requirements", "stakeholder_analysis", "risk_assessment"),
+             ("project_timeline", "resource_allocation_plan", "milestone_definitions"),
+             ("milestone", "timeline", "stakeholder", "resource")),
+
+    # Development lifecycle personas
+    _persona("developer", "developer", ("senior_developer", "software_engineer"),
+             ("implementation", "development"), LATENCY_SLOW,
+             ("validated_requirements", "technical_constraints", "architecture_requirements"),
+             ("code_artifacts", "technical_specifications", "api_specifications"),
+             ("code", "implementation", "function", "class", "variable")),
+    _persona("tester", "tester", ("qa_engineer",), ("testing", "quality_assurance"), LATENCY_STANDARD,
+             ("technical_specifications", "code_artifacts", "acceptance_criteria"),
+             ("test_strategy", "test_cases", "test_artifacts"),
+             ("test", "testing", "validation", "verify", "scenario")),
+    _persona("operations", "operations", (), ("operations",), LATENCY_STANDARD,
+             ("deployment_configs",), ("operational_procedures",), ("deploy", "monitor", "operation")),
+
+    # Deployment engineering personas
+    _persona("infrastructure_engineer", "infrastructure-engineer", (), ("infrastructure", "deployment"),
+             LATENCY_SLOW, ("technical_specifications", "test_artifacts"),
+             ("infrastructure_specs", "deployment_configs"), ("infrastructure", "cloud", "scaling", "network")),
+    _persona("release_engineer", "release-engineer", (), ("release", "ci_cd"), LATENCY_STANDARD,
+             ("code_artifacts", "test_artifacts"), ("release_plan", "ci_cd_pipeline"),
+             ("release", "pipeline", "version", "rollback")),
+    _persona("devops_specialist", "devops-specialist", (), ("devops", "monitoring", "ci_cd"), LATENCY_STANDARD,
+             ("code_artifacts", "infrastructure_specs", "deployment_configs"),
+             ("ci_cd_pipeline", "monitoring_dashboards", "alerting_configuration"),
+             ("monitoring", "pipeline", "alert", "automation")),
+    _persona("github_integration_specialist", "github-integration-specialist", ("github_specialist",),
+             ("source_control", "ci_cd"), LATENCY_STANDARD),
+
+    # Interface/queue management personas
+    _persona("interface_validator", "interface-validator", (), ("validation",), LATENCY_FAST,
+             ("source_persona_output", "data_contracts"), ("validation_status",),
+             ("valid", "format", "structure")),
+    _persona("queue_manager", "queue-manager", (), ("routing",), LATENCY_FAST,
+             ("validated_data",), ("routing_decisions",), ("route", "priority", "queue")),
+
+    # Metrics calculation personas
+    _persona("functionality_metrics", "functionality-metrics", (), ("metrics",), LATENCY_FAST),
+    _persona("performance_metrics", "performance-metrics", (), ("metrics",), LATENCY_FAST),
+    _persona("stability_metrics", "stability-metrics", (), ("metrics",), LATENCY_FAST),
+    _persona("scalability_metrics", "scalability-metrics", (), ("metrics",), LATENCY_FAST),
+
+    # Meta-orchestration and communication personas (persona-driven workflow)
+    _persona("workflow_designer", capabilities=("workflow_design",), latency=LATENCY_SLOW,
+             inputs=("clarified_requirements",), outputs=("workflow_design",),
+             indicators=("workflow", "phase", "process", "methodology")),
+    _persona("team_structure_architect", capabilities=("team_design",), latency=LATENCY_SLOW,
+             inputs=("workflow_design",), outputs=("team_structure",), indicators=("team", "structure")),
+    _persona("communication_architect", capabilities=("communication_design",), latency=LATENCY_SLOW,
+             inputs=("workflow_design", "team_structure"), outputs=("communication_strategy",),
+             indicators=("communication", "handoff", "protocol")),
+    _persona("central_knowledge_hub", aliases=("knowledge_hub",), capabilities=("knowledge", "context"),
+             latency=LATENCY_FAST),
+    _persona("verification_service", capabilities=("verification",), latency=LATENCY_FAST),
+    _persona("collaborative_transition_manager", aliases=("transition_manager",),
+             capabilities=("handoff",), latency=LATENCY_FAST),
+
+    # Analysis, architecture and design personas
+    _persona("business_analyst", capabilities=("requirement_analysis",), latency=LATENCY_STANDARD,
+             inputs=("clarified_requirements",), outputs=("business_analysis", "business_rules"),
+             indicators=("business", "stakeholder", "process")),
+    _persona("solution_architect", capabilities=("architecture",), latency=LATENCY_SLOW,
+             inputs=("validated_requirements",), outputs=("solution_architecture",),
+             indicators=("architecture", "component", "integration")),
+    _persona("technical_architect", aliases=("system_architect",), capabilities=("architecture",),
+             latency=LATENCY_SLOW, inputs=("solution_architecture",), outputs=("technical_architecture",),
+             indicators=("architecture", "technology", "component")),
+    _persona("api_designer", capabilities=("api_design", "design"), latency=LATENCY_STANDARD,
+             inputs=("technical_architecture",), outputs=("api_specifications",),
+             indicators=("api", "endpoint", "request", "response")),
+    _persona("database_architect", aliases=("data_architect",), capabilities=("data_design", "design"),
+             latency=LATENCY_STANDARD, inputs=("technical_architecture",), outputs=("database_schema",),
+             indicators=("database", "schema", "table", "index")),
+    _persona("security_architect", capabilities=("security", "design"), latency=LATENCY_STANDARD,
+             inputs=("technical_architecture",), outputs=("security_requirements",),
+             indicators=("security", "threat", "authentication", "encryption")),
+    _persona("security_specialist", capabilities=("security",), latency=LATENCY_STANDARD,
+             indicators=("security", "vulnerability", "authentication", "encryption")),
+    _persona("ui_ux_designer", aliases=("ux_designer", "ui_designer"), capabilities=("ux_design", "design"),
+             latency=LATENCY_STANDARD, inputs=("clarified_requirements",), outputs=("ui_design",),
+             indicators=("user", "interface", "design", "experience", "usability")),
+
+    # Multi-team coordination and quality personas
+    _persona("team_lead_coordinator", capabilities=("coordination",), latency=LATENCY_STANDARD),
+    _persona("integration_team_leader", capabilities=("coordination", "integration"), latency=LATENCY_STANDARD),
+    _persona("code_review_lead", capabilities=("code_review",), latency=LATENCY_STANDARD,
+             inputs=("code_artifacts",), outputs=("review_findings",)),
+    _persona("security_review_specialist", capabilities=("security", "code_review"), latency=LATENCY_STANDARD),
+    _persona("performance_specialist", capabilities=("performance",), latency=LATENCY_STANDARD),
+    _persona("quality_assurance_specialist", aliases=("qa_specialist",), capabilities=("quality_assurance",),
+             latency=LATENCY_STANDARD, inputs=("clarified_requirements", "acceptance_criteria"),
+             outputs=("validated_requirements", "quality_metrics"), indicators=("quality", "consistency")),
+    _persona("release_manager", capabilities=("release",), latency=LATENCY_STANDARD),
+
+    # AI metrics personas
+    _persona("metrics_architect", capabilities=("metrics_design",), latency=LATENCY_SLOW),
+    _persona("performance_analyst", capabilities=("metrics", "performance"), latency=LATENCY_STANDARD),
+    _persona("benchmarking_specialist", capabilities=("metrics",), latency=LATENCY_STANDARD),
+    _persona("metrics_optimizer", capabilities=("metrics",), latency=LATENCY_STANDARD),
+)
+
+
+class PersonaCatalog:
+    """Immutable, indexed view of every known persona"""
+
+    def __init__(self, personas: Iterable[PersonaSpec]):
+        by_name: Dict[str, PersonaSpec] = {}
+        by_agent: Dict[str, PersonaSpec] = {}
+        by_capability: Dict[str, List[PersonaSpec]] = {}
+        specs = []
+        for spec in personas:
+            specs.append(spec)
+            by_agent[spec.agent_id] = spec
+            for name in spec.names:
+                key = normalize_persona_name(name)
+                existing = by_name.get(key)
+                if existing is not None and existing.id != spec.id:
+                    logger.warning(f"⚠️ Persona name {name!r} is claimed by {existing.id} and {spec.id}")
+                    continue
+                by_name[key] = spec
+            for capability in spec.capabilities:
+                by_capability.setdefault(capability, []).append(spec)
+
+        self.personas: Tuple[PersonaSpec, ...] = tuple(specs)
+        self._by_name = MappingProxyType(by_name)
+        self._by_agent = MappingProxyType(by_agent)
+        self._by_capability = MappingProxyType({c: tuple(s) for c, s in by_capability.items()})
+
+        # One alternation over every spelling, longest first so "tester" never shadows
+        # "performance tester"; separators match any of space, "-" or "_"
+        spellings = sorted({k for k in by_name}, key=len, reverse=True)
+        alternation = "|".join(r"[\s_\-]+".join(re.escape(part) for part in k.split("_")) for k in spellings)
+        self._mention_pattern = re.compile(r"(?<![\w-])(?:%s)(?![\w-])" % alternation, re.IGNORECASE)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_persona_name(name) in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.personas)
+
+    def find(self, name: str) -> Optional[PersonaSpec]:
+        return self._by_name.get(normalize_persona_name(name)) or self._by_agent.get(name)
+
+    def get(self, name: str) -> PersonaSpec:
+        spec = self.find(name)
+        if spec is None:
+            raise KeyError(f"Unknown persona: {name}")
+        return spec
+
+    def canonical(self, name: str) -> str:
+        """Canonical id of a persona (normalized name when unknown)"""
+        spec = self.find(name)
+        return spec.id if spec else normalize_persona_name(name)
+
+    def agent_id(self, name: str) -> str:
+        """Agent id to call on the Personas Gateway (name unchanged when unknown)"""
+        spec = self.find(name)
+        return spec.agent_id if spec else name
+
+    def with_capability(self, capability: str) -> Tuple[PersonaSpec, ...]:
+        return self._by_capability.get(capability, ())
+
+    def mentions(self, text: str) -> List[PersonaSpec]:
+        """Personas mentioned in text, in order of first mention"""
+        found: Dict[str, PersonaSpec] = {}
+        for match in self._mention_pattern.finditer(text):
+            spec = self._by_name[normalize_persona_name(match.group(0))]
+            found.setdefault(spec.id, spec)
+        return list(found.values())
+
+    def agent_mapping(self) -> Dict[str, str]:
+        """Canonical id → gateway agent id"""
+        return {spec.id: spec.agent_id for spec in self.personas}
+
+
+def _extended_specs(extended_mapping: Mapping[str, Any], known: Dict[str, PersonaSpec]) -> List[PersonaSpec]:
+    specs = []
+    for name, entry in extended_mapping.items():
+        if isinstance(entry, str):
+            entry = {"agent_id": entry}
+        if not isinstance(entry, dict):
+            continue
+        key = normalize_persona_name(name)
+        base = known.get(key) or _persona(key, agent_id=name)
+        specs.append(replace(
+            base,
+            agent_id=entry.get("agent_id", base.agent_id),
+            aliases=tuple(dict.fromkeys(base.aliases + tuple(entry.get("aliases", ())) +
+                                        ((name,) if normalize_persona_name(name) != base.id else ()))),
+            capabilities=tuple(dict.fromkeys(base.capabilities + tuple(entry.get("capabilities", ())))),
+            latency_class=entry.get("latency_class", base.latency_class)
+        ))
+    return specs
+
+
+def load_persona_catalog(mapping_path: Optional[str] = None) -> PersonaCatalog:
+    """Built-in personas merged with the extended persona mapping file"""
+    path = mapping_path or os.getenv("G1_PERSONA_MAPPING_PATH", DEFAULT_PERSONA_MAPPING_PATH)
+    try:
+        with open(path, "r") as f:
+            extended_mapping = json.load(f)
+    except FileNotFoundError:
+        extended_mapping = {}
+    except json.JSONDecodeError as e:
+        logger.warning(f"⚠️ Ignoring invalid persona mapping {path}: {e}")
+        extended_mapping = {}
+
+    personas = {spec.id: spec for spec in BUILTIN_PERSONAS}
+    for spec in _extended_specs(extended_mapping, personas):
+        personas[spec.id] = spec
+    return PersonaCatalog(personas.values())
+
+
+_catalog: Optional[PersonaCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_persona_catalog() -> PersonaCatalog:
+    """Process-wide catalog, built on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_persona_catalog()
+    return _catalog
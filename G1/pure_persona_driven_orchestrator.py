@@ -26,25 +26,41 @@ Execution Layer:
 """
 
 import asyncio
+import contextlib
 import json
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import logging
 
-from workflow_orchestrator import PersonaAPIClient, WorkflowContextManager
+from workflow_orchestrator import WorkflowContextManager, get_persona_client
+from workflow_tracing import get_tracer, traced, SPAN_KIND_WORKFLOW, SPAN_KIND_PHASE, SPAN_KIND_HOP
+from incremental_execution import StepMemo, memoized_step
+from persona_catalog import get_persona_catalog
+from dependency_scheduler import DependencyScheduler
+from workflow_optimizer import WorkflowOptimizer
+from workflow_budget import WorkflowBudget, WorkflowUsage, usage_phase, usage_scope
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class PurePersonaDrivenOrchestrator:
     """100% Persona-Driven Orchestrator with Zero Hardcoding"""
     
-    def __init__(self):
-        self.persona_client = PersonaAPIClient()
+    def __init__(self, step_memo: Optional[StepMemo] = None,
+                 workflow_optimizer: Optional[WorkflowOptimizer] = None,
+                 budget: Optional[WorkflowBudget] = None):
+        self.persona_client = get_persona_client()
         self.context_manager = WorkflowContextManager()
         
+        # Memoized persona steps for incremental re-runs (G1_STEP_MEMO=path)
+        self.step_memo = step_memo if step_memo is not None else StepMemo.from_env()
+        
+        # Rewrites designed phases into the fastest equivalent plan (G1_OPTIMIZE_WORKFLOW=0 disables)
+        self.workflow_optimizer = workflow_optimizer if workflow_optimizer is not None else WorkflowOptimizer.from_env()
+        
+        # Per-workflow token/cost budget (G1_WORKFLOW_TOKEN_BUDGET / G1_WORKFLOW_COST_BUDGET)
+        self.budget = budget if budget is not None else WorkflowBudget.from_env()
+        
         # Meta-orchestration personas (NO hardcoded workflows)
         self.workflow_designer = "workflow-designer"
         self.team_architect = "team-structure-architect" 
@@ -55,6 +71,7 @@ class PurePersonaDrivenOrchestrator:
         self.verification_service = "verification-service"
         self.collaboration_manager = "collaborative-transition-manager"
     
+    @traced("phase.design_workflow", kind=SPAN_KIND_PHASE)
     async def design_workflow(self, requirements: str, project_context: Dict[str, Any]) -> Dict[str, Any]:
         """Let Workflow Designer persona design the entire SDLC workflow"""
         
@@ -80,15 +97,20 @@ class PurePersonaDrivenOrchestrator:
         Adapt the workflow specifically for this project type and constraints.
         """
         
-        result = await self.persona_client.call_persona(
-            self.workflow_designer,
-            workflow_request,
-            {
-                "action": "design_workflow",
-                "project_type": project_context.get("project_type", "unknown"),
-                "complexity": project_context.get("complexity", "moderate"),
-                "timeline": project_context.get("timeline", "standard")
-            }
+        result = await memoized_step(
+            "design_workflow",
+            lambda: self.persona_client.call_persona(
+                self.workflow_designer,
+                workflow_request,
+                {
+                    "action": "design_workflow",
+                    "project_type": project_context.get("project_type", "unknown"),
+                    "complexity": project_context.get("complexity", "moderate"),
+                    "timeline": project_context.get("timeline", "standard")
+                }
+            ),
+            persona=self.workflow_designer, requirement=requirements, inputs=project_context,
+            cache_if=lambda r: r["success"]
         )
         
         workflow_design = {
@@ -103,6 +125,7 @@ class PurePersonaDrivenOrchestrator:
         logger.info(f"✅ Workflow design completed: {workflow_design['workflow_id']}")
         return workflow_design
     
+    @traced("phase.design_team_structure", kind=SPAN_KIND_PHASE)
     async def design_team_structure(self, workflow_design: Dict[str, Any], project_scope: Dict[str, Any]) -> Dict[str, Any]:
         """Let Team Structure Architect persona design the team structure"""
         
@@ -128,14 +151,19 @@ class PurePersonaDrivenOrchestrator:
         Ensure teams align with the designed workflow and project requirements.
         """
         
-        result = await self.persona_client.call_persona(
-            self.team_architect,
-            team_request,
-            {
-                "action": "design_team_structure",
-                "workflow_id": workflow_design.get("workflow_id"),
-                "project_scope": project_scope
-            }
+        result = await memoized_step(
+            "design_team_structure",
+            lambda: self.persona_client.call_persona(
+                self.team_architect,
+                team_request,
+                {
+                    "action": "design_team_structure",
+                    "workflow_id": workflow_design.get("workflow_id"),
+                    "project_scope": project_scope
+                }
+            ),
+            persona=self.team_architect, depends_on=["design_workflow"], inputs=project_scope,
+            cache_if=lambda r: r["success"]
         )
         
         team_structure = {
@@ -150,6 +178,7 @@ class PurePersonaDrivenOrchestrator:
         logger.info(f"✅ Team structure design completed: {team_structure['team_structure_id']}")
         return team_structure
     
+    @traced("phase.design_communication_strategy", kind=SPAN_KIND_PHASE)
     async def design_communication_strategy(self, workflow_design: Dict[str, Any], 
                                           team_structure: Dict[str, Any]) -> Dict[str, Any]:
         """Let Communication Architect persona design the communication strategy"""
@@ -176,14 +205,20 @@ class PurePersonaDrivenOrchestrator:
         Prevent Chinese Whispers and optimize information fidelity.
         """
         
-        result = await self.persona_client.call_persona(
-            self.communication_architect,
-            communication_request,
-            {
-                "action": "design_communication_strategy",
-                "workflow_id": workflow_design.get("workflow_id"),
-                "team_structure_id": team_structure.get("team_structure_id")
-            }
+        result = await memoized_step(
+            "design_communication_strategy",
+            lambda: self.persona_client.call_persona(
+                self.communication_architect,
+                communication_request,
+                {
+                    "action": "design_communication_strategy",
+                    "workflow_id": workflow_design.get("workflow_id"),
+                    "team_structure_id": team_structure.get("team_structure_id")
+                }
+            ),
+            persona=self.communication_architect,
+            depends_on=["design_workflow", "design_team_structure"],
+            cache_if=lambda r: r["success"]
         )
         
         communication_strategy = {
@@ -205,6 +240,11 @@ class PurePersonaDrivenOrchestrator:
         design_text = workflow_design.get("design_response", "")
         
         # Enhanced parsing to extract phases from persona design
+        catalog = get_persona_catalog()
+        orchestration_personas = {catalog.canonical(p) for p in (
+            self.workflow_designer, self.team_architect, self.communication_architect,
+            self.knowledge_hub, self.verification_service, self.collaboration_manager
+        )}
         phases = []
         lines = design_text.split('\n')
         current_phase = None
@@ -222,21 +262,10 @@ class PurePersonaDrivenOrchestrator:
                     "dependencies": []
                 }
             elif current_phase:
-                # Look for personas in various formats
-                if any(keyword in line.lower() for keyword in ['persona', 'role', 'specialist', 'architect', 'manager', 'developer', 'tester']):
-                    # Extract persona names from common patterns
-                    if any(persona in line.lower() for persona in [
-                        'requirement-concierge', 'business-analyst', 'program-manager',
-                        'solution-architect', 'technical-architect', 'api-designer', 
-                        'database-architect', 'developer', 'tester', 'team-lead-coordinator'
-                    ]):
-                        # Try to extract persona name
-                        for persona in ['requirement-concierge', 'business-analyst', 'program-manager',
-                                      'solution-architect', 'technical-architect', 'api-designer',
-                                      'database-architect', 'developer', 'tester', 'team-lead-coordinator']:
-                            if persona in line.lower():
-                                if persona not in current_phase["personas"]:
-                                    current_phase["personas"].append(persona)
+                # Personas mentioned in any spelling or alias (one pass over the line)
+                for persona in catalog.mentions(line):
+                    if persona.id not in orchestration_personas and persona.agent_id not in current_phase["personas"]:
+                        current_phase["personas"].append(persona.agent_id)
         
         if current_phase:
             phases.append(current_phase)
@@ -322,6 +351,7 @@ class PurePersonaDrivenOrchestrator:
         logger.info(f"Parsed {len(teams)} teams from persona-designed structure")
         return teams
     
+    @traced("workflow.pure_persona_driven", kind=SPAN_KIND_WORKFLOW)
     async def execute_persona_driven_workflow(self, requirements: str, 
                                             project_context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute completely persona-driven workflow with zero hardcoding"""
@@ -329,28 +359,49 @@ class PurePersonaDrivenOrchestrator:
         logger.info("🚀 Starting Pure Persona-Driven Workflow Execution")
         logger.info("=" * 70)
         
+        with self.step_memo.workflow() if self.step_memo else contextlib.nullcontext() as memo_graph, \
+                usage_scope(WorkflowUsage(str(uuid.uuid4()), self.budget)) as usage:
+            execution_result = await self._execute_persona_driven_workflow(requirements, project_context)
+        usage.workflow_id = execution_result["requirement_id"]
+        execution_result["usage"] = usage.summary()
+        logger.info(f"💸 Usage: {execution_result['usage']['total_tokens']} tokens, "
+                    f"${execution_result['usage']['cost_usd']:.4f}")
+        if memo_graph:
+            execution_result["step_memo"] = dict(memo_graph.stats, recomputed=memo_graph.recomputed)
+            logger.info(f"💾 Step memo: {memo_graph.stats['hits']} reused, {memo_graph.stats['misses']} recomputed")
+        return execution_result
+    
+    async def _execute_persona_driven_workflow(self, requirements: str,
+                                               project_context: Dict[str, Any]) -> Dict[str, Any]:
         # Step 1: Meta-Orchestration - Design everything with personas
         logger.info("\n🎯 META-ORCHESTRATION PHASE")
         
-        # Design workflow (NO hardcoded phases)
-        workflow_design = await self.design_workflow(requirements, project_context)
-        
-        # Design team structure (NO hardcoded teams)
-        project_scope = {
-            "estimated_complexity": project_context.get("complexity", "moderate"),
-            "technology_stack": project_context.get("technology_stack", []),
-            "timeline": project_context.get("timeline", "standard"),
-            "team_size_preference": project_context.get("team_size_preference", "optimal")
-        }
-        team_structure = await self.design_team_structure(workflow_design, project_scope)
-        
-        # Design communication strategy (NO hardcoded communication)
-        communication_strategy = await self.design_communication_strategy(workflow_design, team_structure)
+        with usage_phase("meta_orchestration"):
+            # Design workflow (NO hardcoded phases)
+            workflow_design = await self.design_workflow(requirements, project_context)
+            
+            # Design team structure (NO hardcoded teams)
+            project_scope = {
+                "estimated_complexity": project_context.get("complexity", "moderate"),
+                "technology_stack": project_context.get("technology_stack", []),
+                "timeline": project_context.get("timeline", "standard"),
+                "team_size_preference": project_context.get("team_size_preference", "optimal")
+            }
+            team_structure = await self.design_team_structure(workflow_design, project_scope)
+            
+            # Design communication strategy (NO hardcoded communication)
+            communication_strategy = await self.design_communication_strategy(workflow_design, team_structure)
         
         # Step 2: Parse persona-designed structures
         phases = self.parse_workflow_phases(workflow_design)
         teams = self.parse_team_assignments(team_structure)
         
+        # Fastest equivalent plan: independent personas run in parallel stages
+        workflow_plan = None
+        if self.workflow_optimizer:
+            workflow_plan = self.workflow_optimizer.optimize(phases)
+            phases = workflow_plan.phases
+        
         logger.info(f"✅ Meta-orchestration complete:")
         logger.info(f"   Phases: {len(phases)}")
         logger.info(f"   Teams: {len(teams)}")
@@ -358,24 +409,44 @@ class PurePersonaDrivenOrchestrator:
         # Step 3: Store original requirement in knowledge hub
         req_id = await self.store_requirement_in_hub(requirements, project_context, 
                                                    workflow_design, team_structure, communication_strategy)
+        workflow_span = get_tracer().current_span()
+        workflow_span.set_attribute("g1.requirement_id", req_id)
         
         # Step 4: Execute workflow as designed by personas
         logger.info(f"\n⚡ EXECUTION PHASE - Following Persona-Designed Workflow")
         
         phase_results = {}
-        for i, phase in enumerate(phases):
-            logger.info(f"\n{i+1}️⃣ Executing {phase['phase_name']}")
-            
-            phase_result = await self.execute_phase(phase, req_id, requirements, project_context)
-            phase_results[f"phase_{i+1}"] = phase_result
-            
-            logger.info(f"✅ {phase['phase_name']} completed")
+        if workflow_plan:
+            # Each stage starts as soon as the stages holding its inputs have finished
+            scheduler = DependencyScheduler()
+            for i, phase in enumerate(phases):
+                async def run_stage(_, i=i, phase=phase):
+                    logger.info(f"\n{i+1}️⃣ Executing {phase['phase_name']}")
+                    phase_result = await self.execute_phase(phase, req_id, requirements, project_context)
+                    logger.info(f"✅ {phase['phase_name']} completed")
+                    return phase_result
+                scheduler.add(phase["phase_name"], run_stage, depends_on=phase["dependencies"])
+            stage_results = await scheduler.run()
+            phase_results = {f"phase_{i+1}": stage_results[phase["phase_name"]] for i, phase in enumerate(phases)}
+        else:
+            executed_steps: List[str] = []
+            for i, phase in enumerate(phases):
+                logger.info(f"\n{i+1}️⃣ Executing {phase['phase_name']}")
+                
+                phase_result = await self.execute_phase(phase, req_id, requirements, project_context,
+                                                        upstream_steps=list(executed_steps))
+                phase_results[f"phase_{i+1}"] = phase_result
+                executed_steps.extend(f"{phase['phase_name']}:{p}"
+                                      for p in phase.get("personas", []) if p and p.strip())
+                
+                logger.info(f"✅ {phase['phase_name']} completed")
         
         # Step 5: Final analysis
         logger.info(f"\n📊 Analyzing Results")
         
-        final_analysis = await self.analyze_workflow_results(req_id, phase_results, 
-                                                           workflow_design, team_structure, communication_strategy)
+        with usage_phase("workflow_analysis"):
+            final_analysis = await self.analyze_workflow_results(req_id, phase_results, 
+                                                               workflow_design, team_structure, communication_strategy)
         
         execution_result = {
             "execution_id": str(uuid.uuid4()),
@@ -393,9 +464,11 @@ class PurePersonaDrivenOrchestrator:
                 "phase_results": phase_results
             },
             "final_analysis": final_analysis,
+            "workflow_plan": workflow_plan.to_dict() if workflow_plan else None,
             "workflow_completed": True,
             "completion_timestamp": datetime.now().isoformat(),
-            "orchestration_type": "pure_persona_driven"
+            "orchestration_type": "pure_persona_driven",
+            "trace_id": workflow_span.trace_id
         }
         
         logger.info("🎉 Pure Persona-Driven Workflow Completed")
@@ -406,6 +479,7 @@ class PurePersonaDrivenOrchestrator:
         
         return execution_result
     
+    @traced("hub.store_requirement", kind=SPAN_KIND_HOP)
     async def store_requirement_in_hub(self, requirements: str, context: Dict[str, Any],
                                      workflow_design: Dict[str, Any], team_structure: Dict[str, Any],
                                      communication_strategy: Dict[str, Any]) -> str:
@@ -450,39 +524,64 @@ class PurePersonaDrivenOrchestrator:
         logger.info(f"✅ Complete project context stored in knowledge hub: {req_id}")
         return req_id
     
+    @traced("phase.execute_phase", kind=SPAN_KIND_PHASE)
     async def execute_phase(self, phase: Dict[str, Any], req_id: str, 
-                          requirements: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single phase as designed by workflow persona"""
+                          requirements: str, context: Dict[str, Any],
+                          upstream_steps: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Execute a single phase as designed by workflow persona
+        
+        upstream_steps: steps already run in this workflow; a phase that declares
+        no dependencies depends on all of them (their outputs reach it through the hub)
+        """
         
         phase_name = phase.get("phase_name", "Unknown Phase")
         personas = phase.get("personas", [])
+        get_tracer().current_span().set_attribute("g1.phase", phase_name)
         
         if not personas:
             logger.warning(f"No personas defined for phase: {phase_name}")
             return {"error": "No personas defined", "phase": phase_name}
         
-        phase_results = {}
-        
-        for persona in personas:
-            if not persona or persona.strip() == "":
-                continue
-                
+        async def run_persona(persona: str, depends_on: List[str]) -> Dict[str, Any]:
             logger.info(f"   🤖 Processing with {persona}")
             
-            # Get context from knowledge hub
-            persona_context = await self.get_context_from_hub(req_id, persona)
+            async def process():
+                # Get context from knowledge hub
+                persona_context = await self.get_context_from_hub(req_id, persona)
+                
+                # Process with persona
+                return await self.persona_client.call_persona(
+                    persona,
+                    requirements,
+                    persona_context
+                )
             
-            # Process with persona
-            result = await self.persona_client.call_persona(
-                persona,
-                requirements,
-                persona_context
+            result = await memoized_step(
+                f"{phase_name}:{persona}", process, persona=persona, requirement=requirements,
+                depends_on=depends_on, inputs=context, cache_if=lambda r: r["success"]
             )
             
-            phase_results[persona] = result
-            
             # Update knowledge hub with result
             await self.update_hub_with_result(req_id, persona, result.get("response", ""))
+            return result
+        
+        # One call per persona: results (and the memo step) are keyed by persona name
+        personas = list(dict.fromkeys(p for p in personas if p and p.strip()))
+        # Depends on the meta-orchestration designs and the phases this one follows
+        depends_on = ["design_workflow", "design_team_structure", "design_communication_strategy",
+                      *(phase.get("dependencies") or upstream_steps or [])]
+        with usage_phase(phase_name):
+            if phase.get("parallel"):
+                # Optimized stages only group personas that do not need each other's outputs
+                results = await asyncio.gather(*(run_persona(p, depends_on) for p in personas))
+                phase_results = dict(zip(personas, results))
+            else:
+                phase_results = {}
+                for i, persona in enumerate(personas):
+                    # Earlier personas of a sequential phase feed this one through the hub too
+                    earlier = [f"{phase_name}:{p}" for p in personas[:i]]
+                    phase_results[persona] = await run_persona(persona, depends_on + earlier)
         
         return {
             "phase_name": phase_name,
@@ -491,6 +590,7 @@ class PurePersonaDrivenOrchestrator:
             "phase_completed": True
         }
     
+    @traced("hub.get_context", kind=SPAN_KIND_HOP)
     async def get_context_from_hub(self, req_id: str, persona: str) -> Dict[str, Any]:
         """Get role-appropriate context from knowledge hub"""
         
@@ -524,6 +624,7 @@ class PurePersonaDrivenOrchestrator:
             "pull_timestamp": datetime.now().isoformat()
         }
     
+    @traced("hub.log_result", kind=SPAN_KIND_HOP)
     async def update_hub_with_result(self, req_id: str, persona: str, result: str):
         """Update knowledge hub with persona result"""
         
@@ -547,6 +648,7 @@ class PurePersonaDrivenOrchestrator:
             }
         )
     
+    @traced("phase.workflow_analysis", kind=SPAN_KIND_PHASE)
     async def analyze_workflow_results(self, req_id: str, phase_results: Dict[str, Any],
                                      workflow_design: Dict[str, Any], team_structure: Dict[str, Any],
                                      communication_strategy: Dict[str, Any]) -> Dict[str, Any]:
@@ -577,14 +679,21 @@ class PurePersonaDrivenOrchestrator:
         5. Recommendations for future improvements
         """
         
-        result = await self.persona_client.call_persona(
-            self.knowledge_hub,
-            analysis_request,
-            {
-                "action": "analyze_workflow_execution",
-                "requirement_id": req_id,
-                "orchestration_type": "pure_persona_driven"
-            }
+        result = await memoized_step(
+            "workflow_analysis",
+            lambda: self.persona_client.call_persona(
+                self.knowledge_hub,
+                analysis_request,
+                {
+                    "action": "analyze_workflow_execution",
+                    "requirement_id": req_id,
+                    "orchestration_type": "pure_persona_driven"
+                }
+            ),
+            persona=self.knowledge_hub,
+            depends_on=["design_workflow", "design_team_structure", "design_communication_strategy",
+                        *(r["phase_name"] for r in phase_results.values() if "phase_name" in r)],
+            cache_if=lambda r: r["success"]
         )
         
         return {
@@ -658,4 +767,5 @@ async def test_pure_persona_driven_workflow():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_pure_persona_driven_workflow())
\ No newline at end of file
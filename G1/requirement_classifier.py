@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Requirement Classifier
+======================
+
+Keyword-rule classification of incoming requirements, compiled once.
+
+All keywords of every rule table are compiled into a single regular expression
+and found in one scan of the (lowercased) input; rule precedence is then
+resolved per dimension, first matching rule wins, exactly like the original
+if/elif keyword chains. Matching keeps plain substring semantics ("fix" also
+matches "prefix").
+
+Features:
+- Rule tables loaded from JSON config (G1_CLASSIFIER_RULES) or the defaults below
+- Batch classification of many requirements in one regex pass
+- Results memoized by input hash
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rule tables per dimension. Rules are evaluated in order; a rule matches when any
+# keyword occurs in the input and all its "when" conditions on already-resolved
+# dimensions hold. A rule without keywords matches on its conditions alone.
+DEFAULT_RULES: Dict[str, Dict[str, Any]] = {
+    "type": {
+        "default": "feature_request",
+        "rules": [
+            {"value": "bug_fix", "keywords": ["fix", "bug", "error", "broken"]},
+            {"value": "compliance", "keywords": ["compliance", "hipaa", "gdpr", "audit"]},
+            {"value": "migration", "keywords": ["migrate", "migration", "upgrade"]},
+            {"value": "infrastructure", "keywords": ["infrastructure", "deployment", "server"]},
+            {"value": "research", "keywords": ["research", "poc", "investigate"]}
+        ]
+    },
+    "priority": {
+        "default": "medium",
+        "rules": [
+            {"value": "critical", "keywords": ["critical", "urgent", "emergency"]},
+            {"value": "high", "keywords": ["high", "important", "soon"]},
+            {"value": "low", "keywords": ["low", "nice", "future"]}
+        ]
+    },
+    "complexity_score": {
+        "default": 3.0,
+        "rules": [
+            {"value": 2.0, "keywords": ["simple", "quick", "small"]},
+            {"value": 8.0, "keywords": ["complex", "large", "enterprise", "platform"]},
+            {"value": 9.0, "keywords": ["microservices", "migration", "architecture"]}
+        ]
+    },
+    "risk_score": {
+        "default": 3.0,
+        "rules": [
+            {"value": 8.0, "when": {"type": "compliance"}},
+            {"value": 7.0, "keywords": ["patient", "financial", "security"]},
+            {"value": 2.0, "when": {"type": "bug_fix"}}
+        ]
+    }
+}
+
+# Separator between requirements in a batch scan; never part of a keyword
+_BATCH_SEPARATOR = "\x00"
+
+
+@dataclass(frozen=True)
+class KeywordClassification:
+    """Classification labels for one requirement"""
+    type: str
+    priority: str
+    complexity_score: float
+    risk_score: float
+    matched_keywords: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "priority": self.priority,
+            "complexity_score": self.complexity_score,
+            "risk_score": self.risk_score,
+            "matched_keywords": list(self.matched_keywords)
+        }
+
+
+class RequirementClassifier:
+    """Classifies requirements against precompiled keyword rule tables"""
+
+    DIMENSIONS = ("type", "priority", "complexity_score", "risk_score")
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, Any]]] = None, cache_size: int = 4096):
+        self.rules = rules or DEFAULT_RULES
+        missing = [d for d in self.DIMENSIONS if d not in self.rules]
+        if missing:
+            raise ValueError(f"Classifier rules missing dimensions: {missing}")
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, KeywordClassification]" = OrderedDict()
+        self.stats = {"classified": 0, "cache_hits": 0}
+        self._compile()
+
+    @classmethod
+    def from_config(cls, path: str, **kwargs) -> "RequirementClassifier":
+        """Load rule tables from a JSON file with the DEFAULT_RULES layout"""
+        with open(path, "r") as f:
+            return cls(json.load(f), **kwargs)
+
+    def _compile(self):
+        keywords = sorted({
+            keyword.lower()
+            for table in self.rules.values()
+            for rule in table["rules"]
+            for keyword in rule.get("keywords", [])
+        }, key=len, reverse=True)
+
+        # Longest alternative first inside a lookahead: one match per position,
+        # overlapping matches included. Shorter keywords starting at the same
+        # position are prefixes of the match and are recovered via _prefixes.
+        self._pattern = re.compile("(?=(%s))" % "|".join(map(re.escape, keywords))) if keywords else None
+        self._prefixes = {k: frozenset(p for p in keywords if k.startswith(p)) for k in keywords}
+
+    def _find_keywords(self, text: str) -> set:
+        found = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                found |= self._prefixes[match.group(1)]
+        return found
+
+    def _resolve(self, found: set) -> KeywordClassification:
+        labels: Dict[str, Any] = {}
+        for dimension in self.DIMENSIONS:
+            table = self.rules[dimension]
+            labels[dimension] = table["default"]
+            for rule in table["rules"]:
+                keywords = rule.get("keywords")
+                if keywords and not any(k.lower() in found for k in keywords):
+                    continue
+                if any(labels.get(d) != v for d, v in rule.get("when", {}).items()):
+                    continue
+                labels[dimension] = rule["value"]
+                break
+
+        return KeywordClassification(
+            type=labels["type"],
+            priority=labels["priority"],
+            complexity_score=float(labels["complexity_score"]),
+            risk_score=float(labels["risk_score"]),
+            matched_keywords=tuple(sorted(found))
+        )
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _remember(self, key: bytes, result: KeywordClassification):
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def classify(self, text: str) -> KeywordClassification:
+        """Classify a single requirement"""
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: List[str]) -> List[KeywordClassification]:
+        """Classify many requirements with a single regex scan over the uncached ones"""
+        results: List[Optional[KeywordClassification]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+
+        for index, text in enumerate(texts):
+            key = self._key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                results[index] = cached
+            else:
+                pending.setdefault(key, []).append(index)
+
+        if pending:
+            keys = list(pending)
+            lowered = [texts[pending[key][0]].lower().replace(_BATCH_SEPARATOR, " ") for key in keys]
+            found: List[set] = [set() for _ in keys]
+
+            # Map match offsets in the concatenated text back to their requirement
+            starts, offset = [], 0
+            for text in lowered:
+                starts.append(offset)
+                offset += len(text) + 1
+
+            if self._pattern is not None:
+                for match in self._pattern.finditer(_BATCH_SEPARATOR.join(lowered)):
+                    found[bisect.bisect_right(starts, match.start()) - 1] |= self._prefixes[match.group(1)]
+
+            for key, keywords in zip(keys, found):
+                result = self._resolve(keywords)
+                self._remember(key, result)
+                for index in pending[key]:
+                    results[index] = result
+            self.stats["classified"] += len(keys)
+
+        return results
+
+
+_classifier: Optional[RequirementClassifier] = None
+
+
+def get_classifier() -> RequirementClassifier:
+    """Process-wide classifier; rules from G1_CLASSIFIER_RULES when set"""
+    global _classifier
+    if _classifier is None:
+        rules_path = os.getenv("G1_CLASSIFIER_RULES")
+        if rules_path:
+            logger.info(f"📋 Loading requirement classifier rules from {rules_path}")
+            _classifier = RequirementClassifier.from_config(rules_path)
+        else:
+            _classifier = RequirementClassifier()
+    return _classifier
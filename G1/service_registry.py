@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Service Registry
+================
+
+Single source of truth for service endpoints, built once per process from
+config/port-allocation.csv and config/service-discovery.yml.
+
+The registry is an immutable, indexed structure:
+- by name (canonical name and aliases; "_" and "-" are interchangeable)
+- by port (external, backend and internal ports; a port may be shared)
+- by category (port-allocation category or discovery type)
+
+Each service carries one or more replica endpoints. By default a service has
+a single replica on localhost (external port) or, with G1_SERVICE_NETWORK=docker,
+on its container name (backend/internal port). Extra replicas can be declared
+per service:
+
+    G1_SERVICE_REPLICAS_PERSONAS_GATEWAY=http://gw-1:8013,http://gw-2:8013
+
+Configuration (environment):
+- G1_CONFIG_DIR: directory holding the config files (default: ./config next to this module)
+- G1_SERVICE_NETWORK: "local" (default) or "docker"
+- G1_SERVICE_HOST: host for local endpoints (default: localhost)
+"""
+
+import csv
+import itertools
+import logging
+import os
+import threading
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Mapping
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+
+NETWORK_LOCAL = "local"
+NETWORK_DOCKER = "docker"
+
+
+def normalize_service_name(name: str) -> str:
+    return name.strip().lower().replace("_", "-")
+
+
+@dataclass(frozen=True)
+class ServiceEndpoint:
+    """One reachable replica of a service"""
+    host: str
+    port: int
+    scheme: str = "http"
+
+    @property
+    def url(self) -> str:
+        return f"{self.scheme}://{self.host}:{self.port}"
+
+    @classmethod
+    def from_url(cls, url: str) -> "ServiceEndpoint":
+        scheme, _, rest = url.strip().partition("://")
+        if not rest:
+            scheme, rest = "http", scheme
+        host, _, port = rest.rstrip("/").partition(":")
+        return cls(host, int(port) if port else (443 if scheme == "https" else 80), scheme)
+
+
+@dataclass(frozen=True)
+class ServiceRecord:
+    """Everything the config files say about one service"""
+    name: str
+    category: str
+    description: str = ""
+    external_port: Optional[int] = None
+    backend_port: Optional[int] = None
+    container_name: Optional[str] = None
+    dns_name: Optional[str] = None
+    internal_ports: Tuple[int, ...] = ()
+    health_check: Optional[str] = None
+    api_prefix: str = ""
+    aliases: Tuple[str, ...] = ()
+    replicas: Tuple[ServiceEndpoint, ...] = ()
+
+    @property
+    def ports(self) -> Tuple[int, ...]:
+        ports = [p for p in (self.external_port, self.backend_port) if p is not None]
+        return tuple(dict.fromkeys(ports + list(self.internal_ports)))
+
+    @property
+    def url(self) -> str:
+        """Base URL of the first replica"""
+        return self.replicas[0].url
+
+    @property
+    def api_url(self) -> str:
+        return self.url + self.api_prefix
+
+
+def _parse_port_allocation(path: str) -> List[ServiceRecord]:
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        rows = (line for line in f if line.strip() and not line.lstrip().startswith("#"))
+        for row in csv.reader(rows):
+            if len(row) < 4:
+                continue
+            name, external_port, backend_port, category = (c.strip() for c in row[:4])
+            records.append(ServiceRecord(
+                name=normalize_service_name(name),
+                category=category,
+                description=row[4].strip() if len(row) > 4 else "",
+                external_port=int(external_port),
+                backend_port=int(backend_port)
+            ))
+    return records
+
+
+def _parse_service_discovery(path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Service entries and the raw document of service-discovery.yml"""
+    if not YAML_AVAILABLE:
+        logger.warning("⚠️ PyYAML not installed; skipping service-discovery.yml")
+        return [], {}
+    with open(path, "r", encoding="utf-8") as f:
+        document = yaml.safe_load(f) or {}
+
+    entries = []
+    for section in ("services", "external_services"):
+        for key, spec in (document.get(section) or {}).items():
+            ports = list(spec.get("internal_ports") or spec.get("ports") or [])
+            if spec.get("port") is not None:
+                ports.insert(0, spec["port"])
+            entries.append({
+                "name": normalize_service_name(key),
+                "category": spec.get("type") or ("external" if section == "external_services" else "oom-ai"),
+                "container_name": spec.get("container_name"),
+                "dns_name": spec.get("dns_name"),
+                "internal_ports": tuple(int(p) for p in ports),
+                "health_check": spec.get("health_check"),
+                "api_prefix": spec.get("api_prefix", "")
+            })
+    return entries, document
+
+
+class ServiceRegistry:
+    """Immutable, indexed view of every known service"""
+
+    def __init__(self, records: List[ServiceRecord], settings: Optional[Mapping[str, Any]] = None):
+        self.settings: Mapping[str, Any] = MappingProxyType(dict(settings or {}))
+
+        by_name: Dict[str, ServiceRecord] = {}
+        by_port: Dict[int, List[ServiceRecord]] = {}
+        by_category: Dict[str, List[ServiceRecord]] = {}
+        for record in records:
+            for name in (record.name, *record.aliases):
+                by_name[normalize_service_name(name)] = record
+            for port in record.ports:
+                by_port.setdefault(port, []).append(record)
+            by_category.setdefault(record.category, []).append(record)
+
+        self.services: Tuple[ServiceRecord, ...] = tuple(records)
+        self._by_name = MappingProxyType(by_name)
+        self._by_port = MappingProxyType({p: tuple(r) for p, r in by_port.items()})
+        self._by_category = MappingProxyType({c: tuple(r) for c, r in by_category.items()})
+
+        # Rotation state only; the indexes above never change
+        self._rotations = {record.name: itertools.cycle(record.replicas) for record in records if record.replicas}
+        self._rotation_lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_service_name(name) in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def find(self, name: str) -> Optional[ServiceRecord]:
+        return self._by_name.get(normalize_service_name(name))
+
+    def get(self, name: str) -> ServiceRecord:
+        record = self.find(name)
+        if record is None:
+            raise KeyError(f"Unknown service: {name}")
+        return record
+
+    def by_port(self, port: int) -> Tuple[ServiceRecord, ...]:
+        return self._by_port.get(int(port), ())
+
+    def in_category(self, category: str) -> Tuple[ServiceRecord, ...]:
+        return self._by_category.get(category, ())
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(self._by_category)
+
+    def replicas(self, name: str) -> Tuple[ServiceEndpoint, ...]:
+        return self.get(name).replicas
+
+    def resolve_url(self, name: str, default: Optional[str] = None) -> str:
+        """Base URL of a service's first replica (default when the service is unknown)"""
+        record = self.find(name)
+        if record is None or not record.replicas:
+            if default is None:
+                raise KeyError(f"Unknown service: {name}")
+            return default
+        return record.url
+
+    def next_endpoint(self, name: str) -> ServiceEndpoint:
+        """Round-robin over a service's replicas"""
+        record = self.get(name)
+        with self._rotation_lock:
+            return next(self._rotations[record.name])
+
+
+def _merge(records: List[ServiceRecord], discovery: List[Dict[str, Any]]) -> List[ServiceRecord]:
+    """Fold discovery entries into port-allocation records with the same (normalized) name"""
+    merged = {record.name: record for record in records}
+    for entry in discovery:
+        existing = merged.get(entry["name"])
+        if existing is None:
+            merged[entry["name"]] = ServiceRecord(**entry)
+        else:
+            merged[entry["name"]] = replace(
+                existing,
+                container_name=entry["container_name"],
+                dns_name=entry["dns_name"],
+                internal_ports=entry["internal_ports"],
+                health_check=entry["health_check"],
+                api_prefix=entry["api_prefix"] or existing.api_prefix
+            )
+    return list(merged.values())
+
+
+def _with_replicas(record: ServiceRecord, network: str, host: str,
+                   environ: Mapping[str, str]) -> ServiceRecord:
+    override = environ.get("G1_SERVICE_REPLICAS_" + record.name.upper().replace("-", "_"))
+    if override:
+        endpoints = tuple(ServiceEndpoint.from_url(u) for u in override.split(",") if u.strip())
+        return replace(record, replicas=endpoints)
+
+    if network == NETWORK_DOCKER and record.container_name:
+        port = record.backend_port or (record.internal_ports[0] if record.internal_ports else None)
+        endpoint_host = record.container_name
+    else:
+        port = record.external_port or (record.internal_ports[0] if record.internal_ports else None)
+        endpoint_host = host
+    return replace(record, replicas=(ServiceEndpoint(endpoint_host, port),) if port else ())
+
+
+def load_service_registry(config_dir: Optional[str] = None,
+                          environ: Optional[Mapping[str, str]] = None) -> ServiceRegistry:
+    """Parse the config files into a new registry"""
+    environ = os.environ if environ is None else environ
+    config_dir = config_dir or environ.get("G1_CONFIG_DIR", DEFAULT_CONFIG_DIR)
+    network = environ.get("G1_SERVICE_NETWORK", NETWORK_LOCAL)
+    host = environ.get("G1_SERVICE_HOST", "localhost")
+
+    records: List[ServiceRecord] = []
+    csv_path = os.path.join(config_dir, "port-allocation.csv")
+    if os.path.exists(csv_path):
+        records = _parse_port_allocation(csv_path)
+
+    settings: Dict[str, Any] = {}
+    discovery_path = os.path.join(config_dir, "service-discovery.yml")
+    if os.path.exists(discovery_path):
+        entries, document = _parse_service_discovery(discovery_path)
+        records = _merge(records, entries)
+        settings = {k: document.get(k, {}) for k in ("communication_patterns", "load_balancing", "environments")}
+
+    registry = ServiceRegistry([_with_replicas(r, network, host, environ) for r in records], settings)
+    logger.info(f"📇 Service registry loaded: {len(registry)} services in {len(registry.categories)} categories")
+    return registry
+
+
+_registry: Optional[ServiceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_service_registry() -> ServiceRegistry:
+    """Process-wide registry, parsed on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = load_service_registry()
+    return _registry
+
+
+def resolve_service_url(name: str, default: Optional[str] = None) -> str:
+    """Base URL of a service from the process-wide registry"""
+    return get_service_registry().resolve_url(name, default)
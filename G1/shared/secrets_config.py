@@ -2,12 +2,21 @@
 """
 Secrets Configuration Module for OOM Microservices
 Compatible interface for service configuration with hybrid secrets management
+
+Configs are memoized per service in a process-wide registry, so calls on
+request paths are dictionary lookups. A failing async secrets backend is
+negatively cached for SECRETS_RETRY_INTERVAL seconds (default 60) instead of
+being retried on every lookup. enable_hot_reload() reloads configs when a
+watched env file changes or on SIGHUP.
 """
 
 import os
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import signal
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, List
 from dataclasses import dataclass
 
 # Try to import the shared secrets client
@@ -16,6 +25,13 @@ try:
     ASYNC_SECRETS_AVAILABLE = True
 except ImportError:
     ASYNC_SECRETS_AVAILABLE = False
+
+# Port allocations from config/port-allocation.csv when the registry is importable
+try:
+    from service_registry import get_service_registry
+    SERVICE_REGISTRY_AVAILABLE = True
+except ImportError:
+    SERVICE_REGISTRY_AVAILABLE = False
     
 logger = logging.getLogger(__name__)
 
@@ -52,17 +68,16 @@ class SimpleServiceConfig:
     def get_anthropic_api_key(self) -> str:
         return self.anthropic_api_key
 
-def get_service_config(service_name: str) -> SimpleServiceConfig:
+def _build_env_config(service_name: str) -> SimpleServiceConfig:
     """
-    Get service configuration using hybrid approach
-    1. Try async secrets management if available
-    2. Fallback to environment variables
+    Build service configuration from environment variables
     """
     
     # For microservices, we'll use synchronous environment variable fallback
     # since the async secrets client requires more complex initialization
     
-    # Port allocation based on service name and current registrations
+    # Port allocation: legacy registrations first (clients still call these ports),
+    # then the service registry (backend_port) for services without one
     port_map = {
         'ai-manager': 8002,
         'rag-engine': 8003, 
@@ -75,6 +90,10 @@ def get_service_config(service_name: str) -> SimpleServiceConfig:
     }
     
     default_port = port_map.get(service_name, 8000)
+    if service_name not in port_map and SERVICE_REGISTRY_AVAILABLE:
+        record = get_service_registry().find(service_name)
+        if record is not None and record.backend_port:
+            default_port = record.backend_port
     
     # Get configuration from environment with service-specific overrides
     config = SimpleServiceConfig(
@@ -92,32 +111,186 @@ def get_service_config(service_name: str) -> SimpleServiceConfig:
     
     return config
 
-async def get_service_config_async(service_name: str) -> SimpleServiceConfig:
-    """
-    Async version that tries secrets management API first
-    """
+def _convert_async_config(service_name: str, async_config) -> SimpleServiceConfig:
+    """Convert a secrets client ServiceConfig to SimpleServiceConfig"""
+    return SimpleServiceConfig(
+        service_name=service_name,
+        port=async_config.port,
+        database_url=async_config.database_config.get('postgres_url', f'sqlite:///./{service_name}.db'),
+        redis_url=async_config.database_config.get('redis_url', 'redis://localhost:6379'),
+        jwt_secret=async_config.api_keys.get('jwt_secret', f'{service_name}-jwt-secret-dev'),
+        api_key=async_config.api_keys.get('api_key', f'{service_name}-api-key-dev'),
+        openai_api_key=async_config.api_keys.get('openai', ''),
+        anthropic_api_key=async_config.api_keys.get('anthropic', ''),
+    )
+
+def _load_env_file(path: str):
+    """Apply KEY=VALUE lines of an env file to os.environ"""
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            key = key.strip()
+            if key.startswith('export '):
+                key = key[len('export '):].strip()
+            os.environ[key] = value.strip().strip('"').strip("'")
+
+class ConfigRegistry:
+    """Process-wide cache of service configurations"""
+    
+    def __init__(self, retry_interval: Optional[float] = None):
+        self.retry_interval = retry_interval if retry_interval is not None else float(
+            os.getenv('SECRETS_RETRY_INTERVAL', '60'))
+        self._env_configs: Dict[str, SimpleServiceConfig] = {}
+        self._secret_configs: Dict[str, SimpleServiceConfig] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._backend_retry_at = 0.0
+        # Bumped by reload(); secrets fetched under an older generation are discarded
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._reload_callbacks: List[Callable[[], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_stop = threading.Event()
     
-    if ASYNC_SECRETS_AVAILABLE:
+    def get(self, service_name: str) -> SimpleServiceConfig:
+        """Environment-based config, built once per service"""
+        config = self._env_configs.get(service_name)
+        if config is None:
+            with self._lock:
+                config = self._env_configs.get(service_name)
+                if config is None:
+                    config = self._env_configs[service_name] = _build_env_config(service_name)
+        return config
+    
+    @property
+    def secrets_backend_available(self) -> bool:
+        """False while a failed secrets backend is negatively cached"""
+        return ASYNC_SECRETS_AVAILABLE and time.monotonic() >= self._backend_retry_at
+    
+    async def get_async(self, service_name: str) -> SimpleServiceConfig:
+        """Secrets-backed config, falling back to the environment config"""
+        config = self._secret_configs.get(service_name)
+        if config is not None:
+            return config
+        if not self.secrets_backend_available:
+            return self.get(service_name)
+        
+        # Concurrent first lookups share one secrets request
+        inflight = self._inflight.get(service_name)
+        if inflight is None:
+            inflight = self._inflight[service_name] = asyncio.ensure_future(
+                self._fetch_secrets(service_name, self._generation))
+            inflight.add_done_callback(lambda done: self._forget_inflight(service_name, done))
+        return await asyncio.shield(inflight)
+    
+    def _forget_inflight(self, service_name: str, done: asyncio.Future):
+        # A reload may already have replaced this fetch with a newer one
+        if self._inflight.get(service_name) is done:
+            del self._inflight[service_name]
+    
+    async def _fetch_secrets(self, service_name: str, generation: int) -> SimpleServiceConfig:
         try:
-            # Try async secrets client
-            async_config = await async_get_service_config(service_name)
-            
-            # Convert to SimpleServiceConfig
-            return SimpleServiceConfig(
-                service_name=service_name,
-                port=async_config.port,
-                database_url=async_config.database_config.get('postgres_url', f'sqlite:///./{service_name}.db'),
-                redis_url=async_config.database_config.get('redis_url', 'redis://localhost:6379'),
-                jwt_secret=async_config.api_keys.get('jwt_secret', f'{service_name}-jwt-secret-dev'),
-                api_key=async_config.api_keys.get('api_key', f'{service_name}-api-key-dev'),
-                openai_api_key=async_config.api_keys.get('openai', ''),
-                anthropic_api_key=async_config.api_keys.get('anthropic', ''),
-            )
+            config = _convert_async_config(service_name, await async_get_service_config(service_name))
         except Exception as e:
-            logger.warning(f"Async secrets management failed, using fallback: {e}")
+            with self._lock:
+                if generation == self._generation:
+                    self._backend_retry_at = time.monotonic() + self.retry_interval
+            logger.warning(f"Async secrets management failed, using fallback for {self.retry_interval:.0f}s: {e}")
+            return self.get(service_name)
+        
+        with self._lock:
+            # A reload while this fetch was in flight makes its result stale
+            if generation == self._generation:
+                self._secret_configs[service_name] = config
+        return config
     
-    # Fallback to synchronous method
-    return get_service_config(service_name)
+    def reload(self):
+        """Drop cached configs (and the secrets backend failure) so the next lookup rebuilds them"""
+        with self._lock:
+            self._generation += 1
+            self._env_configs.clear()
+            self._secret_configs.clear()
+            self._inflight.clear()
+            self._backend_retry_at = 0.0
+        logger.info("Service configuration reloaded")
+        for callback in list(self._reload_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Config reload callback failed: {e}")
+    
+    def on_reload(self, callback: Callable[[], None]):
+        """Register a callback run after every reload"""
+        self._reload_callbacks.append(callback)
+    
+    def enable_hot_reload(self, env_file: Optional[str] = None, interval: float = 2.0,
+                          signal_number: Optional[int] = getattr(signal, 'SIGHUP', None)):
+        """
+        Reload on SIGHUP and/or whenever env_file changes
+        (its KEY=VALUE lines are applied to os.environ first)
+        """
+        if signal_number is not None and threading.current_thread() is threading.main_thread():
+            signal.signal(signal_number, self._on_signal)
+        
+        if env_file and self._watcher is None:
+            if os.path.exists(env_file):
+                _load_env_file(env_file)
+            self._watcher_stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(env_file, interval), name='config-watcher', daemon=True
+            )
+            self._watcher.start()
+    
+    def _on_signal(self, signum, frame):
+        # The signal may land while the main thread holds self._lock (inside get()),
+        # so the reload runs on its own thread instead of in the handler
+        threading.Thread(target=self.reload, name='config-reload', daemon=True).start()
+    
+    def _watch(self, env_file: str, interval: float):
+        def mtime():
+            try:
+                return os.stat(env_file).st_mtime_ns
+            except FileNotFoundError:
+                return None
+        
+        last = mtime()
+        while not self._watcher_stop.wait(interval):
+            current = mtime()
+            if current != last:
+                last = current
+                if current is not None:
+                    _load_env_file(env_file)
+                self.reload()
+    
+    def disable_hot_reload(self):
+        """Stop the env file watcher"""
+        self._watcher_stop.set()
+        if self._watcher:
+            self._watcher.join()
+            self._watcher = None
+
+# Process-wide registry used by the module-level helpers
+config_registry = ConfigRegistry()
+
+def get_service_config(service_name: str) -> SimpleServiceConfig:
+    """
+    Get service configuration using hybrid approach
+    1. Try async secrets management if available
+    2. Fallback to environment variables
+    """
+    return config_registry.get(service_name)
+
+async def get_service_config_async(service_name: str) -> SimpleServiceConfig:
+    """
+    Async version that tries secrets management API first
+    """
+    return await config_registry.get_async(service_name)
+
+def enable_hot_reload(env_file: Optional[str] = None, interval: float = 2.0):
+    """Hot-reload the process-wide registry (SIGHUP and optional env file watch)"""
+    config_registry.enable_hot_reload(env_file, interval)
 
 # Backward compatibility aliases
 def get_config(service_name: str) -> SimpleServiceConfig:
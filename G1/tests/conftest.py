@@ -0,0 +1,6 @@
+"""Make the flat G1 modules importable from the test tree"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
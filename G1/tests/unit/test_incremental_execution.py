@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Step memo keys of persona-driven phases
+"""
+
+import asyncio
+
+import pytest
+
+from incremental_execution import RequirementSlicer, StepMemo, memoized_step
+from pure_persona_driven_orchestrator import PurePersonaDrivenOrchestrator
+
+REQUIREMENT = "Build a secure payment API with a database. Deploy to AWS with monitoring."
+# Only the deployment clause changes: outside the tester's requirement slice
+EDITED_REQUIREMENT = "Build a secure payment API with a database. Deploy to Azure with monitoring."
+
+DISCOVERY = {"phase_name": "Phase 1: Discovery", "personas": ["business-analyst"], "dependencies": []}
+BUILD = {"phase_name": "Phase 2: Build", "personas": ["developer", "tester"], "dependencies": []}
+
+
+class FakePersonaClient:
+    """Persona calls answered from a dict"""
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    async def call_persona(self, persona, prompt, context=None, **kwargs):
+        return {"success": True, "persona": persona, "response": self.responses.get(persona, f"{persona} done")}
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    orchestrator = PurePersonaDrivenOrchestrator(step_memo=StepMemo(str(tmp_path / "memo.db")),
+                                                 workflow_optimizer=None)
+    orchestrator.persona_client = FakePersonaClient({"business-analyst": "Card payments on AWS"})
+    return orchestrator
+
+
+def run_phases(orchestrator, requirement):
+    """Run the phases the way an unoptimized workflow does; returns the recomputed steps"""
+    async def run():
+        with orchestrator.step_memo.workflow() as graph:
+            executed = []
+            for phase in (DISCOVERY, BUILD):
+                await orchestrator.execute_phase(phase, "req-1", requirement, {}, upstream_steps=list(executed))
+                executed.extend(f"{phase['phase_name']}:{p}" for p in phase["personas"])
+            return graph.recomputed
+    return asyncio.run(run())
+
+
+def test_tester_slice_ignores_deployment_edit():
+    slicer = RequirementSlicer()
+    assert slicer.slice(REQUIREMENT, "tester") == slicer.slice(EDITED_REQUIREMENT, "tester")
+
+
+def test_unchanged_workflow_reuses_every_step(orchestrator):
+    assert run_phases(orchestrator, REQUIREMENT) == [
+        "Phase 1: Discovery:business-analyst", "Phase 2: Build:developer", "Phase 2: Build:tester"
+    ]
+    assert run_phases(orchestrator, REQUIREMENT) == []
+
+
+def test_unchanged_upstream_output_keeps_downstream_step(orchestrator):
+    run_phases(orchestrator, REQUIREMENT)
+    recomputed = run_phases(orchestrator, EDITED_REQUIREMENT)
+    assert "Phase 1: Discovery:business-analyst" in recomputed
+    assert "Phase 2: Build:tester" not in recomputed
+
+
+def test_changed_upstream_output_invalidates_downstream_step(orchestrator):
+    run_phases(orchestrator, REQUIREMENT)
+    orchestrator.persona_client.responses["business-analyst"] = "Card payments on Azure"
+    recomputed = run_phases(orchestrator, EDITED_REQUIREMENT)
+    assert "Phase 1: Discovery:business-analyst" in recomputed
+    assert "Phase 2: Build:tester" in recomputed
+
+
+def test_sequential_phase_depends_on_earlier_personas(orchestrator):
+    run_phases(orchestrator, REQUIREMENT)
+    orchestrator.persona_client.responses["developer"] = "Payment API rewritten"
+    recomputed = run_phases(orchestrator, EDITED_REQUIREMENT)
+    assert "Phase 2: Build:developer" in recomputed
+    assert "Phase 2: Build:tester" in recomputed
+
+
+ANALYSIS = ("The payment service exposes a REST API for card payments, stores transactions "
+            "in PostgreSQL and publishes settlement events for reconciliation.")
+
+
+def run_analysis(memo, requirement, architecture, analysis=ANALYSIS):
+    """One workflow: a design step for `architecture`, then an analysis step answering `analysis`"""
+    async def run():
+        with memo.workflow() as graph:
+            async def design():
+                return {"response": f"{architecture} design"}
+
+            async def analyze():
+                return {"response": analysis}
+
+            await memoized_step("design", design, persona="solution-architect",
+                                requirement=requirement, inputs=architecture)
+            await memoized_step("analysis", analyze, persona="business-analyst",
+                                requirement=requirement, depends_on=["design"])
+            return graph
+    return asyncio.run(run())
+
+
+def test_early_cutoff_keeps_digest_within_lineage(tmp_path):
+    pytest.importorskip("numpy")
+    memo = StepMemo(str(tmp_path / "memo.db"), early_cutoff=True)
+    first = run_analysis(memo, REQUIREMENT, "Monolith")
+    second = run_analysis(memo, REQUIREMENT, "Microservices", ANALYSIS + " Refunds are manual.")
+    assert second.recomputed == ["design", "analysis"]
+    assert second.stats["cutoffs"] == 1
+    assert second.digests["analysis"] == first.digests["analysis"]
+
+
+def test_early_cutoff_ignores_other_requirements(tmp_path):
+    pytest.importorskip("numpy")
+    memo = StepMemo(str(tmp_path / "memo.db"), early_cutoff=True)
+    other = run_analysis(memo, "Build an internal reporting dashboard.", "Monolith")
+    fresh = run_analysis(memo, REQUIREMENT, "Monolith", ANALYSIS + " Refunds are manual.")
+    assert fresh.stats["cutoffs"] == 0
+    assert fresh.digests["analysis"] != other.digests["analysis"]
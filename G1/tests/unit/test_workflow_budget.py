@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Workflow usage accounting
+"""
+
+from workflow_budget import STATE_NORMAL, BYTES_PER_TOKEN, WorkflowBudget, WorkflowUsage
+
+PAYLOAD = {"query": "Design the payment API " * 50, "parameters": {"max_tokens": 2000}}
+
+
+def test_successful_call_without_reported_usage_is_estimated():
+    usage = WorkflowUsage("wf-1", WorkflowBudget(max_tokens=10000))
+    record = usage.record("developer", PAYLOAD, {"success": True, "response": "x" * 400})
+    assert record.estimated and not record.failed
+    assert record.completion_tokens == 400 // BYTES_PER_TOKEN
+    assert usage.tokens == record.total_tokens > 0
+
+
+def test_failed_calls_are_counted_but_not_charged():
+    usage = WorkflowUsage("wf-1", WorkflowBudget(max_tokens=100, max_cost=0.001))
+    for _ in range(20):
+        usage.record("developer", PAYLOAD, {"success": False, "error": "Cannot connect to host"})
+    summary = usage.summary()
+    assert summary["failed"] == 20
+    assert summary["total_tokens"] == 0 and summary["cost_usd"] == 0
+    assert summary["estimated_calls"] == 0
+    assert usage.state == STATE_NORMAL
+    assert not usage.plan_call("developer").degraded
+
+
+def test_failed_call_with_reported_usage_is_charged():
+    usage = WorkflowUsage("wf-1")
+    usage.record("developer", PAYLOAD, {
+        "success": False, "error": "HTTP 500",
+        "raw_result": {"usage": {"prompt_tokens": 120, "completion_tokens": 0}}
+    })
+    summary = usage.summary()
+    assert summary["failed"] == 1 and summary["prompt_tokens"] == 120
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Critical-path analysis of recorded workflow traces
+"""
+
+from datetime import datetime, timedelta
+
+from workflow_critical_path import CriticalPathAnalyzer, TraceStep, steps_from_trace_log
+
+T0 = datetime(2025, 8, 27, 12, 0, 0)
+
+
+def entry(step, persona, end, execution_time, input_text="", output_text=""):
+    return {
+        "step": step,
+        "persona": persona,
+        "timestamp": (T0 + timedelta(seconds=end)).isoformat(),
+        "execution_time": execution_time,
+        "input": input_text,
+        "output": output_text
+    }
+
+
+def test_sequential_handoff_is_a_dependency():
+    steps = steps_from_trace_log([
+        entry(1, "Tester", end=10, execution_time=1),
+        entry(2, "Validator", end=16, execution_time=5, input_text="handoff to tester results"),
+    ])
+    assert steps[1].depends_on == [steps[0].step_id]
+
+    report = CriticalPathAnalyzer().analyze(steps)
+    assert report["critical_path"] == ["Tester", "Validator"]
+    assert report["critical_path_length"] == 6
+
+
+def test_overlapping_steps_are_not_dependencies():
+    # Validator ran 6s..11s, so it cannot have consumed Tester's output (9s..10s)
+    steps = steps_from_trace_log([
+        entry(1, "Tester", end=10, execution_time=1),
+        entry(2, "Validator", end=11, execution_time=5, input_text="handoff to tester results"),
+    ])
+    assert steps[1].depends_on == []
+
+    report = CriticalPathAnalyzer().analyze(steps)
+    assert report["critical_path"] == ["Validator"]
+    assert report["critical_path_length"] == 5
+
+
+def test_dependencies_resolve_regardless_of_start_order():
+    # A dependency that started later than its dependent (e.g. hand-built steps)
+    steps = [
+        TraceStep("b", "Builder", start=0.0, end=4.0, depends_on=["a"]),
+        TraceStep("a", "Analyst", start=1.0, end=2.0),
+    ]
+    report = CriticalPathAnalyzer().analyze(steps)
+    assert report["critical_path"] == ["Analyst", "Builder"]
+    assert report["critical_path_length"] == 5
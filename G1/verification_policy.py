@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Verification Policy
+===================
+
+Decides per persona-to-persona handoff whether the read-back verification (and
+the collaborative handoff that follows it) is worth its gateway calls.
+
+Signals:
+- Requirement risk and complexity scores (requirement_classifier)
+- Historical verification pass rate of the persona pair
+- Output-size delta: a downstream output much smaller than its upstream input
+  suggests information loss
+
+Decisions:
+- "full": always verify (high risk, little history, poor pass rate, size drop)
+- "sample": verify a deterministic fraction of low-risk handoffs
+- "skip": trust the handoff without extra calls
+
+Pass-rate history can be persisted to JSON so it carries across runs
+(G1_VERIFICATION_HISTORY).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DECISION_FULL = "full"
+DECISION_SAMPLE = "sample"
+DECISION_SKIP = "skip"
+
+
+@dataclass
+class VerificationDecision:
+    """Outcome of the policy for one handoff"""
+    action: str
+    reason: str
+    pass_rate: Optional[float] = None
+    observations: int = 0
+    size_ratio: Optional[float] = None
+
+    @property
+    def verify(self) -> bool:
+        return self.action != DECISION_SKIP
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class VerificationPolicy:
+    """Risk- and history-aware verification sampling for persona handoffs"""
+
+    def __init__(self, risk_threshold: float = 7.0, complexity_threshold: float = 8.0,
+                 min_observations: int = 5, min_pass_rate: float = 0.9,
+                 min_size_ratio: float = 0.25, sample_rate: float = 0.2,
+                 history_path: Optional[str] = None):
+        self.risk_threshold = risk_threshold
+        self.complexity_threshold = complexity_threshold
+        self.min_observations = min_observations
+        self.min_pass_rate = min_pass_rate
+        self.min_size_ratio = min_size_ratio
+        self.sample_rate = sample_rate
+        self.history_path = history_path if history_path is not None else os.getenv("G1_VERIFICATION_HISTORY")
+
+        # "upstream→downstream" -> {"passed": n, "total": n}
+        self.history: Dict[str, Dict[str, int]] = {}
+        self.stats = {DECISION_FULL: 0, DECISION_SAMPLE: 0, DECISION_SKIP: 0}
+        if self.history_path:
+            self._load()
+
+    @staticmethod
+    def _pair(upstream_persona: str, downstream_persona: str) -> str:
+        return f"{upstream_persona}→{downstream_persona}"
+
+    def _load(self):
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as f:
+                self.history = json.load(f)
+            logger.info(f"📈 Loaded verification history for {len(self.history)} persona pairs")
+        except FileNotFoundError:
+            self.history = {}
+
+    def save(self):
+        """Persist pass-rate history (no-op without a history path)"""
+        if not self.history_path:
+            return
+        with open(self.history_path, "w", encoding="utf-8") as f:
+            json.dump(self.history, f, indent=2, ensure_ascii=False)
+
+    def pass_rate(self, upstream_persona: str, downstream_persona: str) -> Optional[float]:
+        entry = self.history.get(self._pair(upstream_persona, downstream_persona))
+        if not entry or not entry["total"]:
+            return None
+        return entry["passed"] / entry["total"]
+
+    def decide(self, requirement_id: str, upstream_persona: str, downstream_persona: str,
+               upstream_output: str, downstream_output: str,
+               risk_score: float = 0.0, complexity_score: float = 0.0) -> VerificationDecision:
+        """Choose full verification, sampling or skipping for one handoff"""
+        entry = self.history.get(self._pair(upstream_persona, downstream_persona), {"passed": 0, "total": 0})
+        pass_rate = self.pass_rate(upstream_persona, downstream_persona)
+        size_ratio = len(downstream_output) / len(upstream_output) if upstream_output else None
+
+        def decision(action: str, reason: str) -> VerificationDecision:
+            self.stats[action] += 1
+            return VerificationDecision(action, reason, pass_rate, entry["total"], size_ratio)
+
+        if risk_score >= self.risk_threshold:
+            return decision(DECISION_FULL, f"risk score {risk_score} >= {self.risk_threshold}")
+        if complexity_score >= self.complexity_threshold:
+            return decision(DECISION_FULL, f"complexity score {complexity_score} >= {self.complexity_threshold}")
+        if entry["total"] < self.min_observations:
+            return decision(DECISION_FULL, f"only {entry['total']} past verifications for this pair")
+        if pass_rate < self.min_pass_rate:
+            return decision(DECISION_FULL, f"pass rate {pass_rate:.2f} < {self.min_pass_rate}")
+        if size_ratio is not None and size_ratio < self.min_size_ratio:
+            return decision(DECISION_FULL, f"output shrank to {size_ratio:.2f}x of upstream")
+
+        # Deterministic sampling so replayed workflows make the same choices
+        digest = hashlib.sha256(f"{requirement_id}:{upstream_persona}:{downstream_persona}".encode("utf-8")).digest()
+        if int.from_bytes(digest[:8], "big") / 2 ** 64 < self.sample_rate:
+            return decision(DECISION_SAMPLE, f"sampled low-risk handoff ({self.sample_rate:.0%})")
+        return decision(DECISION_SKIP, f"low risk, pass rate {pass_rate:.2f} over {entry['total']} handoffs")
+
+    def record(self, upstream_persona: str, downstream_persona: str, verified: bool):
+        """Feed a verification outcome back into the pair history"""
+        entry = self.history.setdefault(self._pair(upstream_persona, downstream_persona), {"passed": 0, "total": 0})
+        entry["total"] += 1
+        entry["passed"] += 1 if verified else 0
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Durable Work Queue
+==================
+
+Embedded, persistent work queue for requirement intake and persona tasks,
+stored in SQLite (WAL mode) so queued work survives restarts.
+
+Semantics:
+- Priority lanes (critical, high, medium, low); FIFO within a lane
+- At-least-once delivery: a dequeued item is leased for a visibility timeout
+  and becomes visible again unless it is acked in time
+- nack() re-queues with an optional delay; items that exceed max_attempts
+  move to the dead-letter state
+- Any number of consumers (tasks or processes) can dequeue concurrently;
+  claims are atomic under SQLite's write lock
+
+consume() runs N concurrent consumers for an async handler and extends the
+lease while the handler is running. serve_requirements() feeds queued
+requirements into DynamicWorkflowOrchestrator.process_requirement, reusing the
+queued workflow_id so a redelivered requirement resumes from its checkpoints.
+
+Configuration (environment):
+- G1_WORK_QUEUE_DB: path of the SQLite queue database
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+QUEUE_REQUIREMENTS = "requirements"
+QUEUE_PERSONA_TASKS = "persona_tasks"
+
+# Lane names follow RequirementPriority values; lower number is served first
+PRIORITY_LANES = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+DEFAULT_LANE = "medium"
+
+STATUS_READY = "ready"
+STATUS_LEASED = "leased"
+STATUS_DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    lane INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    visible_at REAL NOT NULL,
+    lease_token TEXT,
+    consumer TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS work_items_claim ON work_items (queue, status, lane, visible_at, id);
+"""
+
+
+@dataclass
+class WorkItem:
+    """A leased queue item; ack/nack it with the queue that returned it"""
+    id: int
+    queue: str
+    lane: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: str
+
+
+class DurableWorkQueue:
+    """SQLite-backed work queue with leases, priority lanes and dead-lettering"""
+
+    def __init__(self, path: str = "queues/work_queue.db", visibility_timeout: float = 300.0,
+                 max_attempts: int = 5):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        # Manual transactions (BEGIN IMMEDIATE) so a claim is atomic across processes
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> "DurableWorkQueue":
+        return cls(os.getenv("G1_WORK_QUEUE_DB", "queues/work_queue.db"))
+
+    @staticmethod
+    def _lane(priority: Optional[str]) -> int:
+        lane = PRIORITY_LANES.get((priority or DEFAULT_LANE).lower())
+        if lane is None:
+            raise ValueError(f"Unknown priority lane {priority!r} (expected one of {list(PRIORITY_LANES)})")
+        return lane
+
+    def enqueue(self, queue: str, payload: Dict[str, Any], priority: Optional[str] = None,
+                delay: float = 0.0) -> int:
+        """Add one item; returns its id"""
+        return self.enqueue_many(queue, [payload], priority, delay)[0]
+
+    def enqueue_many(self, queue: str, payloads: List[Dict[str, Any]], priority: Optional[str] = None,
+                     delay: float = 0.0) -> List[int]:
+        """Add a burst of items in a single transaction"""
+        lane = self._lane(priority)
+        now = time.time()
+        ids = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for payload in payloads:
+                    cursor = self._conn.execute(
+                        "INSERT INTO work_items (queue, lane, payload, status, visible_at, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (queue, lane, json.dumps(payload, default=str), STATUS_READY, now + delay, now)
+                    )
+                    ids.append(cursor.lastrowid)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def dequeue(self, queue: str, consumer: Optional[str] = None,
+                visibility_timeout: Optional[float] = None) -> Optional[WorkItem]:
+        """Lease the next visible item (highest lane first), or None when the queue is empty"""
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    # Expired leases are visible again
+                    row = self._conn.execute(
+                        "SELECT id, lane, payload, attempts FROM work_items "
+                        "WHERE queue = ? AND status IN (?, ?) AND visible_at <= ? "
+                        "ORDER BY lane, id LIMIT 1",
+                        (queue, STATUS_READY, STATUS_LEASED, now)
+                    ).fetchone()
+                    if row is None:
+                        self._conn.execute("COMMIT")
+                        return None
+
+                    item_id, lane, payload, attempts = row
+                    if attempts >= self.max_attempts:
+                        self._conn.execute(
+                            "UPDATE work_items SET status = ?, lease_token = NULL, "
+                            "last_error = COALESCE(last_error, 'lease expired') WHERE id = ?",
+                            (STATUS_DEAD, item_id)
+                        )
+                        logger.warning(f"☠️ Work item {item_id} dead-lettered after {attempts} attempts")
+                        continue
+
+                    self._conn.execute(
+                        "UPDATE work_items SET status = ?, attempts = attempts + 1, visible_at = ?, "
+                        "lease_token = ?, consumer = ? WHERE id = ?",
+                        (STATUS_LEASED, now + timeout, token, consumer, item_id)
+                    )
+                    self._conn.execute("COMMIT")
+                    break
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        lane_name = next(name for name, number in PRIORITY_LANES.items() if number == lane)
+        return WorkItem(item_id, queue, lane_name, json.loads(payload), attempts + 1, token)
+
+    def _update_leased(self, item: WorkItem, sql: str, params: tuple) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(sql + " WHERE id = ? AND lease_token = ?", params + (item.id, item.lease_token))
+        if cursor.rowcount == 0:
+            logger.warning(f"⚠️ Lease on work item {item.id} was lost (expired and re-delivered)")
+            return False
+        return True
+
+    def ack(self, item: WorkItem) -> bool:
+        """Mark the item done; False if the lease had already expired"""
+        return self._update_leased(item, "DELETE FROM work_items", ())
+
+    def nack(self, item: WorkItem, error: Optional[str] = None, delay: float = 0.0) -> bool:
+        """Return the item to its lane (or dead-letter it after max_attempts)"""
+        status = STATUS_DEAD if item.attempts >= self.max_attempts else STATUS_READY
+        if status == STATUS_DEAD:
+            logger.warning(f"☠️ Work item {item.id} dead-lettered after {item.attempts} attempts: {error}")
+        return self._update_leased(
+            item,
+            "UPDATE work_items SET status = ?, visible_at = ?, lease_token = NULL, last_error = ?",
+            (status, time.time() + delay, error)
+        )
+
+    def extend(self, item: WorkItem, seconds: Optional[float] = None) -> bool:
+        """Push the lease deadline out while the item is still being worked on"""
+        timeout = self.visibility_timeout if seconds is None else seconds
+        return self._update_leased(item, "UPDATE work_items SET visible_at = ?", (time.time() + timeout,))
+
+    def requeue_dead(self, queue: str) -> int:
+        """Give dead-lettered items a fresh set of attempts"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_items SET status = ?, attempts = 0, visible_at = ? WHERE queue = ? AND status = ?",
+                (STATUS_READY, time.time(), queue, STATUS_DEAD)
+            )
+        return cursor.rowcount
+
+    def stats(self, queue: str) -> Dict[str, Any]:
+        """Item counts by status and by lane"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, lane, COUNT(*) FROM work_items WHERE queue = ? GROUP BY status, lane", (queue,)
+            ).fetchall()
+        lanes = {number: name for name, number in PRIORITY_LANES.items()}
+        stats = {"queue": queue, STATUS_READY: 0, STATUS_LEASED: 0, STATUS_DEAD: 0,
+                 "lanes": {name: 0 for name in PRIORITY_LANES}}
+        for status, lane, count in rows:
+            stats[status] += count
+            if status != STATUS_DEAD:
+                stats["lanes"][lanes[lane]] += count
+        return stats
+
+    async def consume(self, queue: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+                      concurrency: int = 4, poll_interval: float = 0.5,
+                      stop: Optional[asyncio.Event] = None, drain: bool = False) -> Dict[str, int]:
+        """Run concurrent consumers until stop is set (or, with drain, until the queue is empty)"""
+        stop = stop or asyncio.Event()
+        loop = asyncio.get_running_loop()
+        counts = {"acked": 0, "nacked": 0}
+
+        async def keep_leased(item: WorkItem):
+            while True:
+                await asyncio.sleep(self.visibility_timeout / 2)
+                await loop.run_in_executor(None, self.extend, item)
+
+        async def consumer(index: int):
+            name = f"{os.getpid()}-{index}"
+            while not stop.is_set():
+                item = await loop.run_in_executor(None, self.dequeue, queue, name)
+                if item is None:
+                    if drain:
+                        return
+                    await asyncio.sleep(poll_interval)
+                    continue
+
+                heartbeat = asyncio.ensure_future(keep_leased(item))
+                try:
+                    await handler(item.payload)
+                except Exception as e:
+                    logger.error(f"❌ Work item {item.id} failed (attempt {item.attempts}): {e}")
+                    await loop.run_in_executor(None, self.nack, item, str(e))
+                    counts["nacked"] += 1
+                else:
+                    await loop.run_in_executor(None, self.ack, item)
+                    counts["acked"] += 1
+                finally:
+                    heartbeat.cancel()
+
+        await asyncio.gather(*(consumer(i) for i in range(concurrency)))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def enqueue_requirement(work_queue: DurableWorkQueue, user_input: str,
+                        context: Optional[Dict[str, Any]] = None,
+                        priority: Optional[str] = None) -> str:
+    """Queue a requirement for processing; the lane defaults to its classified priority"""
+    if priority is None:
+        from requirement_classifier import get_classifier
+        priority = get_classifier().classify(user_input).priority
+
+    workflow_id = str(uuid.uuid4())
+    work_queue.enqueue(QUEUE_REQUIREMENTS, {
+        "workflow_id": workflow_id,
+        "user_input": user_input,
+        "context": context or {}
+    }, priority)
+    return workflow_id
+
+
+async def serve_requirements(orchestrator, work_queue: DurableWorkQueue, concurrency: int = 4,
+                             stop: Optional[asyncio.Event] = None, drain: bool = False) -> Dict[str, int]:
+    """Process queued requirements with a DynamicWorkflowOrchestrator"""
+
+    async def handle(payload: Dict[str, Any]):
+        result = await orchestrator.process_requirement(
+            payload["user_input"], payload["context"], workflow_id=payload["workflow_id"]
+        )
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "workflow failed"))
+
+    return await work_queue.consume(QUEUE_REQUIREMENTS, handle, concurrency, stop=stop, drain=drain)
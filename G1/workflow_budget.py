@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Workflow Budget
+===============
+
+Token and cost accounting per workflow, phase and persona, with enforceable
+per-workflow budgets.
+
+Every persona call made inside a usage scope is recorded: request/response
+bytes and the token usage reported by the Personas Gateway ("usage" with
+prompt/completion or input/output tokens). When the gateway reports no usage,
+tokens of successful calls are estimated at BYTES_PER_TOKEN bytes per token.
+Failed calls (transport errors, HTTP errors, cassette misses) are counted as
+failed and only charged for the usage the gateway reported, so an unreachable
+gateway does not use up the budget.
+
+    usage = WorkflowUsage(workflow_id, WorkflowBudget(max_tokens=50000))
+    with usage_scope(usage):
+        with usage_phase("testing"):
+            await client.call_persona(...)
+    usage.summary()  # totals, cost, by_phase, by_persona
+
+Graceful degradation as a workflow approaches its budget:
+- From `degrade_at` (share of the token or cost budget used): optional personas
+  (metrics, verification) are skipped, required personas get a shortened context
+  and a smaller completion limit
+- Once exhausted: required personas run with the minimum context and completion
+  limit, or raise BudgetExceededError when the budget is hard
+
+Configuration (environment):
+- G1_MAX_TOKENS: completion token limit per persona call (default 2000)
+- G1_WORKFLOW_TOKEN_BUDGET: tokens one workflow may use
+- G1_WORKFLOW_COST_BUDGET: cost in USD one workflow may use
+- G1_PROMPT_COST_PER_1K / G1_COMPLETION_COST_PER_1K: token prices (default 0.003 / 0.015)
+- G1_BUDGET_DEGRADE_AT: used share at which degradation starts (default 0.8)
+- G1_BUDGET_HARD: "1" fails required calls once the budget is exhausted
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterator
+
+from persona_catalog import get_persona_catalog
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_TOKEN = 4
+
+# Personas a workflow can complete without
+OPTIONAL_CAPABILITIES = frozenset({"metrics", "verification"})
+
+# Context string limits (characters) when degraded / exhausted
+DEGRADED_CONTEXT_CHARS = 2000
+MINIMAL_CONTEXT_CHARS = 500
+MIN_COMPLETION_TOKENS = 256
+
+STATE_NORMAL = "normal"
+STATE_DEGRADED = "degraded"
+STATE_EXHAUSTED = "exhausted"
+
+_current_usage: contextvars.ContextVar = contextvars.ContextVar("g1_workflow_usage", default=None)
+_current_phase: contextvars.ContextVar = contextvars.ContextVar("g1_usage_phase", default=None)
+
+
+def default_max_tokens() -> int:
+    return int(os.getenv("G1_MAX_TOKENS", "2000"))
+
+
+def is_optional_persona(persona_name: str) -> bool:
+    spec = get_persona_catalog().find(persona_name)
+    return spec is not None and bool(OPTIONAL_CAPABILITIES.intersection(spec.capabilities))
+
+
+def shorten_context(value: Any, max_chars: int) -> Any:
+    """Copy of a context with every string longer than max_chars truncated"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + " …[truncated]"
+    if isinstance(value, dict):
+        return {k: shorten_context(v, max_chars) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [shorten_context(v, max_chars) for v in value]
+    return value
+
+
+class BudgetExceededError(RuntimeError):
+    """A hard workflow budget was exhausted"""
+
+
+@dataclass
+class WorkflowBudget:
+    """Per-workflow limits and token prices"""
+    max_tokens: Optional[int] = None
+    max_cost: Optional[float] = None
+    prompt_cost_per_1k: float = 0.003
+    completion_cost_per_1k: float = 0.015
+    degrade_at: float = 0.8
+    hard: bool = False
+
+    @classmethod
+    def from_env(cls) -> "WorkflowBudget":
+        tokens = os.getenv("G1_WORKFLOW_TOKEN_BUDGET")
+        cost = os.getenv("G1_WORKFLOW_COST_BUDGET")
+        return cls(
+            max_tokens=int(tokens) if tokens else None,
+            max_cost=float(cost) if cost else None,
+            prompt_cost_per_1k=float(os.getenv("G1_PROMPT_COST_PER_1K", "0.003")),
+            completion_cost_per_1k=float(os.getenv("G1_COMPLETION_COST_PER_1K", "0.015")),
+            degrade_at=float(os.getenv("G1_BUDGET_DEGRADE_AT", "0.8")),
+            hard=os.getenv("G1_BUDGET_HARD", "0") == "1"
+        )
+
+    @property
+    def limited(self) -> bool:
+        return self.max_tokens is not None or self.max_cost is not None
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt_cost_per_1k + completion_tokens * self.completion_cost_per_1k) / 1000
+
+
+@dataclass
+class UsageRecord:
+    """Accounting for one persona call"""
+    persona: str
+    phase: str
+    request_bytes: int = 0
+    response_bytes: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    estimated: bool = False
+    degraded: bool = False
+    skipped: bool = False
+    failed: bool = False
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class CallPlan:
+    """How a persona call should run under the current budget"""
+    max_tokens: int
+    context_chars: Optional[int] = None
+    skip: bool = False
+    reason: str = ""
+
+    @property
+    def degraded(self) -> bool:
+        return self.context_chars is not None
+
+
+def _usage_tokens(api_result: Dict[str, Any]) -> Optional[tuple]:
+    """(prompt, completion) tokens reported by the gateway, if any"""
+    raw = api_result.get("raw_result")
+    usage = raw.get("usage") if isinstance(raw, dict) else None
+    if not isinstance(usage, dict):
+        return None
+    prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt is None and completion is None:
+        return None
+    return int(prompt or 0), int(completion or 0)
+
+
+class WorkflowUsage:
+    """Token, byte and cost totals of one workflow, enforcing its budget"""
+
+    def __init__(self, workflow_id: str, budget: Optional[WorkflowBudget] = None):
+        self.workflow_id = workflow_id
+        self.budget = budget or WorkflowBudget()
+        self.records: List[UsageRecord] = []
+        self._lock = threading.Lock()
+        self.tokens = 0
+        self.cost = 0.0
+
+    def used_share(self) -> float:
+        """Largest used fraction of the token or cost budget"""
+        shares = [0.0]
+        if self.budget.max_tokens:
+            shares.append(self.tokens / self.budget.max_tokens)
+        if self.budget.max_cost:
+            shares.append(self.cost / self.budget.max_cost)
+        return max(shares)
+
+    @property
+    def state(self) -> str:
+        if not self.budget.limited:
+            return STATE_NORMAL
+        share = self.used_share()
+        if share >= 1.0:
+            return STATE_EXHAUSTED
+        if share >= self.budget.degrade_at:
+            return STATE_DEGRADED
+        return STATE_NORMAL
+
+    def plan_call(self, persona_name: str) -> CallPlan:
+        """Completion limit, context limit or skip for the next call of a persona"""
+        max_tokens = default_max_tokens()
+        state = self.state
+        if state == STATE_NORMAL:
+            if self.budget.max_tokens:
+                max_tokens = max(min(max_tokens, self.budget.max_tokens - self.tokens), MIN_COMPLETION_TOKENS)
+            return CallPlan(max_tokens)
+
+        if is_optional_persona(persona_name):
+            return CallPlan(0, skip=True, reason=f"workflow budget {state}")
+        if state == STATE_EXHAUSTED:
+            if self.budget.hard:
+                raise BudgetExceededError(
+                    f"Workflow {self.workflow_id} exhausted its budget "
+                    f"({self.tokens} tokens, ${self.cost:.4f}) before {persona_name}"
+                )
+            return CallPlan(MIN_COMPLETION_TOKENS, MINIMAL_CONTEXT_CHARS, reason="workflow budget exhausted")
+
+        if self.budget.max_tokens:
+            max_tokens = min(max_tokens, (self.budget.max_tokens - self.tokens) // 2)
+        else:
+            max_tokens //= 2
+        return CallPlan(max(max_tokens, MIN_COMPLETION_TOKENS), DEGRADED_CONTEXT_CHARS,
+                        reason="workflow budget degraded")
+
+    def record(self, persona_name: str, payload: Dict[str, Any], api_result: Dict[str, Any],
+               phase: Optional[str] = None, degraded: bool = False) -> UsageRecord:
+        """Account one gateway call (successful or not)"""
+        request_bytes = len(json.dumps(payload, default=str).encode("utf-8"))
+        response_bytes = len(str(api_result.get("response", "")).encode("utf-8"))
+        succeeded = bool(api_result.get("success"))
+        reported = _usage_tokens(api_result)
+        if reported is not None:
+            prompt, completion = reported
+        elif succeeded:
+            prompt, completion = request_bytes // BYTES_PER_TOKEN, response_bytes // BYTES_PER_TOKEN
+        else:
+            # Nothing ran that we know of: no charge
+            prompt, completion = 0, 0
+
+        record = UsageRecord(persona_name, phase or current_phase(), request_bytes, response_bytes,
+                             prompt, completion, self.budget.cost(prompt, completion),
+                             estimated=reported is None and succeeded, degraded=degraded,
+                             failed=not succeeded)
+        with self._lock:
+            self.records.append(record)
+            self.tokens += record.total_tokens
+            self.cost += record.cost
+        return record
+
+    def record_skip(self, persona_name: str, phase: Optional[str] = None):
+        with self._lock:
+            self.records.append(UsageRecord(persona_name, phase or current_phase(), skipped=True))
+
+    @staticmethod
+    def _totals(records: List[UsageRecord]) -> Dict[str, Any]:
+        return {
+            "calls": sum(1 for r in records if not r.skipped),
+            "skipped": sum(1 for r in records if r.skipped),
+            "failed": sum(1 for r in records if r.failed),
+            "degraded": sum(1 for r in records if r.degraded),
+            "request_bytes": sum(r.request_bytes for r in records),
+            "response_bytes": sum(r.response_bytes for r in records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "total_tokens": sum(r.total_tokens for r in records),
+            "estimated_calls": sum(1 for r in records if r.estimated and not r.skipped),
+            "cost_usd": round(sum(r.cost for r in records), 6)
+        }
+
+    def _grouped(self, key: str) -> Dict[str, Dict[str, Any]]:
+        groups: Dict[str, List[UsageRecord]] = {}
+        for record in self.records:
+            groups.setdefault(getattr(record, key), []).append(record)
+        return {name: self._totals(records) for name, records in groups.items()}
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = self._totals(self.records)
+            summary["by_phase"] = self._grouped("phase")
+            summary["by_persona"] = self._grouped("persona")
+        summary["budget"] = {
+            "max_tokens": self.budget.max_tokens,
+            "max_cost_usd": self.budget.max_cost,
+            "used_share": round(self.used_share(), 3),
+            "state": self.state
+        }
+        return summary
+
+
+def current_usage() -> Optional[WorkflowUsage]:
+    return _current_usage.get()
+
+
+def current_phase() -> str:
+    return _current_phase.get() or "unphased"
+
+
+@contextmanager
+def usage_scope(usage: WorkflowUsage) -> Iterator[WorkflowUsage]:
+    """Account every persona call made in this context (and tasks it starts) to `usage`"""
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+@contextmanager
+def usage_phase(phase: str) -> Iterator[None]:
+    """Attribute calls made in this context to a workflow phase"""
+    token = _current_phase.set(phase)
+    try:
+        yield
+    finally:
+        _current_phase.reset(token)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Workflow Checkpoints
+====================
+
+Durable per-step checkpoints for long-running workflows, stored in a local
+SQLite database keyed by workflow id.
+
+Each completed persona step is written as soon as it finishes, so a crashed or
+partially failed workflow can be resumed: completed steps are restored from
+the database and only the remaining ones are executed again.
+
+Configuration (environment):
+- G1_CHECKPOINT_DB: path of the SQLite checkpoint database (enables checkpointing)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflows (
+    workflow_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    workflow_id TEXT NOT NULL,
+    step_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (workflow_id, step_key)
+);
+"""
+
+
+class WorkflowCheckpointStore:
+    """SQLite-backed store of workflow inputs and completed step results"""
+
+    def __init__(self, path: str = "checkpoints/workflow_checkpoints.db"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["WorkflowCheckpointStore"]:
+        """Store configured from G1_CHECKPOINT_DB, if set"""
+        path = os.getenv("G1_CHECKPOINT_DB")
+        return cls(path) if path else None
+
+    def save_workflow(self, workflow_id: str, kind: str, payload: Dict[str, Any]):
+        """Record (or re-open) a workflow with the inputs needed to resume it"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workflows (workflow_id, kind, payload, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(workflow_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at",
+                (workflow_id, kind, json.dumps(payload, default=str), STATUS_RUNNING, now, now)
+            )
+
+    def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, payload, status, created_at, updated_at FROM workflows WHERE workflow_id = ?",
+                (workflow_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "workflow_id": workflow_id,
+            "kind": row[0],
+            "payload": json.loads(row[1]),
+            "status": row[2],
+            "created_at": row[3],
+            "updated_at": row[4]
+        }
+
+    def set_status(self, workflow_id: str, status: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE workflows SET status = ?, updated_at = ? WHERE workflow_id = ?",
+                (status, datetime.now().isoformat(), workflow_id)
+            )
+
+    def save_step(self, workflow_id: str, step_key: str, result: Any):
+        """Persist a completed step; re-running a step overwrites its checkpoint"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steps (workflow_id, step_key, seq, result, created_at) "
+                "VALUES (?, ?, (SELECT COUNT(*) FROM steps WHERE workflow_id = ?), ?, ?)",
+                (workflow_id, step_key, workflow_id, json.dumps(result, default=str), datetime.now().isoformat())
+            )
+
+    def load_steps(self, workflow_id: str) -> Dict[str, Any]:
+        """Completed step results in completion order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT step_key, result FROM steps WHERE workflow_id = ? ORDER BY seq",
+                (workflow_id,)
+            ).fetchall()
+        return {step_key: json.loads(result) for step_key, result in rows}
+
+    def list_workflows(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Workflows known to the store, e.g. the ones still running/failed to resume"""
+        query = "SELECT workflow_id, kind, status, updated_at FROM workflows"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY updated_at", params).fetchall()
+        return [{"workflow_id": r[0], "kind": r[1], "status": r[2], "updated_at": r[3]} for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
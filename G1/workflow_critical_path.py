@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Workflow Critical-Path Analyzer
+===============================
+
+Offline analysis of recorded workflow traces. Reconstructs the step timeline,
+infers which steps actually consumed each other's outputs, and reports:
+
+- The critical path (longest dependency chain) through the workflow
+- Per-step slack against that critical path
+- Serial steps that could have overlapped (no dependency between them)
+- The theoretical speedup if independent steps were parallelized
+
+Supported inputs:
+- Trace logs written by WorkflowTracer / WebsiteWorkflowValidator
+  (workflow_trace_log.json, complex_website_workflow_trace.json)
+- JSONL span files written by workflow_tracing.FileSpanExporter
+
+Usage:
+    python workflow_critical_path.py [trace_file ...]
+"""
+
+import heapq
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+# Word shingle length used to detect an upstream output quoted in a downstream input
+SHINGLE_SIZE = 8
+
+# Clock tolerance (seconds) when comparing one step's end with another's start
+TIME_EPSILON = 1e-6
+
+
+@dataclass
+class TraceStep:
+    """A single timed step reconstructed from a trace"""
+    step_id: str
+    name: str
+    start: float
+    end: float
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return max(self.end - self.start, 0.0)
+
+
+def _base_persona_label(label: str) -> str:
+    """'Interface Validator (Dev→Test)' -> 'interface validator'"""
+    return re.sub(r"\(.*?\)", "", label).strip().lower().replace("-", " ").replace("_", " ")
+
+
+def _shingles(text: str) -> Set[str]:
+    words = text.lower().split()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(len(words) - SHINGLE_SIZE + 1, 0))}
+
+
+def steps_from_trace_log(entries: List[Dict[str, Any]]) -> List[TraceStep]:
+    """Build steps from a recorded trace log (timestamps are logged at step end)"""
+    steps = []
+    produced = []  # (step, base label, shingles the step produced that were not in its input)
+
+    for entry in sorted(entries, key=lambda e: e.get("step", 0)):
+        end = datetime.fromisoformat(entry["timestamp"]).timestamp()
+        step = TraceStep(
+            step_id=f"{entry.get('step')}:{entry['persona']}",
+            name=entry["persona"],
+            start=end - float(entry.get("execution_time", 0)),
+            end=end
+        )
+        step_input = entry.get("input", "")
+        input_lower = step_input.lower().replace("-", " ").replace("_", " ")
+        input_shingles = _shingles(step_input)
+
+        # A step depends on an earlier one when it names that persona or quotes
+        # content that persona produced (rather than the shared requirement text),
+        # and only if that step had finished when this one started
+        for earlier, label, novel_shingles in produced:
+            if earlier.end > step.start + TIME_EPSILON:
+                continue
+            if label and label in input_lower:
+                step.depends_on.append(earlier.step_id)
+            elif novel_shingles & input_shingles:
+                step.depends_on.append(earlier.step_id)
+
+        produced.append((
+            step,
+            _base_persona_label(entry["persona"]),
+            _shingles(entry.get("output", "")) - input_shingles
+        ))
+        steps.append(step)
+
+    return steps
+
+
+def _persona_ancestor(span: Dict[str, Any], by_id: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Span id of the nearest enclosing persona step, if any"""
+    parent = by_id.get(span.get("parent_span_id"))
+    while parent is not None:
+        if parent.get("kind") == "persona":
+            return parent["span_id"]
+        parent = by_id.get(parent.get("parent_span_id"))
+    return None
+
+
+def steps_from_spans(spans: List[Dict[str, Any]], kind: str = "gateway") -> Dict[str, List[TraceStep]]:
+    """Build steps per trace from exported spans (gateway calls by default)"""
+    by_id = {span["span_id"]: span for span in spans}
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        if span.get("kind") == kind and span.get("end_time") is not None:
+            traces.setdefault(span["trace_id"], []).append(span)
+
+    result = {}
+    for trace_id, trace_spans in traces.items():
+        trace_spans.sort(key=lambda s: s["start_time"])
+        steps = []
+        owner: Dict[str, Optional[str]] = {}
+        for span in trace_spans:
+            attributes = span.get("attributes", {})
+            persona = attributes.get("g1.persona", span["name"])
+            upstream = set(attributes.get("g1.upstream", []))
+            # Hops (e.g. routing) declare the dependency on behalf of their gateway call
+            parent = by_id.get(span.get("parent_span_id"))
+            if parent and parent.get("kind") == "hop":
+                upstream.update(parent.get("attributes", {}).get("g1.upstream", []))
+
+            step = TraceStep(
+                step_id=span["span_id"],
+                name=persona,
+                start=span["start_time"],
+                end=span["end_time"]
+            )
+            # The persona call itself is gated on its validation/routing hops
+            if parent and parent.get("kind") == "persona":
+                gate = [s for s in steps if owner.get(s.step_id) == parent["span_id"] and s.end <= step.start]
+                if gate:
+                    step.depends_on.append(gate[-1].step_id)
+            owner[span["span_id"]] = _persona_ancestor(span, by_id)
+            # Resolve each upstream persona to its latest call that finished before this one
+            for upstream_persona in upstream:
+                candidates = [s for s in steps if s.name == upstream_persona and s.end <= step.start]
+                if candidates:
+                    step.depends_on.append(candidates[-1].step_id)
+            steps.append(step)
+        result[trace_id] = steps
+    return result
+
+
+def load_trace_steps(path: str) -> Dict[str, List[TraceStep]]:
+    """Load steps from a trace log (JSON list) or a span file (JSON lines)"""
+    with open(path, "r") as f:
+        content = f.read()
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        spans = [json.loads(line) for line in content.splitlines() if line.strip()]
+        return steps_from_spans(spans)
+
+    if isinstance(data, list):
+        return {path: steps_from_trace_log(data)}
+    return steps_from_spans([data])
+
+
+class CriticalPathAnalyzer:
+    """Computes critical path, slack and parallelization opportunities"""
+
+    def analyze(self, steps: List[TraceStep]) -> Dict[str, Any]:
+        """Analyze a single workflow's steps"""
+        if not steps:
+            return {"steps": [], "critical_path": [], "overlap_candidates": [], "theoretical_speedup": 1.0}
+
+        steps = sorted(steps, key=lambda s: s.start)
+        by_id = {s.step_id: s for s in steps}
+        origin = steps[0].start
+        ordered = self._topological_order(steps, by_id)
+
+        # Forward pass: earliest start/finish given only the data dependencies
+        earliest_start, earliest_finish = {}, {}
+        for step in ordered:
+            deps = [d for d in step.depends_on if d in by_id]
+            earliest_start[step.step_id] = max((earliest_finish[d] for d in deps), default=0.0)
+            earliest_finish[step.step_id] = earliest_start[step.step_id] + step.duration
+        critical_length = max(earliest_finish.values())
+
+        # Backward pass: latest start/finish that does not delay the workflow
+        successors: Dict[str, List[str]] = {s.step_id: [] for s in steps}
+        for step in steps:
+            for dep in step.depends_on:
+                if dep in successors:
+                    successors[dep].append(step.step_id)
+        latest_start = {}
+        for step in reversed(ordered):
+            latest_finish = min((latest_start[s] for s in successors[step.step_id]), default=critical_length)
+            latest_start[step.step_id] = latest_finish - step.duration
+
+        # Walk back from the last-finishing step along the binding dependency
+        critical_path = []
+        current = max(steps, key=lambda s: earliest_finish[s.step_id])
+        while current is not None:
+            critical_path.append(current.step_id)
+            deps = [by_id[d] for d in current.depends_on if d in by_id]
+            current = max(deps, key=lambda s: earliest_finish[s.step_id]) if deps else None
+        critical_path.reverse()
+
+        # Transitive dependencies, to tell truly independent steps apart
+        ancestors: Dict[str, Set[str]] = {}
+        for step in ordered:
+            ancestors[step.step_id] = set()
+            for dep in step.depends_on:
+                if dep in by_id:
+                    ancestors[step.step_id].add(dep)
+                    ancestors[step.step_id].update(ancestors[dep])
+
+        overlap_candidates = []
+        for previous, step in zip(steps, steps[1:]):
+            ran_serially = step.start >= previous.end - TIME_EPSILON
+            if ran_serially and previous.step_id not in ancestors[step.step_id]:
+                overlap_candidates.append({
+                    "first": previous.name,
+                    "second": step.name,
+                    "time_saved_if_overlapped": min(previous.duration, step.duration)
+                })
+
+        observed_makespan = max(s.end for s in steps) - origin
+        busy_time = sum(s.duration for s in steps)
+
+        return {
+            "steps": [
+                {
+                    "step_id": s.step_id,
+                    "name": s.name,
+                    "duration": s.duration,
+                    "observed_start": s.start - origin,
+                    "earliest_start": earliest_start[s.step_id],
+                    "slack": max(latest_start[s.step_id] - earliest_start[s.step_id], 0.0),
+                    "depends_on": [by_id[d].name for d in s.depends_on if d in by_id],
+                    "on_critical_path": s.step_id in critical_path
+                }
+                for s in steps
+            ],
+            "critical_path": [by_id[step_id].name for step_id in critical_path],
+            "critical_path_length": critical_length,
+            "observed_makespan": observed_makespan,
+            "serial_step_time": busy_time,
+            "orchestration_gap": max(observed_makespan - busy_time, 0.0),
+            "overlap_candidates": overlap_candidates,
+            "theoretical_speedup": observed_makespan / critical_length if critical_length > 0 else 1.0
+        }
+
+    @staticmethod
+    def _topological_order(steps: List[TraceStep], by_id: Dict[str, TraceStep]) -> List[TraceStep]:
+        """Steps with every dependency before its dependents (ties in start order)"""
+        position = {s.step_id: i for i, s in enumerate(steps)}
+        waiting = {s.step_id: len({d for d in s.depends_on if d in by_id}) for s in steps}
+        successors: Dict[str, List[str]] = {s.step_id: [] for s in steps}
+        for step in steps:
+            for dep in set(step.depends_on):
+                if dep in by_id:
+                    successors[dep].append(step.step_id)
+
+        ready = [(position[i], i) for i, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            _, step_id = heapq.heappop(ready)
+            ordered.append(by_id[step_id])
+            for successor in successors[step_id]:
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    heapq.heappush(ready, (position[successor], successor))
+
+        if len(ordered) < len(steps):
+            cyclic = [s.step_id for s in steps if waiting[s.step_id] > 0]
+            raise ValueError(f"Cyclic step dependencies: {', '.join(cyclic)}")
+        return ordered
+
+    def analyze_file(self, path: str) -> Dict[str, Dict[str, Any]]:
+        """Analyze every workflow trace found in a file"""
+        return {trace_id: self.analyze(steps) for trace_id, steps in load_trace_steps(path).items()}
+
+
+def print_report(trace_name: str, report: Dict[str, Any]):
+    """Print a human readable critical-path report"""
+    print(f"\n{'='*80}")
+    print(f"🛤️  CRITICAL PATH ANALYSIS: {trace_name}")
+    print(f"{'='*80}")
+    print(f"⏱️  Observed makespan:   {report.get('observed_makespan', 0):.2f}s")
+    print(f"⏱️  Critical path:       {report.get('critical_path_length', 0):.2f}s")
+    print(f"⏱️  Orchestration gaps:  {report.get('orchestration_gap', 0):.2f}s")
+    print(f"🚀 Theoretical speedup: {report['theoretical_speedup']:.2f}x")
+
+    print(f"\n📍 Critical path: {' → '.join(report['critical_path'])}")
+
+    print(f"\n{'Step':<36} {'Duration':>9} {'Start':>8} {'Earliest':>9} {'Slack':>8}")
+    print(f"{'-'*74}")
+    for step in report["steps"]:
+        marker = "★" if step["on_critical_path"] else " "
+        print(f"{marker} {step['name'][:34]:<34} {step['duration']:>8.2f}s {step['observed_start']:>7.2f}s "
+              f"{step['earliest_start']:>8.2f}s {step['slack']:>7.2f}s")
+
+    if report["overlap_candidates"]:
+        print(f"\n🔀 Serial steps that could have overlapped:")
+        for candidate in report["overlap_candidates"]:
+            print(f"  • {candidate['first']} ∥ {candidate['second']} "
+                  f"(saves up to {candidate['time_saved_if_overlapped']:.2f}s)")
+
+
+def main():
+    """Analyze the recorded workflow traces"""
+    paths = sys.argv[1:] or ["workflow_trace_log.json", "complex_website_workflow_trace.json"]
+    analyzer = CriticalPathAnalyzer()
+
+    for path in paths:
+        for trace_name, report in analyzer.analyze_file(path).items():
+            print_report(trace_name, report)
+
+
+if __name__ == "__main__":
+    main()
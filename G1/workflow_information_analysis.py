@@ -10,18 +10,91 @@ and examining interface validator effectiveness in bridging information gaps.
 import asyncio
 import json
 from datetime import datetime
-from workflow_orchestrator import DynamicWorkflowOrchestrator
 from typing import Dict, Any, List
 import time
 
+# Typical persona hand-offs analyzed when no workflow is given
+DEFAULT_WORKFLOW_SEQUENCE = [
+    ("requirement-concierge", "quality-assurance-specialist"),
+    ("quality-assurance-specialist", "program-manager"),
+    ("program-manager", "developer"),
+    ("developer", "tester"),
+    ("tester", "infrastructure-engineer"),
+    ("infrastructure-engineer", "devops-specialist")
+]
+
+# Data contracts of the information bus; compiled by interface_contracts for local validation
+DATA_CONTRACTS = {
+    "requirement_contract": {
+        "required_fields": [
+            "requirement_id",
+            "description",
+            "priority",
+            "acceptance_criteria"
+        ],
+        "optional_fields": [
+            "business_context",
+            "constraints",
+            "assumptions"
+        ]
+    },
+    "technical_specification_contract": {
+        "required_fields": [
+            "architecture_design",
+            "technology_stack",
+            "api_specifications",
+            "database_schema"
+        ]
+    },
+    "test_artifact_contract": {
+        "required_fields": [
+            "test_strategy",
+            "test_cases", 
+            "test_data",
+            "quality_metrics"
+        ]
+    },
+    # Envelope of every persona request routed through the interface validator
+    "persona_request_contract": {
+        "schema": {
+            "type": "object",
+            "required": ["target_persona", "message", "context"],
+            "properties": {
+                "target_persona": {"type": "string", "minLength": 1, "known_persona": True},
+                "message": {"type": "string", "minLength": 1},
+                "context": {
+                    "type": "object",
+                    "required": ["workflow_id", "phase"],
+                    "properties": {
+                        "workflow_id": {"type": "string", "minLength": 1},
+                        "phase": {"type": "string", "minLength": 1},
+                        "classification": {
+                            "type": "object",
+                            "properties": {
+                                "type": {"type": "string"},
+                                "priority": {"type": "string"},
+                                "complexity_score": {"type": "number"},
+                                "risk_score": {"type": "number"}
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+
 class WorkflowInformationAnalyzer:
     """Analyzes information flow and gaps between personas in the workflow"""
     
     def __init__(self):
+        from workflow_orchestrator import DynamicWorkflowOrchestrator
         self.orchestrator = DynamicWorkflowOrchestrator()
         self.information_flow_map = {}
         self.detected_gaps = []
         self.persona_requirements = {}
+        self._gap_matrix = None
         
     def define_persona_information_requirements(self):
         """Define what information each persona needs to do their job completely"""
@@ -252,18 +325,16 @@ class WorkflowInformationAnalyzer:
             }
         }
         
-    def analyze_information_gaps(self):
+    def analyze_information_gaps(self, workflow_sequence=None):
         """Analyze gaps between persona outputs and next persona inputs"""
         
-        # Define the typical workflow sequence
-        workflow_sequence = [
-            ("requirement-concierge", "quality-assurance-specialist"),
-            ("quality-assurance-specialist", "program-manager"),
-            ("program-manager", "developer"),
-            ("developer", "tester"),
-            ("tester", "infrastructure-engineer"),
-            ("infrastructure-engineer", "devops-specialist")
-        ]
+        # Default: the typical workflow sequence; any list of (source, target) edges works
+        if workflow_sequence is None:
+            workflow_sequence = DEFAULT_WORKFLOW_SEQUENCE
+        
+        gap_matrix = self.get_gap_matrix()
+        if gap_matrix is not None:
+            return gap_matrix.gaps(workflow_sequence)
         
         gaps_identified = []
         
@@ -289,6 +360,34 @@ class WorkflowInformationAnalyzer:
         
         return gaps_identified
     
+    def get_gap_matrix(self):
+        """Needs/provides bit matrices for the current persona requirements (None without numpy)"""
+        # Imported here so loading DATA_CONTRACTS does not pull in numpy
+        from information_gaps import InformationGapMatrix, NUMPY_AVAILABLE
+        
+        if not NUMPY_AVAILABLE:
+            return None
+        if self._gap_matrix is None or self._gap_matrix.personas != list(self.persona_requirements):
+            self._gap_matrix = InformationGapMatrix(self.persona_requirements)
+        return self._gap_matrix
+    
+    def analyze_transitive_coverage(self, workflow_sequence=None, external_inputs=("raw_business_requirement",)):
+        """Score how much of each persona's needs is produced anywhere upstream, per hop"""
+        gap_matrix = self.get_gap_matrix()
+        if gap_matrix is None:
+            return {}
+        
+        result = gap_matrix.transitive_coverage(workflow_sequence or DEFAULT_WORKFLOW_SEQUENCE, external_inputs)
+        coverage = {}
+        for i, persona in enumerate(result["personas"]):
+            coverage[persona] = {
+                "direct_coverage": round(float(result["direct"][i]), 3),
+                "transitive_coverage": round(float(result["transitive"][i]), 3),
+                "coverage_by_hop": [round(float(c), 3) for c in result["by_hop"][i]],
+                "unmet_needs": result["unmet"].get(persona, [])
+            }
+        return coverage
+    
     def calculate_gap_severity(self, missing_info: set, total_needs: set) -> str:
         """Calculate the severity of information gaps"""
         if not missing_info:
@@ -384,37 +483,7 @@ class WorkflowInformationAnalyzer:
                     ]
                 }
             },
-            "data_contracts": {
-                "requirement_contract": {
-                    "required_fields": [
-                        "requirement_id",
-                        "description",
-                        "priority",
-                        "acceptance_criteria"
-                    ],
-                    "optional_fields": [
-                        "business_context",
-                        "constraints",
-                        "assumptions"
-                    ]
-                },
-                "technical_specification_contract": {
-                    "required_fields": [
-                        "architecture_design",
-                        "technology_stack",
-                        "api_specifications",
-                        "database_schema"
-                    ]
-                },
-                "test_artifact_contract": {
-                    "required_fields": [
-                        "test_strategy",
-                        "test_cases", 
-                        "test_data",
-                        "quality_metrics"
-                    ]
-                }
-            },
+            "data_contracts": DATA_CONTRACTS,
             "information_flow_rules": [
                 "all_persona_outputs_must_be_validated",
                 "missing_information_must_be_requested_upstream",
@@ -562,6 +631,12 @@ class WorkflowInformationAnalyzer:
             if gap['missing_information']:
                 print(f"      Missing: {', '.join(gap['missing_information'][:3])}{'...' if len(gap['missing_information']) > 3 else ''}")
         
+        transitive_coverage = self.analyze_transitive_coverage()
+        for persona, coverage in transitive_coverage.items():
+            if coverage["unmet_needs"]:
+                print(f"   🧭 {persona}: {coverage['direct_coverage']:.0%} direct, "
+                      f"{coverage['transitive_coverage']:.0%} transitive coverage")
+        
         # Step 3: Design interface validator enhancements  
         print("\n3️⃣ DESIGNING ENHANCED INTERFACE VALIDATORS...")
         enhanced_validators = self.design_interface_validator_enhancements(gaps)
@@ -593,6 +668,7 @@ class WorkflowInformationAnalyzer:
             "analysis_timestamp": datetime.now().isoformat(),
             "persona_requirements": self.persona_requirements,
             "information_gaps": gaps,
+            "transitive_coverage": transitive_coverage,
             "enhanced_validators": enhanced_validators,
             "information_bus_architecture": info_bus,
             "missing_entities": missing_entities,
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Workflow Optimizer
+==================
+
+Rewrites a persona-designed workflow into the fastest equivalent plan before
+it is executed.
+
+The designed phases (parse_workflow_phases output) run every persona one after
+another. The optimizer turns them into a persona-level dependency graph:
+
+- A persona depends on an earlier persona when that persona provides information
+  it needs (catalog I/O contracts, or WorkflowInformationAnalyzer requirements,
+  compared through the information gap matrix)
+- Dependencies the designer declared between phases are kept
+- Personas without a known I/O contract, or with needs no earlier persona is
+  known to provide, keep the designed phase order
+
+Each persona is weighted with its measured latency (EWMA of recent gateway
+calls) or, before any call was measured, its catalog latency class. The
+earliest-start schedule of that graph has the minimum makespan with unlimited
+parallelism; personas that share their dependencies become one parallel stage,
+and stages depend only on the stages holding their inputs.
+
+The plan also flags redundant personas: repeated personas, and personas whose
+outputs another persona in the plan needs but no later persona consumes
+(outside the final phase). With drop_redundant they are removed, except the
+last remaining occurrence of a persona.
+
+Configuration (environment):
+- G1_OPTIMIZE_WORKFLOW: "0" disables plan rewriting (enabled by default)
+- G1_OPTIMIZE_DROP_REDUNDANT: "1" removes flagged redundant personas
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Mapping, Iterable, Set
+
+from persona_catalog import (get_persona_catalog, normalize_persona_name,
+                             LATENCY_FAST, LATENCY_STANDARD, LATENCY_SLOW)
+
+logger = logging.getLogger(__name__)
+
+# Expected seconds per call before a persona has been measured
+LATENCY_CLASS_SECONDS = {
+    LATENCY_FAST: 3.0,
+    LATENCY_STANDARD: 10.0,
+    LATENCY_SLOW: 25.0,
+}
+
+# Information every persona receives with the requirement itself
+EXTERNAL_INPUTS = ("raw_business_requirement", "business_context")
+
+REDUNDANT_REPEATED = "repeated persona"
+REDUNDANT_UNCONSUMED = "outputs not consumed by any later persona"
+
+
+class PersonaLatencyStats:
+    """Exponentially weighted moving average of measured persona call latency"""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._latency: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(persona: str) -> str:
+        spec = get_persona_catalog().find(persona)
+        return spec.id if spec else normalize_persona_name(persona)
+
+    def record(self, persona: str, seconds: float):
+        key = self._key(persona)
+        with self._lock:
+            previous = self._latency.get(key)
+            self._latency[key] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+            self._calls[key] = self._calls.get(key, 0) + 1
+
+    def estimate(self, persona: str) -> float:
+        """Measured latency, or the catalog latency class default"""
+        key = self._key(persona)
+        measured = self._latency.get(key)
+        if measured is not None:
+            return measured
+        spec = get_persona_catalog().find(persona)
+        return LATENCY_CLASS_SECONDS[spec.latency_class if spec else LATENCY_STANDARD]
+
+    def measured(self, persona: str) -> bool:
+        return self._key(persona) in self._latency
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {k: {"latency_s": round(v, 3), "calls": self._calls[k]} for k, v in self._latency.items()}
+
+
+_latency_stats: Optional[PersonaLatencyStats] = None
+_latency_stats_lock = threading.Lock()
+
+
+def get_latency_stats() -> PersonaLatencyStats:
+    """Process-wide latency statistics shared by every persona client"""
+    global _latency_stats
+    if _latency_stats is None:
+        with _latency_stats_lock:
+            if _latency_stats is None:
+                _latency_stats = PersonaLatencyStats()
+    return _latency_stats
+
+
+@dataclass
+class PlanStep:
+    """One persona occurrence of the designed workflow"""
+    step_id: str
+    persona: str
+    key: str
+    phase_index: int
+    phase_name: str
+    duration: float
+    depends_on: List[str] = field(default_factory=list)
+    start: float = 0.0
+    finish: float = 0.0
+
+
+@dataclass
+class OptimizedPlan:
+    """Rewritten workflow plus the schedule it was derived from"""
+    phases: List[Dict[str, Any]]
+    steps: Dict[str, PlanStep]
+    critical_path: List[str]
+    designed_makespan: float
+    optimized_makespan: float
+    redundant: Dict[str, str] = field(default_factory=dict)
+    dropped: List[str] = field(default_factory=list)
+    uncovered_needs: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        return self.designed_makespan / self.optimized_makespan if self.optimized_makespan else 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stages": [
+                {"phase_name": p["phase_name"], "personas": p["personas"], "dependencies": p["dependencies"],
+                 "estimated_start_s": p["estimated_start_s"], "estimated_duration_s": p["estimated_duration_s"]}
+                for p in self.phases
+            ],
+            "critical_path": [self.steps[s].persona for s in self.critical_path],
+            "designed_makespan_s": round(self.designed_makespan, 2),
+            "optimized_makespan_s": round(self.optimized_makespan, 2),
+            "speedup": round(self.speedup, 2),
+            "redundant": {self.steps[s].persona + f" ({self.steps[s].phase_name})": reason
+                          for s, reason in self.redundant.items()},
+            "dropped": [self.steps[s].persona for s in self.dropped],
+            "uncovered_needs": self.uncovered_needs
+        }
+
+
+class WorkflowOptimizer:
+    """Minimum-makespan rewrite of persona-designed workflow phases"""
+
+    def __init__(self, latency_stats: Optional[PersonaLatencyStats] = None,
+                 persona_requirements: Optional[Mapping[str, Mapping[str, Iterable[str]]]] = None,
+                 drop_redundant: bool = False):
+        self.latency_stats = latency_stats or get_latency_stats()
+        self.drop_redundant = drop_redundant
+
+        # WorkflowInformationAnalyzer-style requirements override catalog contracts
+        catalog = get_persona_catalog()
+        self.persona_requirements = {
+            catalog.canonical(name) if name in catalog else normalize_persona_name(name): spec
+            for name, spec in (persona_requirements or {}).items()
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional["WorkflowOptimizer"]:
+        if os.getenv("G1_OPTIMIZE_WORKFLOW", "1") == "0":
+            return None
+        return cls(drop_redundant=os.getenv("G1_OPTIMIZE_DROP_REDUNDANT", "0") == "1")
+
+    def _contract(self, key: str) -> Dict[str, List[str]]:
+        if key in self.persona_requirements:
+            spec = self.persona_requirements[key]
+            return {"input_needs": list(spec.get("input_needs", ())),
+                    "output_provides": list(spec.get("output_provides", ()))}
+        spec = get_persona_catalog().find(key)
+        return {"input_needs": list(spec.inputs) if spec else [],
+                "output_provides": list(spec.outputs) if spec else []}
+
+    def optimize(self, phases: List[Dict[str, Any]]) -> OptimizedPlan:
+        catalog = get_persona_catalog()
+        steps: List[PlanStep] = []
+        seen: Set[str] = set()
+        first_seen: Dict[str, str] = {}
+        redundant: Dict[str, str] = {}
+        for p, phase in enumerate(phases):
+            for persona in phase.get("personas", []):
+                if not persona or not persona.strip():
+                    continue
+                spec = catalog.find(persona)
+                key = spec.id if spec else normalize_persona_name(persona)
+                step = PlanStep(f"{p}:{persona}", persona, key, p, phase.get("phase_name", f"Phase {p + 1}"),
+                                self.latency_stats.estimate(persona))
+                if step.step_id in seen:
+                    continue
+                seen.add(step.step_id)
+                if key in first_seen:
+                    redundant[step.step_id] = REDUNDANT_REPEATED
+                    step.depends_on.append(first_seen[key])
+                else:
+                    first_seen[key] = step.step_id
+                steps.append(step)
+
+        contracts = {s.key: self._contract(s.key) for s in steps}
+        feeds = self._feeds(contracts)
+
+        # Dependencies on earlier steps: declared, information flow, or designed order when unknown
+        last_phase = max((s.phase_index for s in steps), default=0)
+        consumed: Set[str] = set()
+        produced: Set[str] = set(EXTERNAL_INPUTS)
+        for j, step in enumerate(steps):
+            declared = set(phases[step.phase_index].get("dependencies", []))
+            # Needs nobody upstream is known to provide may come from any earlier phase
+            needs = contracts[step.key]["input_needs"]
+            needs_known = bool(needs) and produced.issuperset(needs)
+            produced.update(contracts[step.key]["output_provides"])
+            for earlier in steps[:j]:
+                provides_known = bool(contracts[earlier.key]["output_provides"])
+                later_phase = earlier.phase_index < step.phase_index
+                if feeds(earlier.key, step.key):
+                    consumed.add(earlier.step_id)
+                    depends = True
+                else:
+                    depends = (earlier.phase_name in declared
+                               or (later_phase and (not needs_known or not provides_known)))
+                if depends and earlier.step_id not in step.depends_on:
+                    step.depends_on.append(earlier.step_id)
+
+        # Unconsumed only when another persona in the plan needs some of the output;
+        # outputs nobody declares a need for say more about vocabularies than about the plan
+        occurrences = Counter(s.key for s in steps)
+        for step in steps:
+            outputs = set(contracts[step.key]["output_provides"])
+            if (step.step_id in redundant or step.step_id in consumed or not outputs
+                    or step.phase_index == last_phase or occurrences[step.key] > 1):
+                continue
+            if any(outputs.intersection(contracts[other]["input_needs"]) for other in occurrences if other != step.key):
+                redundant[step.step_id] = REDUNDANT_UNCONSUMED
+
+        all_steps = {s.step_id: s for s in steps}
+        by_id = dict(all_steps)
+        designed_makespan = sum(s.duration for s in steps)
+
+        dropped = []
+        if self.drop_redundant and redundant:
+            # Never drop the last remaining occurrence of a persona
+            remaining = Counter(s.key for s in steps)
+            for step_id in redundant:
+                key = all_steps[step_id].key
+                if remaining[key] > 1:
+                    remaining[key] -= 1
+                    dropped.append(step_id)
+            for step_id in dropped:
+                removed = by_id.pop(step_id)
+                for step in by_id.values():
+                    if step_id in step.depends_on:
+                        step.depends_on.remove(step_id)
+                        step.depends_on.extend(d for d in removed.depends_on if d not in step.depends_on)
+            steps = list(by_id.values())
+
+        self._reduce(steps, by_id)
+        optimized_makespan, critical_path = self._schedule(steps, by_id)
+        rewritten = self._stages(steps, by_id, phases)
+
+        plan = OptimizedPlan(rewritten, all_steps, critical_path, designed_makespan, optimized_makespan,
+                             redundant, dropped, self._uncovered(steps, contracts))
+        logger.info(f"⚡ Workflow plan: {len(steps)} persona steps in {len(rewritten)} stages, "
+                    f"est. {designed_makespan:.0f}s → {optimized_makespan:.0f}s ({plan.speedup:.1f}x)")
+        for step_id, reason in redundant.items():
+            step = all_steps[step_id]
+            logger.info(f"   ♻️ Redundant: {step.persona} in {step.phase_name} - {reason}")
+        return plan
+
+    def _feeds(self, contracts: Dict[str, Dict[str, List[str]]]):
+        """feeds(a, b): persona a provides information persona b needs"""
+        try:
+            from information_gaps import InformationGapMatrix, NUMPY_AVAILABLE
+        except ImportError:
+            NUMPY_AVAILABLE = False
+        if NUMPY_AVAILABLE and contracts:
+            matrix = InformationGapMatrix(contracts)
+            overlap = matrix.overlap
+            index = matrix.index
+            return lambda a, b: a != b and overlap[index[a], index[b]] > 0
+
+        provides = {k: set(c["output_provides"]) for k, c in contracts.items()}
+        needs = {k: set(c["input_needs"]) for k, c in contracts.items()}
+        return lambda a, b: a != b and bool(provides[a] & needs[b])
+
+    @staticmethod
+    def _reduce(steps: List[PlanStep], by_id: Dict[str, PlanStep]):
+        """Drop dependencies already implied by another dependency (transitive reduction)"""
+        ancestors: Dict[str, Set[str]] = {}
+        for step in steps:
+            ancestors[step.step_id] = set()
+            for dep in step.depends_on:
+                ancestors[step.step_id] |= ancestors[dep] | {dep}
+        for step in steps:
+            implied = set().union(*(ancestors[d] for d in step.depends_on)) if step.depends_on else set()
+            step.depends_on = [d for d in step.depends_on if d not in implied]
+
+    @staticmethod
+    def _schedule(steps: List[PlanStep], by_id: Dict[str, PlanStep]):
+        """Earliest-start schedule; returns (makespan, critical path step ids)"""
+        for step in steps:
+            step.start = max((by_id[d].finish for d in step.depends_on), default=0.0)
+            step.finish = step.start + step.duration
+        if not steps:
+            return 0.0, []
+
+        path = [max(steps, key=lambda s: s.finish)]
+        while path[-1].depends_on:
+            path.append(max((by_id[d] for d in path[-1].depends_on), key=lambda s: s.finish))
+        return path[0].finish, [s.step_id for s in reversed(path)]
+
+    @staticmethod
+    def _stages(steps: List[PlanStep], by_id: Dict[str, PlanStep],
+                phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Personas waiting on the same stages run as one parallel stage"""
+        # Steps in start order, so every dependency already has its stage
+        stage_index: Dict[frozenset, int] = {}
+        members_of: List[List[PlanStep]] = []
+        stage_of: Dict[str, int] = {}
+        for step in sorted(steps, key=lambda s: (s.start, s.phase_index)):
+            waits_on = frozenset(stage_of[d] for d in step.depends_on)
+            if waits_on not in stage_index:
+                stage_index[waits_on] = len(members_of)
+                members_of.append([])
+            stage_of[step.step_id] = stage_index[waits_on]
+            members_of[stage_of[step.step_id]].append(step)
+
+        names = [f"Stage {n}: " + " / ".join(dict.fromkeys(m.phase_name for m in members))
+                 for n, members in enumerate(members_of, 1)]
+        stages = []
+        for waits_on, index in stage_index.items():
+            members = members_of[index]
+            start = min(m.start for m in members)
+            stages.append({
+                "phase_name": names[index],
+                "personas": [m.persona for m in members],
+                "deliverables": list(dict.fromkeys(
+                    d for p in {m.phase_index for m in members} for d in phases[p].get("deliverables", []))),
+                "dependencies": [names[i] for i in sorted(waits_on)],
+                "parallel": True,
+                "estimated_start_s": round(start, 2),
+                "estimated_duration_s": round(max(m.finish for m in members) - start, 2)
+            })
+        return stages
+
+    @staticmethod
+    def _uncovered(steps: List[PlanStep], contracts: Dict[str, Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        """Needs that no upstream persona (or the requirement itself) provides"""
+        by_id = {s.step_id: s for s in steps}
+        available: Dict[str, Set[str]] = {}
+        uncovered = {}
+        for step in steps:
+            provided = set(EXTERNAL_INPUTS)
+            for dep in step.depends_on:
+                provided |= available[dep] | set(contracts[by_id[dep].key]["output_provides"])
+            available[step.step_id] = provided
+            missing = [n for n in contracts[step.key]["input_needs"] if n not in provided]
+            if missing:
+                uncovered[step.persona] = missing
+        return uncovered
@@ -10,18 +10,39 @@ Features:
 - Full development lifecycle coverage
 """
 
+import contextlib
 import asyncio
 import json
+import os
+import threading
+import time
 import uuid
-import aiohttp
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from dataclasses import dataclass
 from enum import Enum
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from workflow_tracing import (
+    get_tracer, traced, trace_id_for,
+    SPAN_KIND_WORKFLOW, SPAN_KIND_PHASE, SPAN_KIND_PERSONA, SPAN_KIND_HOP, SPAN_KIND_GATEWAY
+)
+from persona_cassette import PersonaCassette
+from requirement_classifier import get_classifier
+from workflow_checkpoints import WorkflowCheckpointStore, STATUS_COMPLETED, STATUS_FAILED
+from incremental_execution import StepMemo, memoized_step
+from service_registry import get_service_registry, resolve_service_url
+from gateway_load_balancer import GatewayPool
+from health_probes import ReadinessGate
+from persona_catalog import get_persona_catalog
+from interface_contracts import get_contract_validator
+from workflow_optimizer import get_latency_stats
+from workflow_budget import (WorkflowBudget, WorkflowUsage, current_usage, default_max_tokens,
+                             shorten_context, usage_phase, usage_scope)
+
+if TYPE_CHECKING:
+    import aiohttp
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,6 +124,16 @@ class WorkflowContextManager:
             "timestamp": datetime.now().isoformat()
         })
     
+    def rollback_persona_output(self, persona_name: str):
+        """Remove a persona's output so work built on it can be redone"""
+        self.persona_outputs.pop(persona_name, None)
+        self.workflow_context.pop(f"{persona_name}_output", None)
+        self.context_history.append({
+            "persona": persona_name,
+            "output": "[rolled back]",
+            "timestamp": datetime.now().isoformat()
+        })
+    
     def get_enriched_context(self, current_persona: str, base_context: dict) -> dict:
         """Get enriched context with accumulated workflow history"""
         enriched_context = base_context.copy()
@@ -132,6 +163,52 @@ class WorkflowContextManager:
         return summary
 
 
+class SpeculativePrefetcher:
+    """Runs persona calls ahead of their phase and hands the results over on demand"""
+    
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"started": 0, "used": 0, "discarded": 0, "cancelled": 0}
+    
+    def start(self, persona_name: str, call) -> asyncio.Task:
+        """Schedule a persona call coroutine in the background"""
+        task = asyncio.ensure_future(call)
+        self._tasks[persona_name] = task
+        self.stats["started"] += 1
+        return task
+    
+    async def take(self, persona_name: str) -> Optional["PersonaResult"]:
+        """Wait for a prefetched result; None if there is no usable one"""
+        task = self._tasks.pop(persona_name, None)
+        if task is None:
+            return None
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        except Exception as e:
+            logger.warning(f"Speculative call for {persona_name} failed: {e}")
+            result = None
+        
+        # Failed speculative calls are re-issued normally by the phase
+        if result is None or not result.success:
+            self.stats["discarded"] += 1
+            return None
+        self.stats["used"] += 1
+        return result
+    
+    def cancel(self, persona_name: Optional[str] = None):
+        """Cancel one outstanding speculative call, or all of them when the plan changes"""
+        names = [persona_name] if persona_name else list(self._tasks)
+        for name in names:
+            task = self._tasks.pop(name, None)
+            if task and not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
+
+
 @dataclass
 class WorkflowContext:
     """Context passed through the workflow"""
@@ -141,76 +218,88 @@ class WorkflowContext:
     classification: Optional[RequirementClassification] = None
     metadata: Dict[str, Any] = None
     context_manager: Optional[WorkflowContextManager] = None
+    prefetcher: Optional[SpeculativePrefetcher] = None
+    completed_steps: Dict[str, Any] = None
     
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
+        if self.completed_steps is None:
+            self.completed_steps = {}
         if self.context_manager is None:
             self.context_manager = WorkflowContextManager()
 
 
+_persona_client: Optional["PersonaAPIClient"] = None
+_persona_client_lock = threading.Lock()
+
+
+def load_persona_mapping() -> Dict[str, str]:
+    """Persona id → gateway agent id, from the process-wide persona catalog"""
+    return get_persona_catalog().agent_mapping()
+
+
+def get_persona_client() -> "PersonaAPIClient":
+    """Process-wide PersonaAPIClient shared by the orchestrators"""
+    global _persona_client
+    if _persona_client is None:
+        with _persona_client_lock:
+            if _persona_client is None:
+                _persona_client = PersonaAPIClient()
+    return _persona_client
+
+
 class PersonaAPIClient:
     """Enhanced client for calling personas via API with validation"""
     
-    def __init__(self, base_url: str = "http://localhost:8003", personas_gateway_url: str = "http://localhost:8013"):
+    def __init__(self, base_url: str = "http://localhost:8003", personas_gateway_url: Optional[str] = None,
+                 cassette: Optional[PersonaCassette] = None,
+                 session: Optional["aiohttp.ClientSession"] = None,
+                 gateway_pool: Optional[GatewayPool] = None):
         self.base_url = base_url
-        self.personas_gateway_url = personas_gateway_url
+        self.personas_gateway_url = personas_gateway_url or resolve_service_url("personas-gateway", "http://localhost:8013")
         
-        # Load extended persona mapping
-        try:
-            with open("/Users/kulbirminhas/Documents/github/projects/oom/extended_persona_mapping.json", "r") as f:
-                extended_mapping = json.load(f)
-        except FileNotFoundError:
-            extended_mapping = {}
-        
-        # Complete persona mapping with proper agent IDs
-        self.persona_mapping = {
-            # Core workflow personas
-            "requirement_concierge": "requirement_concierge",
-            "risk_assessor": "risk_assessor",
-            "complexity_estimator": "complexity_estimator", 
-            "mind_engine_coordinator": "mind_engine_coordinator",
-            "workflow_router": "workflow_router",
-            "gatekeeper": "gatekeeper",
-            
-            # Management personas
-            "team_manager": "team_manager",
-            "program_manager": "program_manager",
-            
-            # Development lifecycle personas
-            "developer": "developer",
-            "tester": "tester", 
-            "operations": "operations",
-            
-            # Enhanced Deployment Engineering Personas
-            "infrastructure_engineer": "infrastructure_engineer",
-            "release_engineer": "release_engineer",
-            "devops_specialist": "devops_specialist",
-            "github_integration_specialist": "github_integration_specialist",
-            
-            # Interface/Queue management personas
-            "interface_validator": "interface_validator",
-            "queue_manager": "queue_manager",
-            
-            # Metrics calculation personas
-            "functionality_metrics": "functionality_metrics",
-            "performance_metrics": "performance_metrics",
-            "stability_metrics": "stability_metrics",
-            "scalability_metrics": "scalability_metrics"
-        }
+        # Client-side balancing when the gateway runs as several replicas
+        # (G1_SERVICE_REPLICAS_PERSONAS_GATEWAY); a single gateway is called directly
+        if gateway_pool is None and personas_gateway_url is None:
+            record = get_service_registry().find("personas-gateway")
+            if record is not None and len(record.replicas) > 1:
+                gateway_pool = GatewayPool.from_registry("personas-gateway")
+        self.gateway_pool = gateway_pool
+        
+        # Shared (pooled) session owned by the caller; None opens one per request
+        self.session = session
+        
+        # Record/replay of gateway traffic (G1_CASSETTE=path, G1_CASSETTE_MODE=record|replay)
+        self.cassette = cassette if cassette is not None else PersonaCassette.from_env()
+    
+    @property
+    def persona_mapping(self) -> Dict[str, str]:
+        return load_persona_mapping()
     
     async def validate_and_route_request(self, persona_name: str, user_message: str, 
                                        context: Dict[str, Any], context_manager: Optional[WorkflowContextManager] = None) -> Dict[str, Any]:
         """Validate request format and route through queue manager"""
-        
-        # First validate the request format
-        validation_result = await self.call_persona(
-            "interface_validator",
-            f"""Please validate this request format for persona communication:
+        tracer = get_tracer()
+        
+        # First validate the request format locally against the data contracts;
+        # only contract violations need the interface_validator persona
+        with tracer.span("route.validate", kind=SPAN_KIND_HOP, attributes={"g1.target_persona": persona_name}) as span:
+            report = get_contract_validator().validate_request(persona_name, user_message, context)
+            span.set_attribute("g1.contract_violations", len(report.violations))
+            if report.valid:
+                validation_summary = f"Validated locally against {report.contract}"
+                validated_by = []
+            else:
+                logger.info(f"📑 {persona_name} request violates {report.contract}: {report.violations}")
+                validation_result = await self.call_persona(
+                    "interface_validator",
+                    f"""Please validate this request format for persona communication:
 
 Target Persona: {persona_name}
 Message: {user_message}
 Context: {json.dumps(context, indent=2)}
+Contract Violations: {json.dumps(report.violations, indent=2)}
 
 Validate:
 1. Message structure and clarity
@@ -219,22 +308,25 @@ Validate:
 4. Routing appropriateness
 
 Provide validation status and any corrections needed.""",
-            {"validation_target": persona_name, "request_type": "validation"},
-            context_manager
-        )
-        
-        if not validation_result["success"]:
-            return validation_result
+                    {"validation_target": persona_name, "request_type": "validation"},
+                    context_manager
+                )
+                if not validation_result["success"]:
+                    return validation_result
+                validation_summary = validation_result.get("response", "")
+                validated_by = ["interface_validator"]
         
         # Route through queue manager
-        routing_result = await self.call_persona(
-            "queue_manager",
-            f"""Please route this validated request to the appropriate persona:
+        with tracer.span("route.queue", kind=SPAN_KIND_HOP,
+                         attributes={"g1.target_persona": persona_name, "g1.upstream": validated_by}):
+            routing_result = await self.call_persona(
+                "queue_manager",
+                f"""Please route this validated request to the appropriate persona:
 
 Target Persona: {persona_name}
 Validated Message: {user_message}
 Context: {json.dumps(context, indent=2)}
-Validation Result: {validation_result.get('response', '')}
+Validation Result: {validation_summary}
 
 Determine:
 1. Optimal routing strategy
@@ -243,9 +335,9 @@ Determine:
 4. Any parallel processing opportunities
 
 Provide routing decision and processing workflow.""",
-            {"routing_target": persona_name, "request_type": "routing"},
-            context_manager
-        )
+                {"routing_target": persona_name, "request_type": "routing"},
+                context_manager
+            )
         
         # Execute the actual persona call
         return await self.call_persona(persona_name, user_message, context, context_manager)
@@ -254,63 +346,149 @@ Provide routing decision and processing workflow.""",
                           context: Dict[str, Any], context_manager: Optional[WorkflowContextManager] = None) -> Dict[str, Any]:
         """Call a persona via Personas Gateway API (port 8013) with context accumulation"""
         
+        # Token/cost accounting of the current workflow; near its budget optional
+        # personas are skipped and the rest run with a shorter context
+        usage = current_usage()
+        phase = context.get("phase") if isinstance(context, dict) and isinstance(context.get("phase"), str) else None
+        plan = usage.plan_call(persona_name) if usage else None
+        if plan and plan.skip:
+            usage.record_skip(persona_name, phase)
+            logger.info(f"💸 Skipping optional persona {persona_name}: {plan.reason}")
+            return {
+                "success": False,
+                "error": f"Skipped: {plan.reason}",
+                "persona": persona_name,
+                "skipped": True
+            }
+        
         # Enrich context with accumulated workflow history if context manager provided
         final_context = context
         if context_manager:
             final_context = context_manager.get_enriched_context(persona_name, context)
+        if plan and plan.degraded:
+            final_context = shorten_context(final_context, plan.context_chars)
         
         # Personas Gateway payload format
         query_payload = {
             "query": user_message,
             "context": final_context,
             "parameters": {
-                "max_tokens": 2000,
+                "max_tokens": plan.max_tokens if plan else default_max_tokens(),
                 "temperature": 0.7
             }
         }
         
+        # Any spelling or alias of a persona is sent as the agent id the gateway serves
+        agent_id = get_persona_catalog().agent_id(persona_name)
+        
+        # Upstream personas whose outputs were folded into this request's context
+        upstream = list(context_manager.persona_outputs.keys()) if context_manager else []
+        with get_tracer().span(f"gateway.{persona_name}", kind=SPAN_KIND_GATEWAY,
+                               attributes={"g1.persona": persona_name, "g1.agent_id": agent_id,
+                                           "g1.upstream": upstream}) as span:
+            if self.cassette and self.cassette.replaying:
+                span.set_attribute("g1.cassette", "replay")
+                api_result = await self.cassette.replay(agent_id, query_payload)
+            else:
+                started = time.perf_counter()
+                api_result = await self._post_to_gateway(agent_id, query_payload)
+                if api_result["success"]:
+                    # Measured latencies feed the workflow optimizer's schedule estimates
+                    get_latency_stats().record(persona_name, time.perf_counter() - started)
+                if self.cassette and self.cassette.recording:
+                    span.set_attribute("g1.cassette", "record")
+                    self.cassette.record(agent_id, query_payload, api_result, time.perf_counter() - started)
+            span.set_attribute("g1.success", api_result["success"])
+            if usage:
+                record = usage.record(persona_name, query_payload, api_result, phase, plan.degraded)
+                span.set_attribute("g1.tokens", record.total_tokens)
+            if not api_result["success"]:
+                span.record_error(api_result["error"])
+        
+        # Add this persona's output to context manager if provided
+        if api_result["success"] and context_manager:
+            context_manager.add_persona_output(
+                persona_name, 
+                api_result["response"],
+                {
+                    "execution_time": api_result["execution_time"],
+                    "timestamp": datetime.now().isoformat()
+                }
+            )
+        
+        return api_result
+    
+    async def _post_to_gateway(self, persona_name: str, query_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a query to the Personas Gateway, propagating trace context headers"""
+        if self.gateway_pool is not None:
+            return await self._post_balanced(persona_name, query_payload)
+        return await self._post_to_url(self.personas_gateway_url, persona_name, query_payload)
+    
+    async def _post_balanced(self, persona_name: str, query_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST through the gateway pool, retrying once on another replica if one is down"""
+        pool = self.gateway_pool
+        pool.ensure_health_checks()
+        tried = []
+        api_result: Dict[str, Any] = {}
+        for _ in range(min(2, len(pool.replicas))):
+            replica = pool.choose(persona_name, exclude=tried)
+            tried.append(replica)
+            with pool.track(replica):
+                api_result = await self._post_to_url(replica.url, persona_name, query_payload)
+            
+            # 4xx is about the request, not the replica
+            if api_result["success"] or api_result["error"].startswith("HTTP 4"):
+                pool.record_success(replica)
+                break
+            pool.record_failure(replica)
+        
+        span = get_tracer().current_span()
+        if span is not None:
+            span.set_attribute("g1.gateway_replica", tried[-1].url)
+        return api_result
+    
+    async def _post_to_url(self, gateway_url: str, persona_name: str,
+                           query_payload: Dict[str, Any]) -> Dict[str, Any]:
+        import aiohttp
+        
         try:
+            if self.session is not None:
+                return await self._post_with_session(self.session, gateway_url, persona_name, query_payload)
             async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.personas_gateway_url}/persona/{persona_name}",
-                    json=query_payload,
-                    timeout=aiohttp.ClientTimeout(total=60)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        response_text = result.get("response", "")
-                        
-                        # Add this persona's output to context manager if provided
-                        if context_manager:
-                            context_manager.add_persona_output(
-                                persona_name, 
-                                response_text,
-                                {
-                                    "execution_time": result.get("execution_time", 0),
-                                    "timestamp": datetime.now().isoformat()
-                                }
-                            )
-                        
-                        return {
-                            "success": True,
-                            "response": response_text,
-                            "persona": result.get("persona", persona_name),
-                            "execution_time": result.get("execution_time", 0),
-                            "raw_result": result
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "persona": persona_name
-                        }
+                return await self._post_with_session(session, gateway_url, persona_name, query_payload)
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
                 "persona": persona_name
             }
+    
+    async def _post_with_session(self, session: "aiohttp.ClientSession", gateway_url: str, persona_name: str,
+                                 query_payload: Dict[str, Any]) -> Dict[str, Any]:
+        import aiohttp
+        
+        async with session.post(
+            f"{gateway_url}/persona/{persona_name}",
+            json=query_payload,
+            headers=get_tracer().inject_headers(),
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return {
+                    "success": True,
+                    "response": result.get("response", ""),
+                    "persona": result.get("persona", persona_name),
+                    "execution_time": result.get("execution_time", 0),
+                    "raw_result": result
+                }
+            else:
+                error_text = await response.text()
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status}: {error_text}",
+                    "persona": persona_name
+                }
 
 
 class MetricsCalculator:
@@ -319,6 +497,7 @@ class MetricsCalculator:
     def __init__(self, persona_client: PersonaAPIClient):
         self.persona_client = persona_client
     
+    @traced("phase.metrics", kind=SPAN_KIND_PHASE)
     async def calculate_all_metrics(self, workflow_results: List[PersonaResult], 
                                   context: WorkflowContext) -> Dict[str, Any]:
         """Calculate all four core metrics using personas"""
@@ -461,19 +640,102 @@ Provide structured metrics with capacity analysis and recommendations.""",
         }
 
 
+# Deployment and monitoring requests only depend on the original requirement,
+# so they can be issued speculatively before their phase (phase, prompt template)
+LATER_PHASE_REQUESTS = {
+    "infrastructure_engineer": ("infrastructure_automation", """Infrastructure setup and deployment for: {requirement}
+
+            Automate infrastructure provisioning:
+            1. Cloud infrastructure setup (IaC with Terraform/CloudFormation)
+            2. Container orchestration (Docker + Kubernetes)
+            3. CI/CD pipeline automation (GitHub Actions)
+            4. Security hardening and compliance
+            5. Monitoring and logging infrastructure
+            6. Backup and disaster recovery setup
+            7. Auto-scaling and load balancing
+            8. Cost optimization and resource management
+
+            Generate deployment artifacts:
+            - Dockerfile and docker-compose.yml
+            - Kubernetes manifests (deployment, service, ingress)
+            - GitHub Actions workflows (.github/workflows/)
+            - Infrastructure as Code templates
+            - Monitoring and alerting configurations"""),
+    "release_engineer": ("cicd_automation", """Release engineering and CI/CD automation for: {requirement}
+
+            Implement automated release pipeline:
+            1. Source code management and branching strategy
+            2. Automated build and testing pipeline
+            3. Deployment automation with rollback capabilities
+            4. Environment promotion (dev → staging → prod)
+            5. Blue-green and canary deployment strategies
+            6. Security scanning and compliance checks
+            7. Performance monitoring and alerts
+            8. Release management and change tracking
+
+            CI/CD pipeline includes:
+            - Automated testing on every commit
+            - Security vulnerability scanning
+            - Performance regression testing
+            - Automated deployment approvals
+            - Rollback mechanisms and health checks"""),
+    "devops_specialist": ("monitoring_operations", """Monitoring and operational validation for: {requirement}
+
+            Implement comprehensive monitoring:
+            1. Application performance monitoring (APM)
+            2. Infrastructure monitoring and alerting
+            3. Log aggregation and analysis
+            4. Security monitoring and threat detection
+            5. Business metrics and KPI tracking
+            6. Incident response and escalation
+            7. Capacity planning and optimization
+            8. SLA monitoring and reporting
+
+            Operational excellence:
+            - Real-time dashboards and visualizations
+            - Automated alerting and notifications
+            - Health checks and synthetic monitoring
+            - Performance optimization recommendations
+            - Cost monitoring and optimization alerts"""),
+}
+
+
 class DynamicWorkflowOrchestrator:
     """Enhanced orchestrator with complete persona ecosystem"""
     
-    def __init__(self):
-        self.persona_client = PersonaAPIClient()
+    def __init__(self, speculative_prefetch: Optional[bool] = None,
+                 checkpoint_store: Optional[WorkflowCheckpointStore] = None,
+                 step_memo: Optional[StepMemo] = None,
+                 readiness_gate: Optional[ReadinessGate] = None,
+                 budget: Optional[WorkflowBudget] = None):
+        self.persona_client = get_persona_client()
         self.metrics_calculator = MetricsCalculator(self.persona_client)
+        self.classifier = get_classifier()
         self.execution_history = []
+        
+        # Start deployment/monitoring personas early (G1_SPECULATIVE_PREFETCH=1)
+        if speculative_prefetch is None:
+            speculative_prefetch = os.getenv("G1_SPECULATIVE_PREFETCH", "0").lower() in ("1", "true", "yes")
+        self.speculative_prefetch = speculative_prefetch
+        
+        # Per-step checkpoints for resume_workflow (G1_CHECKPOINT_DB=path)
+        self.checkpoint_store = checkpoint_store if checkpoint_store is not None else WorkflowCheckpointStore.from_env()
+        
+        # Memoized persona steps for incremental re-runs (G1_STEP_MEMO=path)
+        self.step_memo = step_memo if step_memo is not None else StepMemo.from_env()
+        
+        # Services/personas that must be healthy before a workflow starts (G1_READINESS_PERSONAS=...)
+        self.readiness_gate = readiness_gate if readiness_gate is not None else ReadinessGate.from_env()
+        
+        # Per-workflow token/cost budget (G1_WORKFLOW_TOKEN_BUDGET / G1_WORKFLOW_COST_BUDGET)
+        self.budget = budget if budget is not None else WorkflowBudget.from_env()
     
     async def process_requirement(self, user_input: str, 
-                                context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                                context: Optional[Dict[str, Any]] = None,
+                                workflow_id: Optional[str] = None) -> Dict[str, Any]:
         """Process requirement with dynamic workflow selection"""
         
-        workflow_id = str(uuid.uuid4())
+        workflow_id = workflow_id or str(uuid.uuid4())
         start_time = datetime.now()
         
         if context is None:
@@ -486,136 +748,153 @@ class DynamicWorkflowOrchestrator:
             metadata=context
         )
         
+        if self.checkpoint_store:
+            self._restore_checkpoints(workflow_context)
+            self.checkpoint_store.save_workflow(workflow_id, "dynamic", {"user_input": user_input, "context": context})
+        
         print(f"🚀 Enhanced Dynamic Workflow Processing")
         print(f"🆔 Workflow ID: {workflow_id}")
         print(f"📝 Requirement: {user_input}")
         print("=" * 60)
         
-        try:
-            results = []
+        with get_tracer().span("workflow.process_requirement", kind=SPAN_KIND_WORKFLOW,
+                               attributes={"g1.workflow_id": workflow_id},
+                               trace_id=trace_id_for(workflow_id)) as workflow_span, \
+                self.step_memo.workflow() if self.step_memo else contextlib.nullcontext() as memo_graph, \
+                usage_scope(WorkflowUsage(workflow_id, self.budget)) as usage:
+            try:
+                results = []
             
-            # Phase 1: Requirement Classification & Analysis
-            print("\n📋 Phase 1: Requirement Analysis & Classification")
-            classification = await self._classify_requirement(user_input, workflow_context)
-            workflow_context.classification = classification
+                if self.readiness_gate:
+                    await self.readiness_gate.wait(self.persona_client.personas_gateway_url)
             
-            concierge_result = await self._call_persona_with_validation(
-                "requirement_concierge", user_input, workflow_context, "requirement_analysis"
-            )
-            results.append(concierge_result)
+                # Phase 1: Requirement Classification & Analysis
+                print("\n📋 Phase 1: Requirement Analysis & Classification")
+                classification = self._classify_requirement(user_input, workflow_context)
+                workflow_context.classification = classification
             
-            # Phase 2: Dynamic Workflow Selection
-            print("\n🔀 Phase 2: Dynamic Workflow Selection")
-            workflow_channel = await self._select_workflow_channel(classification, workflow_context)
-            print(f"  🛣️ Selected Channel: {workflow_channel.value}")
+                concierge_result = await self._call_persona_with_validation(
+                    "requirement_concierge", user_input, workflow_context, "requirement_analysis"
+                )
+                results.append(concierge_result)
             
-            # Phase 3: Execute Selected Workflow with Integrated Execution Phases
-            workflow_results = await self._execute_workflow_with_phases(workflow_channel, workflow_context)
-            results.extend(workflow_results)
+                # Phase 2: Dynamic Workflow Selection
+                print("\n🔀 Phase 2: Dynamic Workflow Selection")
+                workflow_channel = await self._select_workflow_channel(classification, workflow_context)
+                print(f"  🛣️ Selected Channel: {workflow_channel.value}")
+                workflow_span.set_attribute("g1.channel", workflow_channel.value)
             
-            # Phase 4: Metrics Calculation
-            print("\n📊 Phase 4: Metrics Calculation")
-            metrics = await self.metrics_calculator.calculate_all_metrics(results, workflow_context)
+                # Phase 3: Execute Selected Workflow with Integrated Execution Phases
+                workflow_results = await self._execute_workflow_with_phases(workflow_channel, workflow_context)
+                results.extend(workflow_results)
             
-            total_time = (datetime.now() - start_time).total_seconds()
+                # Phase 4: Metrics Calculation
+                print("\n📊 Phase 4: Metrics Calculation")
+                metrics = workflow_context.completed_steps.get("metrics")
+                if metrics is None:
+                    with usage_phase("metrics"):
+                        metrics = await memoized_step(
+                            "metrics",
+                            lambda: self.metrics_calculator.calculate_all_metrics(results, workflow_context),
+                            requirement=user_input,
+                            depends_on=[f"{r.metadata.get('phase')}:{r.persona_name}" for r in results]
+                        )
+                    if metrics and self.checkpoint_store:
+                        self.checkpoint_store.save_step(workflow_id, "metrics", metrics)
             
-            result = {
-                "workflow_id": workflow_id,
-                "input": user_input,
-                "context": context,
-                "classification": {
-                    "type": classification.type.value if classification else "unknown",
-                    "priority": classification.priority.value if classification else "unknown",
-                    "complexity_score": classification.complexity_score if classification else 0,
-                    "risk_score": classification.risk_score if classification else 0,
-                    "estimated_effort": classification.estimated_effort if classification else "unknown",
-                    "confidence": classification.confidence if classification else 0
-                },
-                "selected_channel": workflow_channel.value,
-                "results": [self._serialize_result(r) for r in results],
-                "metrics": metrics,
-                "total_time": total_time,
-                "success": True,
-                "execution_method": "dynamic_workflow_with_complete_personas"
-            }
+                total_time = (datetime.now() - start_time).total_seconds()
             
-            self.execution_history.append(result)
+                result = {
+                    "workflow_id": workflow_id,
+                    "input": user_input,
+                    "context": context,
+                    "classification": {
+                        "type": classification.type.value if classification else "unknown",
+                        "priority": classification.priority.value if classification else "unknown",
+                        "complexity_score": classification.complexity_score if classification else 0,
+                        "risk_score": classification.risk_score if classification else 0,
+                        "estimated_effort": classification.estimated_effort if classification else "unknown",
+                        "confidence": classification.confidence if classification else 0
+                    },
+                    "selected_channel": workflow_channel.value,
+                    "results": [self._serialize_result(r) for r in results],
+                    "metrics": metrics,
+                    "total_time": total_time,
+                    "success": True,
+                    "execution_method": "dynamic_workflow_with_complete_personas",
+                    "trace_id": workflow_span.trace_id
+                }
+                if workflow_context.prefetcher:
+                    result["speculative_prefetch"] = workflow_context.prefetcher.stats
+                if memo_graph:
+                    result["step_memo"] = dict(memo_graph.stats, recomputed=memo_graph.recomputed)
+                result["usage"] = usage.summary()
+                if self.checkpoint_store:
+                    self.checkpoint_store.set_status(workflow_id, STATUS_COMPLETED)
             
-            print(f"\n✅ Workflow completed successfully in {total_time:.2f} seconds")
-            print(f"📊 Overall metrics calculated: {len(metrics)} categories")
+                self.execution_history.append(result)
             
-            return result
+                print(f"\n✅ Workflow completed successfully in {total_time:.2f} seconds")
+                print(f"📊 Overall metrics calculated: {len(metrics)} categories")
+                print(f"💸 Usage: {result['usage']['total_tokens']} tokens, ${result['usage']['cost_usd']:.4f}")
             
-        except Exception as e:
-            total_time = (datetime.now() - start_time).total_seconds()
-            print(f"\n❌ Workflow failed: {str(e)}")
+                return result
             
-            return {
-                "workflow_id": workflow_id,
-                "input": user_input,
-                "context": context,
-                "error": str(e),
-                "total_time": total_time,
-                "success": False,
-                "execution_method": "dynamic_workflow_with_complete_personas"
-            }
+            except Exception as e:
+                total_time = (datetime.now() - start_time).total_seconds()
+                print(f"\n❌ Workflow failed: {str(e)}")
+                workflow_span.record_error(e)
+                if self.checkpoint_store:
+                    self.checkpoint_store.set_status(workflow_id, STATUS_FAILED)
+            
+                return {
+                    "workflow_id": workflow_id,
+                    "input": user_input,
+                    "context": context,
+                    "error": str(e),
+                    "total_time": total_time,
+                    "success": False,
+                    "usage": usage.summary(),
+                    "execution_method": "dynamic_workflow_with_complete_personas",
+                    "trace_id": workflow_span.trace_id
+                }
     
-    async def _classify_requirement(self, user_input: str, 
-                                  context: WorkflowContext) -> RequirementClassification:
-        """Classify requirement using requirement concierge"""
-        
-        # Use a simple classification based on keywords for now
-        # In a real system, this would be more sophisticated
-        
-        input_lower = user_input.lower()
-        
-        # Determine type
-        if any(word in input_lower for word in ["fix", "bug", "error", "broken"]):
-            req_type = RequirementType.BUG_FIX
-        elif any(word in input_lower for word in ["compliance", "hipaa", "gdpr", "audit"]):
-            req_type = RequirementType.COMPLIANCE
-        elif any(word in input_lower for word in ["migrate", "migration", "upgrade"]):
-            req_type = RequirementType.MIGRATION
-        elif any(word in input_lower for word in ["infrastructure", "deployment", "server"]):
-            req_type = RequirementType.INFRASTRUCTURE
-        elif any(word in input_lower for word in ["research", "poc", "investigate"]):
-            req_type = RequirementType.RESEARCH
-        else:
-            req_type = RequirementType.FEATURE_REQUEST
-        
-        # Determine priority
-        if any(word in input_lower for word in ["critical", "urgent", "emergency"]):
-            priority = RequirementPriority.CRITICAL
-        elif any(word in input_lower for word in ["high", "important", "soon"]):
-            priority = RequirementPriority.HIGH
-        elif any(word in input_lower for word in ["low", "nice", "future"]):
-            priority = RequirementPriority.LOW
-        else:
-            priority = RequirementPriority.MEDIUM
-        
-        # Simple complexity scoring
-        complexity_score = 3.0  # Default
-        if any(word in input_lower for word in ["simple", "quick", "small"]):
-            complexity_score = 2.0
-        elif any(word in input_lower for word in ["complex", "large", "enterprise", "platform"]):
-            complexity_score = 8.0
-        elif any(word in input_lower for word in ["microservices", "migration", "architecture"]):
-            complexity_score = 9.0
-        
-        # Simple risk scoring
-        risk_score = 3.0  # Default
-        if req_type == RequirementType.COMPLIANCE:
-            risk_score = 8.0
-        elif any(word in input_lower for word in ["patient", "financial", "security"]):
-            risk_score = 7.0
-        elif req_type == RequirementType.BUG_FIX:
-            risk_score = 2.0
+    async def resume_workflow(self, workflow_id: str) -> Dict[str, Any]:
+        """Resume a checkpointed workflow, re-running only the steps that did not complete"""
+        if not self.checkpoint_store:
+            raise ValueError("Checkpointing is not enabled (pass checkpoint_store or set G1_CHECKPOINT_DB)")
+        
+        record = self.checkpoint_store.get_workflow(workflow_id)
+        if record is None or record["kind"] != "dynamic":
+            raise ValueError(f"No checkpointed dynamic workflow {workflow_id}")
+        
+        print(f"♻️ Resuming workflow {workflow_id} ({record['status']})")
+        payload = record["payload"]
+        return await self.process_requirement(payload["user_input"], payload["context"], workflow_id=workflow_id)
+    
+    def _restore_checkpoints(self, context: WorkflowContext):
+        """Load completed steps and rehydrate the workflow context manager"""
+        context.completed_steps = self.checkpoint_store.load_steps(context.workflow_id)
+        for step_key, step in context.completed_steps.items():
+            if ":" in step_key and step.get("success"):
+                context.context_manager.add_persona_output(
+                    step["persona_name"],
+                    step["output_data"].get("response", ""),
+                    dict(step.get("metadata", {}), restored=True)
+                )
+        if context.completed_steps:
+            print(f"♻️ Restored {len(context.completed_steps)} completed steps from checkpoint")
+    
+    def _classify_requirement(self, user_input: str, 
+                              context: WorkflowContext) -> RequirementClassification:
+        """Classify requirement using the precompiled keyword classifier"""
+        labels = self.classifier.classify(user_input)
         
         return RequirementClassification(
-            type=req_type,
-            priority=priority,
-            complexity_score=complexity_score,
-            risk_score=risk_score,
+            type=RequirementType(labels.type),
+            priority=RequirementPriority(labels.priority),
+            complexity_score=labels.complexity_score,
+            risk_score=labels.risk_score,
             estimated_effort="auto-calculated",
             confidence=0.8
         )
@@ -642,11 +921,24 @@ class DynamicWorkflowOrchestrator:
         # Standard for everything else
         return WorkflowChannel.STANDARD
     
+    @traced("phase.workflow_channel", kind=SPAN_KIND_PHASE)
     async def _execute_workflow_with_phases(self, workflow_channel: WorkflowChannel, 
                                           context: WorkflowContext) -> List[PersonaResult]:
         """Execute workflow with integrated execution phases for deployment and CI/CD"""
         print(f"  🔄 Executing {workflow_channel.value.title()} Workflow with Integrated Phases")
         
+        if self.speculative_prefetch:
+            self._start_speculative_prefetch(context)
+        try:
+            return await self._execute_integrated_phases(workflow_channel, context)
+        finally:
+            # Anything not consumed by its phase is no longer part of the plan
+            if context.prefetcher:
+                context.prefetcher.cancel()
+    
+    async def _execute_integrated_phases(self, workflow_channel: WorkflowChannel,
+                                         context: WorkflowContext) -> List[PersonaResult]:
+        """Run the core channel workflow followed by testing, deployment and monitoring"""
         all_results = []
         
         # Phase 1: Core Workflow Execution (based on channel)
@@ -679,6 +971,7 @@ class DynamicWorkflowOrchestrator:
         
         return all_results
     
+    @traced("phase.testing", kind=SPAN_KIND_PHASE)
     async def _execute_testing_phase(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute automated testing and quality assurance phase"""
         results = []
@@ -710,93 +1003,55 @@ class DynamicWorkflowOrchestrator:
         
         return results
     
+    @traced("phase.deployment", kind=SPAN_KIND_PHASE)
     async def _execute_deployment_phase(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute deployment and infrastructure phase automatically"""
         results = []
         
         # Infrastructure setup
-        infra_result = await self._call_persona_with_validation(
-            "infrastructure_engineer",
-            f"""Infrastructure setup and deployment for: {context.user_input}
-
-            Automate infrastructure provisioning:
-            1. Cloud infrastructure setup (IaC with Terraform/CloudFormation)
-            2. Container orchestration (Docker + Kubernetes)
-            3. CI/CD pipeline automation (GitHub Actions)
-            4. Security hardening and compliance
-            5. Monitoring and logging infrastructure
-            6. Backup and disaster recovery setup
-            7. Auto-scaling and load balancing
-            8. Cost optimization and resource management
-
-            Generate deployment artifacts:
-            - Dockerfile and docker-compose.yml
-            - Kubernetes manifests (deployment, service, ingress)
-            - GitHub Actions workflows (.github/workflows/)
-            - Infrastructure as Code templates
-            - Monitoring and alerting configurations""",
-            context, "infrastructure_automation"
-        )
+        infra_result = await self._call_later_phase_persona("infrastructure_engineer", context)
         results.append(infra_result)
         
         # Release engineering for CI/CD
-        release_result = await self._call_persona_with_validation(
-            "release_engineer",
-            f"""Release engineering and CI/CD automation for: {context.user_input}
-
-            Implement automated release pipeline:
-            1. Source code management and branching strategy
-            2. Automated build and testing pipeline
-            3. Deployment automation with rollback capabilities
-            4. Environment promotion (dev → staging → prod)
-            5. Blue-green and canary deployment strategies
-            6. Security scanning and compliance checks
-            7. Performance monitoring and alerts
-            8. Release management and change tracking
-
-            CI/CD pipeline includes:
-            - Automated testing on every commit
-            - Security vulnerability scanning
-            - Performance regression testing
-            - Automated deployment approvals
-            - Rollback mechanisms and health checks""",
-            context, "cicd_automation"
-        )
+        release_result = await self._call_later_phase_persona("release_engineer", context)
         results.append(release_result)
         
         return results
     
+    @traced("phase.monitoring", kind=SPAN_KIND_PHASE)
     async def _execute_monitoring_phase(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute monitoring and validation phase"""
         results = []
         
         # DevOps monitoring and operations
-        monitoring_result = await self._call_persona_with_validation(
-            "devops_specialist",
-            f"""Monitoring and operational validation for: {context.user_input}
-
-            Implement comprehensive monitoring:
-            1. Application performance monitoring (APM)
-            2. Infrastructure monitoring and alerting
-            3. Log aggregation and analysis
-            4. Security monitoring and threat detection
-            5. Business metrics and KPI tracking
-            6. Incident response and escalation
-            7. Capacity planning and optimization
-            8. SLA monitoring and reporting
-
-            Operational excellence:
-            - Real-time dashboards and visualizations
-            - Automated alerting and notifications
-            - Health checks and synthetic monitoring
-            - Performance optimization recommendations
-            - Cost monitoring and optimization alerts""",
-            context, "monitoring_operations"
-        )
+        monitoring_result = await self._call_later_phase_persona("devops_specialist", context)
         results.append(monitoring_result)
         
         return results
     
+    async def _call_later_phase_persona(self, persona_name: str, context: WorkflowContext) -> PersonaResult:
+        """Call a deployment/monitoring persona, using its speculative result when available"""
+        if context.prefetcher:
+            prefetched = await context.prefetcher.take(persona_name)
+            if prefetched is not None:
+                print(f"  ⚡ {persona_name} served from speculative prefetch")
+                return prefetched
+        
+        phase, template = LATER_PHASE_REQUESTS[persona_name]
+        return await self._call_persona_with_validation(
+            persona_name, template.format(requirement=context.user_input), context, phase
+        )
+    
+    def _start_speculative_prefetch(self, context: WorkflowContext):
+        """Start later-phase personas that only need the original requirement"""
+        context.prefetcher = SpeculativePrefetcher()
+        for persona_name, (phase, template) in LATER_PHASE_REQUESTS.items():
+            context.prefetcher.start(persona_name, self._call_persona_with_validation(
+                persona_name, template.format(requirement=context.user_input), context, phase
+            ))
+        print(f"  ⚡ Speculatively prefetching: {', '.join(LATER_PHASE_REQUESTS)}")
+    
+    @traced("phase.fast_track", kind=SPAN_KIND_PHASE)
     async def _execute_fast_track_workflow(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute fast track workflow - minimal personas"""
         print("  🏃‍♂️ Executing Fast Track Workflow")
@@ -821,6 +1076,7 @@ class DynamicWorkflowOrchestrator:
         
         return results
     
+    @traced("phase.standard", kind=SPAN_KIND_PHASE)
     async def _execute_standard_workflow(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute standard workflow - full lifecycle"""
         print("  🚀 Executing Standard Workflow")
@@ -869,6 +1125,7 @@ class DynamicWorkflowOrchestrator:
         
         return results
     
+    @traced("phase.mega", kind=SPAN_KIND_PHASE)
     async def _execute_mega_workflow(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute mega workflow - full enterprise governance"""
         print("  🏢 Executing Mega Project Workflow")
@@ -897,6 +1154,7 @@ class DynamicWorkflowOrchestrator:
         
         return results
     
+    @traced("phase.research", kind=SPAN_KIND_PHASE)
     async def _execute_research_workflow(self, context: WorkflowContext) -> List[PersonaResult]:
         """Execute research workflow - investigation focused"""
         print("  🔬 Executing Research Workflow")
@@ -924,6 +1182,12 @@ class DynamicWorkflowOrchestrator:
     async def _call_persona_with_validation(self, persona_name: str, message: str,
                                           context: WorkflowContext, phase: str) -> PersonaResult:
         """Call persona with validation and routing"""
+        checkpoint_key = f"{phase}:{persona_name}"
+        restored = context.completed_steps.get(checkpoint_key)
+        if restored is not None:
+            print(f"  ♻️ {persona_name} restored from checkpoint")
+            return PersonaResult(**restored)
+        
         start_time = datetime.now()
         
         api_context = {
@@ -937,23 +1201,37 @@ class DynamicWorkflowOrchestrator:
             }
         }
         
-        # Use validation and routing for non-interface personas
-        if persona_name not in ["interface_validator", "queue_manager"]:
-            api_result = await self.persona_client.validate_and_route_request(
-                persona_name, message, api_context
-            )
-        else:
-            api_result = await self.persona_client.call_persona(
-                persona_name, message, api_context
-            )
+        with get_tracer().span(f"persona.{persona_name}", kind=SPAN_KIND_PERSONA,
+                               attributes={"g1.persona": persona_name, "g1.phase": phase}) as span:
+            async def call():
+                # Use validation and routing for non-interface personas
+                if persona_name not in ["interface_validator", "queue_manager"]:
+                    return await self.persona_client.validate_and_route_request(
+                        persona_name, message, api_context
+                    )
+                return await self.persona_client.call_persona(
+                    persona_name, message, api_context
+                )
+            
+            # Keyed by the persona's slice of the requirement, not the full text;
+            # validation/routing calls are accounted to the same phase
+            with usage_phase(phase):
+                api_result = await memoized_step(
+                    checkpoint_key, call, persona=persona_name, requirement=context.user_input,
+                    inputs={"message": message.replace(context.user_input, "{requirement}"),
+                            "classification": api_context["classification"]},
+                    cache_if=lambda r: r["success"]
+                )
+            if not api_result["success"]:
+                span.record_error(api_result["error"])
         
         processing_time = (datetime.now() - start_time).total_seconds()
         
         if api_result["success"]:
             print(f"  ✅ {persona_name} completed ({processing_time:.1f}s)")
             
-            return PersonaResult(
-                persona_id=api_result["persona_id"],
+            result = PersonaResult(
+                persona_id=api_result.get("persona", persona_name),
                 persona_name=persona_name,
                 success=True,
                 output_data={"response": api_result["response"]},
@@ -962,6 +1240,9 @@ class DynamicWorkflowOrchestrator:
                 metadata={"phase": phase, "validated": True},
                 validated=True
             )
+            if self.checkpoint_store:
+                self.checkpoint_store.save_step(context.workflow_id, checkpoint_key, self._serialize_result(result))
+            return result
         else:
             print(f"  ❌ {persona_name} failed: {api_result['error']}")
             return PersonaResult(
@@ -1054,4 +1335,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
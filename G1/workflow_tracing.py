@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Workflow Tracing
+================
+
+Lightweight span instrumentation for the G1 orchestrators.
+
+Every workflow, phase, persona step, validation/routing hop and gateway HTTP
+call is recorded as a span in a single trace. The trace id is derived from the
+workflow id, and W3C ``traceparent`` headers are propagated to the Personas
+Gateway so server-side spans join the same trace in Jaeger.
+
+Exporters:
+- FileSpanExporter: JSON lines on disk, works fully offline
+- OTLPHttpSpanExporter: OTLP/HTTP JSON to the Jaeger collector (docker-compose)
+
+Configuration (environment):
+- G1_TRACE_FILE: path of the JSONL span file (enables the file exporter)
+- G1_TRACE_OTLP_ENDPOINT: OTLP/HTTP traces endpoint, e.g. http://localhost:4318/v1/traces
+- G1_TRACE_SERVICE_NAME: service name reported to the collector
+"""
+
+import contextvars
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Iterator, Callable
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+# Span kinds used across the orchestrators (stored as the "g1.kind" attribute)
+SPAN_KIND_WORKFLOW = "workflow"
+SPAN_KIND_PHASE = "phase"
+SPAN_KIND_PERSONA = "persona"
+SPAN_KIND_HOP = "hop"
+SPAN_KIND_GATEWAY = "gateway"
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("g1_current_span", default=None)
+
+
+def trace_id_for(workflow_id: str) -> str:
+    """Derive a 32-hex-digit trace id from a workflow id"""
+    try:
+        return uuid.UUID(str(workflow_id)).hex
+    except ValueError:
+        return hashlib.sha256(str(workflow_id).encode("utf-8")).hexdigest()[:32]
+
+
+def _new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+@dataclass
+class Span:
+    """A single timed operation within a workflow trace"""
+    trace_id: str
+    span_id: str
+    name: str
+    kind: str
+    start_time: float
+    parent_span_id: Optional[str] = None
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: Any):
+        self.status = "error"
+        self.error = str(error)
+
+    @property
+    def duration(self) -> float:
+        if self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    def traceparent(self) -> str:
+        """W3C trace context header value for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class FileSpanExporter:
+    """Append finished spans to a JSON lines file (offline-friendly)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(lines)
+
+
+class OTLPHttpSpanExporter:
+    """Send finished spans to an OTLP/HTTP collector (Jaeger all-in-one)"""
+
+    def __init__(self, endpoint: str = "http://localhost:4318/v1/traces",
+                 service_name: str = "g1-orchestrator", timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        # Runs in a background thread so the event loop never blocks on the collector
+        payload = json.dumps(self._to_otlp(spans), default=str).encode("utf-8")
+        threading.Thread(target=self._post, args=(payload,), daemon=True).start()
+
+    def _post(self, payload: bytes):
+        request = urllib.request.Request(
+            self.endpoint, data=payload, headers={"Content-Type": "application/json"}
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except Exception as e:
+            logger.warning(f"OTLP span export to {self.endpoint} failed: {e}")
+
+    def _to_otlp(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "g1.workflow_tracing"},
+                    "spans": [self._span_to_otlp(span) for span in spans]
+                }]
+            }]
+        }
+
+    def _span_to_otlp(self, span: Span) -> Dict[str, Any]:
+        attributes = dict(span.attributes)
+        attributes["g1.kind"] = span.kind
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            # 3 = CLIENT for outbound gateway calls, 1 = INTERNAL otherwise
+            "kind": 3 if span.kind == SPAN_KIND_GATEWAY else 1,
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": [_otlp_attribute(k, v) for k, v in attributes.items()],
+            "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1}
+        }
+        if span.parent_span_id:
+            otlp_span["parentSpanId"] = span.parent_span_id
+        return otlp_span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    if isinstance(value, (list, tuple)):
+        return {"key": key, "value": {"arrayValue": {"values": [{"stringValue": str(v)} for v in value]}}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanTracer:
+    """Creates spans, tracks the active span per task and exports finished traces"""
+
+    def __init__(self, exporters: Optional[List[Any]] = None):
+        self.exporters = list(exporters or [])
+        self._pending: Dict[str, List[Span]] = {}
+        self._open_roots: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter: Any):
+        self.exporters.append(exporter)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, kind: str = SPAN_KIND_PHASE,
+             attributes: Optional[Dict[str, Any]] = None,
+             trace_id: Optional[str] = None) -> Iterator[Span]:
+        """Open a span as a child of the active span (or a new root span)"""
+        parent = _current_span.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        span = Span(
+            trace_id=trace_id,
+            span_id=_new_span_id(),
+            name=name,
+            kind=kind,
+            start_time=time.time(),
+            parent_span_id=parent.span_id if parent and parent.trace_id == trace_id else None,
+            attributes=dict(attributes or {})
+        )
+        if span.parent_span_id is None:
+            with self._lock:
+                self._open_roots[trace_id] = self._open_roots.get(trace_id, 0) + 1
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end_time = time.time()
+            _current_span.reset(token)
+            self._finish(span)
+
+    def inject_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Add trace context headers for the active span"""
+        headers = dict(headers or {})
+        span = _current_span.get()
+        if span is not None:
+            headers[TRACEPARENT_HEADER] = span.traceparent()
+        return headers
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self._pending.setdefault(span.trace_id, []).append(span)
+            if span.parent_span_id is None:
+                self._open_roots[span.trace_id] -= 1
+                if not self._open_roots[span.trace_id]:
+                    del self._open_roots[span.trace_id]
+            # A trace is exported once its root span closes; stragglers that
+            # finish afterwards (e.g. cancelled background tasks) go out alone
+            if span.trace_id in self._open_roots:
+                return
+            spans = self._pending.pop(span.trace_id)
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Span export failed ({type(exporter).__name__}): {e}")
+
+
+_tracer: Optional[SpanTracer] = None
+
+
+def get_tracer() -> SpanTracer:
+    """Process-wide tracer configured from the environment on first use"""
+    global _tracer
+    if _tracer is None:
+        _tracer = SpanTracer()
+        trace_file = os.getenv("G1_TRACE_FILE")
+        if trace_file:
+            _tracer.add_exporter(FileSpanExporter(trace_file))
+        otlp_endpoint = os.getenv("G1_TRACE_OTLP_ENDPOINT")
+        if otlp_endpoint:
+            _tracer.add_exporter(OTLPHttpSpanExporter(
+                otlp_endpoint, os.getenv("G1_TRACE_SERVICE_NAME", "g1-orchestrator")
+            ))
+    return _tracer
+
+
+def configure_tracing(trace_file: Optional[str] = None, otlp_endpoint: Optional[str] = None,
+                      service_name: str = "g1-orchestrator") -> SpanTracer:
+    """Explicitly configure exporters for the process-wide tracer"""
+    tracer = get_tracer()
+    if trace_file:
+        tracer.add_exporter(FileSpanExporter(trace_file))
+    if otlp_endpoint:
+        tracer.add_exporter(OTLPHttpSpanExporter(otlp_endpoint, service_name))
+    return tracer
+
+
+def traced(name: Optional[str] = None, kind: str = SPAN_KIND_PHASE) -> Callable:
+    """Decorator wrapping an async method in a span"""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__.strip("_")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name, kind=kind):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
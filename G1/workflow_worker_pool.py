@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Workflow Worker Pool
+====================
+
+Multi-process execution mode for running many workflows across cores.
+
+The front process shards workflows by workflow_id over a pool of worker
+processes. Each worker runs its own asyncio loop, one orchestrator and one
+pooled gateway session, and executes up to `concurrency_per_worker` workflows
+at a time. Results and per-worker metrics come back over a local queue and
+resolve the futures returned by submit(). A worker that dies (crash, OOM kill)
+is detected by the result collector within LIVENESS_INTERVAL seconds; the
+workflows sharded to it fail instead of waiting forever.
+
+Prompt building, JSON serialization of large contexts and response parsing no
+longer compete for a single core, so throughput scales with the worker count.
+
+Usage:
+    async with WorkflowWorkerPool(workers=4) as pool:
+        results = await pool.run_many(["Build a login page", "Fix checkout bug"])
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# kind -> (module, orchestrator class, workflow method, method accepts workflow_id)
+WORKFLOW_KINDS: Dict[str, Tuple[str, str, str, bool]] = {
+    "dynamic": ("workflow_orchestrator", "DynamicWorkflowOrchestrator", "process_requirement", True),
+    "pure_persona": ("pure_persona_driven_orchestrator", "PurePersonaDrivenOrchestrator",
+                     "execute_persona_driven_workflow", False),
+}
+
+_MSG_RESULT = "result"
+_MSG_STOPPED = "stopped"
+
+# Seconds the result collector waits for a message before checking worker liveness
+LIVENESS_INTERVAL = 1.0
+
+
+def shard_for(workflow_id: str, workers: int) -> int:
+    """Stable worker index for a workflow id"""
+    return zlib.crc32(workflow_id.encode("utf-8")) % workers
+
+
+def _worker_main(index: int, kind: str, inbox, outbox, concurrency: int,
+                 gateway_url: Optional[str], connection_limit: int):
+    """Worker process entry point"""
+    asyncio.run(_worker_loop(index, kind, inbox, outbox, concurrency, gateway_url, connection_limit))
+
+
+async def _worker_loop(index: int, kind: str, inbox, outbox, concurrency: int,
+                       gateway_url: Optional[str], connection_limit: int):
+    import aiohttp
+
+    module_name, class_name, method_name, accepts_workflow_id = WORKFLOW_KINDS[kind]
+    orchestrator = getattr(importlib.import_module(module_name), class_name)()
+    run_workflow = getattr(orchestrator, method_name)
+    if gateway_url:
+        orchestrator.persona_client.personas_gateway_url = gateway_url
+        orchestrator.persona_client.gateway_pool = None
+
+    metrics = {"worker": index, "pid": os.getpid(), "completed": 0, "failed": 0, "busy_seconds": 0.0}
+    semaphore = asyncio.Semaphore(concurrency)
+    running = set()
+    loop = asyncio.get_running_loop()
+
+    async def execute(job: Dict[str, Any]):
+        workflow_id = job["workflow_id"]
+        started = time.perf_counter()
+        try:
+            if accepts_workflow_id:
+                result = await run_workflow(job["user_input"], job["context"], workflow_id=workflow_id)
+            else:
+                result = await run_workflow(job["user_input"], job["context"])
+            # Plain JSON types only, so the result always pickles back to the front process
+            result = json.loads(json.dumps(result, default=str))
+        except Exception as e:
+            logger.error(f"❌ Worker {index} workflow {workflow_id} failed: {e}")
+            result = {"workflow_id": workflow_id, "success": False, "error": str(e)}
+        finally:
+            semaphore.release()
+
+        elapsed = time.perf_counter() - started
+        metrics["busy_seconds"] += elapsed
+        metrics["completed" if result.get("success", True) else "failed"] += 1
+        outbox.put((_MSG_RESULT, index, workflow_id, result,
+                    dict(metrics, elapsed=elapsed, cpu_seconds=time.process_time())))
+
+    connector = aiohttp.TCPConnector(limit=connection_limit)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        orchestrator.persona_client.session = session
+        while True:
+            job = await loop.run_in_executor(None, inbox.get)
+            if job is None:
+                break
+            await semaphore.acquire()
+            task = asyncio.ensure_future(execute(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running)
+
+    outbox.put((_MSG_STOPPED, index, None, None, dict(metrics, cpu_seconds=time.process_time())))
+
+
+class WorkflowWorkerPool:
+    """Front process of the multi-process workflow execution mode"""
+
+    def __init__(self, workers: Optional[int] = None, kind: str = "dynamic",
+                 concurrency_per_worker: int = 16, gateway_url: Optional[str] = None,
+                 connection_limit: int = 64):
+        if kind not in WORKFLOW_KINDS:
+            raise ValueError(f"Unknown workflow kind {kind!r} (expected one of {sorted(WORKFLOW_KINDS)})")
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.concurrency_per_worker = concurrency_per_worker
+        self.gateway_url = gateway_url
+        self.connection_limit = connection_limit
+
+        # Spawned workers don't inherit the parent's event loop or sockets
+        self._mp = multiprocessing.get_context("spawn")
+        self._inboxes = []
+        self._processes = []
+        self._outbox = None
+        self._collector: Optional[threading.Thread] = None
+        # workflow_id -> (submitting loop, future, worker index)
+        self._pending: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future, int]] = {}
+        self._dead: Dict[int, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self.metrics: Dict[int, Dict[str, Any]] = {}
+
+    def start(self) -> "WorkflowWorkerPool":
+        self._outbox = self._mp.Queue()
+        for index in range(self.workers):
+            inbox = self._mp.Queue()
+            process = self._mp.Process(
+                target=_worker_main,
+                args=(index, self.kind, inbox, self._outbox, self.concurrency_per_worker,
+                      self.gateway_url, self.connection_limit),
+                name=f"g1-workflow-worker-{index}",
+                daemon=True
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+        self._collector = threading.Thread(target=self._collect, name="g1-workflow-results", daemon=True)
+        self._collector.start()
+        logger.info(f"🚀 Started {self.workers} {self.kind} workflow workers")
+        return self
+
+    def _collect(self):
+        """Resolve submit() futures from the shared result queue"""
+        processes = list(self._processes)
+        stopped = set()
+        checked = time.monotonic()
+        while len(stopped) + len(self._dead) < len(processes):
+            try:
+                self._handle(self._outbox.get(timeout=LIVENESS_INTERVAL), stopped)
+            except queue.Empty:
+                pass
+            # Checked on a timer too, so a busy queue can't hide a dead worker
+            if time.monotonic() - checked >= LIVENESS_INTERVAL:
+                self._check_workers(processes, stopped)
+                checked = time.monotonic()
+
+    def _handle(self, message: tuple, stopped: set):
+        kind, index, workflow_id, result, metrics = message
+        self.metrics[index] = metrics
+        if kind == _MSG_STOPPED:
+            stopped.add(index)
+            return
+        with self._lock:
+            loop, future, _ = self._pending.pop(workflow_id, (None, None, None))
+        if future is not None:
+            loop.call_soon_threadsafe(self._resolve, future, result)
+
+    def _check_workers(self, processes: List[Any], stopped: set):
+        """Fail the pending workflows of workers that exited without stopping"""
+        dead = [i for i, p in enumerate(processes)
+                if i not in stopped and i not in self._dead and not p.is_alive()]
+        if not dead:
+            return
+        # Results a worker flushed just before exiting are still delivered
+        while True:
+            try:
+                self._handle(self._outbox.get_nowait(), stopped)
+            except queue.Empty:
+                break
+
+        for index in dead:
+            if index in stopped:
+                continue
+            exitcode = processes[index].exitcode
+            logger.error(f"💀 Workflow worker {index} died (exit code {exitcode})")
+            with self._lock:
+                self._dead[index] = exitcode
+                lost = {wid: entry for wid, entry in self._pending.items() if entry[2] == index}
+                for workflow_id in lost:
+                    del self._pending[workflow_id]
+            for workflow_id, (loop, future, _) in lost.items():
+                loop.call_soon_threadsafe(self._fail, future, RuntimeError(
+                    f"Worker {index} died (exit code {exitcode}) while running workflow {workflow_id}"))
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Dict[str, Any]):
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _fail(future: asyncio.Future, error: Exception):
+        if not future.done():
+            future.set_exception(error)
+
+    async def submit(self, user_input: str, context: Optional[Dict[str, Any]] = None,
+                     workflow_id: Optional[str] = None) -> Dict[str, Any]:
+        """Run one workflow on the worker owning its workflow_id"""
+        if not self._processes:
+            raise RuntimeError("Worker pool is not started")
+
+        workflow_id = workflow_id or str(uuid.uuid4())
+        shard = shard_for(workflow_id, self.workers)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if shard in self._dead:
+                raise RuntimeError(f"Worker {shard} died (exit code {self._dead[shard]})")
+            if workflow_id in self._pending:
+                raise ValueError(f"Workflow {workflow_id} is already running")
+            self._pending[workflow_id] = (loop, future, shard)
+
+        try:
+            self._inboxes[shard].put({
+                "workflow_id": workflow_id,
+                "user_input": user_input,
+                "context": context or {}
+            })
+            return await future
+        finally:
+            # Cancelled or failed submits free the id for resubmission
+            with self._lock:
+                if self._pending.get(workflow_id, (None, None, None))[1] is future:
+                    del self._pending[workflow_id]
+
+    async def run_many(self, requirements: List[str], context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a batch of workflows across the pool, results in input order"""
+        return await asyncio.gather(*(self.submit(r, context) for r in requirements))
+
+    def shutdown(self, timeout: float = 30.0):
+        """Let workers drain their queues, then stop them"""
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning(f"⚠️ {process.name} did not stop in {timeout}s; terminating")
+                process.terminate()
+        if self._collector:
+            self._collector.join(timeout)
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for loop, future, _ in pending.values():
+            loop.call_soon_threadsafe(self._fail, future, RuntimeError("Worker pool shut down"))
+        self._processes, self._inboxes = [], []
+        self._dead = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate throughput metrics reported by the workers"""
+        workers = sorted(self.metrics.values(), key=lambda m: m["worker"])
+        return {
+            "workers": self.workers,
+            "completed": sum(m["completed"] for m in workers),
+            "failed": sum(m["failed"] for m in workers),
+            "busy_seconds": round(sum(m["busy_seconds"] for m in workers), 3),
+            "cpu_seconds": round(sum(m.get("cpu_seconds", 0.0) for m in workers), 3),
+            "per_worker": workers
+        }
+
+    async def __aenter__(self) -> "WorkflowWorkerPool":
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+
+async def main():
+    """Run a batch of requirements through the worker pool"""
+    requirements = [
+        "Build a user registration page with email verification",
+        "Fix the checkout bug where discounts are applied twice",
+        "Migrate the orders database to PostgreSQL",
+        "Research options for real-time fraud detection",
+    ] * 4
+
+    started = time.perf_counter()
+    async with WorkflowWorkerPool(workers=min(4, os.cpu_count() or 1)) as pool:
+        results = await pool.run_many(requirements)
+        summary = pool.summary()
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for r in results if r.get("success"))
+    print(f"✅ {succeeded}/{len(results)} workflows in {elapsed:.1f}s "
+          f"({len(results) / elapsed:.1f} workflows/s on {summary['workers']} workers)")
+    for worker in summary["per_worker"]:
+        print(f"   👷 worker {worker['worker']} (pid {worker['pid']}): "
+              f"{worker['completed']} completed, {worker['failed']} failed, "
+              f"{worker['cpu_seconds']:.2f}s CPU")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())